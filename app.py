@@ -12,7 +12,7 @@ import pandas as pd
 import plotly.express as px
 from streamlit_folium import st_folium
 from utils.loader import load_dataset, load_dataset_from_session, get_dataset_info, read_csv_safe, read_uploaded_csv
-from utils.geo import detect_lat_lng_columns
+from utils.geo import detect_lat_lng_columns, get_coordinate_validation, clean_coordinates, select_viewport_points
 from utils.visualizer import (
     plot_numeric_distribution,
     plot_categorical_distribution,
@@ -21,10 +21,23 @@ from utils.visualizer import (
     plot_scatter,
     plot_with_options,
     check_missing_ratio,
+    plot_proximity_curve,
     create_folium_map,
-    create_overlay_map
+    create_overlay_map,
+    create_coverage_gap_map,
+    create_cluster_map,
+    create_district_map,
+    create_hotspot_map
+)
+from utils.clustering import cluster_hotspots
+from utils.districts import DISTRICT_LEVELS, detect_address_columns, aggregate_by_district
+from utils.spatial_stats import compute_spatial_autocorrelation
+from utils.geo import (
+    compute_proximity_stats,
+    compute_proximity_counts_and_weights,
+    compute_coverage_gaps,
+    proximity_curve_radii
 )
-from utils.geo import compute_proximity_stats
 from utils.narration import (
     summarize_proximity_stats,
     generate_distribution_insight,
@@ -94,6 +107,9 @@ AI_MODEL_OPTIONS = [
     {'id': 'claude-haiku-4-5-20251001', 'name': 'Claude Haiku 4.5', 'description': '간단한 질문에 최적'}
 ]
 
+# 뷰포트 지도: 화면 폭/높이의 이 비율 이상 이동하거나 줌이 바뀔 때만 포인트를 다시 불러옴
+VIEWPORT_MOVE_TOLERANCE = 0.1
+
 
 def init_session_state():
     """
@@ -127,6 +143,8 @@ def init_session_state():
     if 'map_settings' not in st.session_state:
         st.session_state.map_settings = {
             'max_points': 5000,  # 기본값
+            'render_mode': 'markers',  # 'markers', 'fast', 'clusters', 'heatmap', 'kde'
+            'viewport': False,  # 화면 범위의 포인트만 불러오기 (opt-in)
             'confirmed': False   # Enter 키 입력 여부
         }
 
@@ -233,6 +251,19 @@ def render_dataset_tab(dataset_name: str, dataset_display_name: str):
         st.markdown("### 🗺️ 지리적 분포")
         st.info(f"감지된 좌표: **{lat_col}** (위도), **{lng_col}** (경도)")
 
+        # 좌표 품질 리포트 (데이터셋별 캐시, 지도/근접 분석에서 같은 기준으로 제외됨)
+        _, coord_report = get_coordinate_validation(df, lat_col, lng_col)
+        excluded = coord_report['total'] - coord_report['valid']
+        if excluded > 0:
+            with st.expander(f"⚠️ 유효하지 않은 좌표 {excluded:,}개 제외됨", expanded=False):
+                st.dataframe([
+                    {'항목': '결측/숫자 아님', '행 수': coord_report['missing']},
+                    {'항목': '(0, 0) 좌표', '행 수': coord_report['zero']},
+                    {'항목': '위경도 뒤바뀜 의심', '행 수': coord_report['swapped']},
+                    {'항목': '대구 범위 밖', '행 수': coord_report['out_of_bounds']},
+                    {'항목': '중복 좌표 (유지됨)', '행 수': coord_report['duplicates']}
+                ], use_container_width=True)
+
         # 지도 설정 확인 여부 체크
         if not st.session_state.map_settings['confirmed']:
             st.warning("⚠️ 사이드바에서 지도 설정을 확인하고 Enter 키를 눌러주세요.")
@@ -241,21 +272,63 @@ def render_dataset_tab(dataset_name: str, dataset_display_name: str):
             popup_candidates = [col for col in df.columns if col not in [lat_col, lng_col]]
             popup_cols = popup_candidates[:3]  # Show first 3 columns in popup
 
-            # 지도 캐시 키에 max_points 포함
+            # 지도 캐시 키에 max_points, 표시 방식 포함
             max_points = st.session_state.map_settings['max_points']
-            cache_key = f"map_{dataset_name}_{len(df)}_{max_points}"
-
-            if cache_key not in st.session_state:
-                st.session_state[cache_key] = create_folium_map(
-                    df, lat_col, lng_col,
-                    popup_cols=popup_cols,
-                    color='blue',
-                    name=dataset_display_name,
-                    max_points=max_points
-                )
+            render_mode = st.session_state.map_settings['render_mode']
+            cache_key = f"map_{dataset_name}_{len(df)}_{max_points}_{render_mode}"
+
+            if st.session_state.map_settings['viewport'] and render_mode in ('markers', 'fast'):
+                render_viewport_map(df, dataset_name, dataset_display_name, lat_col, lng_col, popup_cols, max_points)
+            else:
+                if cache_key not in st.session_state:
+                    st.session_state[cache_key] = create_folium_map(
+                        df, lat_col, lng_col,
+                        popup_cols=popup_cols,
+                        color='blue',
+                        name=dataset_display_name,
+                        max_points=max_points,
+                        render_mode=render_mode
+                    )
+
+                # T042: Display map with returned_objects=[] to prevent rerendering
+                st_folium(st.session_state[cache_key], width=700, height=500, returned_objects=[])
 
-            # T042: Display map with returned_objects=[] to prevent rerendering
-            st_folium(st.session_state[cache_key], width=700, height=500, returned_objects=[])
+            # 밀집 지역 클러스터: 서버에서 한 번 계산해 캐시 (브라우저 MarkerCluster와 달리 줌마다 재계산하지 않음)
+            with st.expander("🔥 밀집 지역 클러스터 (DBSCAN)", expanded=False):
+                col1, col2 = st.columns(2)
+                with col1:
+                    eps_m = st.number_input(
+                        "이웃 반경 (m)", value=100, min_value=10, max_value=2000, step=10,
+                        key=f"{dataset_name}_cluster_eps"
+                    )
+                with col2:
+                    min_samples = int(st.number_input(
+                        "최소 포인트 수", value=10, min_value=2, max_value=1000, step=1,
+                        key=f"{dataset_name}_cluster_min_samples"
+                    ))
+
+                if st.button("🔍 클러스터 분석", key=f"{dataset_name}_run_cluster"):
+                    with st.spinner("밀집 지역을 찾는 중..."):
+                        labels, clusters = cluster_hotspots(
+                            df, lat_col, lng_col, eps_km=eps_m / 1000, min_samples=min_samples
+                        )
+
+                    if clusters.empty:
+                        st.info("ℹ️ 조건을 만족하는 밀집 지역이 없습니다. 반경을 늘리거나 최소 포인트 수를 줄여보세요.")
+                    else:
+                        clustered = int((labels >= 0).sum())
+                        st.caption(
+                            f"클러스터 {len(clusters):,}개, 클러스터에 속한 포인트 {clustered:,}개 "
+                            f"({clustered / labels.notna().sum() * 100:.1f}%)"
+                        )
+                        st.dataframe(
+                            clusters.head(20).rename(columns={
+                                'cluster_id': '클러스터', 'size': '포인트 수',
+                                'center_lat': '중심 위도', 'center_lng': '중심 경도', 'radius_km': '반경 (km)'
+                            }),
+                            use_container_width=True
+                        )
+                        st_folium(create_cluster_map(clusters), width=700, height=500, returned_objects=[])
     else:
         st.info("ℹ️ 지리 좌표가 감지되지 않았습니다. 이 데이터셋에는 지도 시각화를 사용할 수 없습니다.")
 
@@ -325,6 +398,47 @@ def render_dataset_tab(dataset_name: str, dataset_display_name: str):
     else:
         st.info("ℹ️ 이 데이터셋에는 숫자형 컬럼이 없습니다.")
 
+    # 행정구역별 집계: 주소 컬럼에서 구/동을 한 번만 추출해 범주형으로 캐시
+    address_cols = detect_address_columns(df)
+    if address_cols:
+        st.markdown("### 🏘️ 구/동별 집계")
+        st.caption(f"주소 컬럼: {', '.join(map(str, address_cols))}")
+
+        col1, col2 = st.columns(2)
+        with col1:
+            district_level = st.radio(
+                "집계 단위",
+                options=list(DISTRICT_LEVELS),
+                format_func=DISTRICT_LEVELS.get,
+                horizontal=True,
+                key=f"{dataset_name}_district_level"
+            )
+        with col2:
+            district_value_col = st.selectbox(
+                "합계 컬럼 (선택)",
+                options=[None] + numeric_cols,
+                format_func=lambda c: "없음 (행 수)" if c is None else c,
+                key=f"{dataset_name}_district_value"
+            )
+
+        summary = aggregate_by_district(
+            df, district_level, value_col=district_value_col, lat_col=lat_col, lng_col=lng_col
+        )
+        if summary.empty:
+            st.info("ℹ️ 주소에서 구/동을 추출하지 못했습니다.")
+        else:
+            metric_col = f"{district_value_col}_sum" if district_value_col else 'count'
+            chart_df = summary.sort_values(metric_col, ascending=False).head(30)
+            x_col = 'gu' if district_level == 'gu' else chart_df['gu'] + ' ' + chart_df['dong']
+            fig = px.bar(chart_df, x=x_col, y=metric_col, labels={'x': '행정구역', 'gu': '구/군', 'count': '행 수'})
+            st.plotly_chart(fig, use_container_width=True)
+
+            if lat_col and lng_col:
+                st_folium(
+                    create_district_map(summary, label_col=district_level),
+                    width=700, height=450, returned_objects=[]
+                )
+
     # Categorical Distributions
     categorical_cols = df.select_dtypes(include=['object', 'category']).columns.tolist()
     if categorical_cols:
@@ -344,6 +458,93 @@ def render_dataset_tab(dataset_name: str, dataset_display_name: str):
         st.info("ℹ️ 이 데이터셋에는 범주형 컬럼이 없습니다.")
 
 
+def render_viewport_map(
+    df: pd.DataFrame,
+    dataset_name: str,
+    dataset_display_name: str,
+    lat_col: str,
+    lng_col: str,
+    popup_cols: list[str],
+    max_points: int
+):
+    """
+    Render a map that loads only the points inside the current viewport.
+
+    st_folium reports the map bounds, center and zoom back; when the zoom changes or
+    the bounds move by more than VIEWPORT_MOVE_TOLERANCE of the viewport span, the
+    visible points are queried from the cached spatial index and the map is rebuilt
+    at the reported center and zoom (passed back unchanged, so the view never drifts).
+    Zooming in shows every point once fewer than max_points are visible.
+    """
+    view_key = f"viewport_{dataset_name}_{len(df)}"
+    view = st.session_state.get(view_key)
+    if view is None:
+        # First render: the whole dataset extent
+        df_clean = clean_coordinates(df, lat_col, lng_col)
+        if df_clean.empty:
+            st.info("ℹ️ 지도에 표시할 유효한 좌표가 없습니다.")
+            return
+        view = {
+            'bounds': (
+                df_clean[lat_col].min(), df_clean[lng_col].min(),
+                df_clean[lat_col].max(), df_clean[lng_col].max()
+            ),
+            'center': None,
+            'zoom': None
+        }
+
+    # Map cache per viewport (the 'map_' prefix is cleared when map settings change)
+    cache_key = f"map_viewport_{dataset_name}_{len(df)}_{max_points}"
+    cached = st.session_state.get(cache_key)
+    if cached is None or cached[0] != view['bounds']:
+        visible, total = select_viewport_points(df, lat_col, lng_col, view['bounds'], max_points)
+        cached = (view['bounds'], total, len(visible), create_folium_map(
+            visible, lat_col, lng_col,
+            popup_cols=popup_cols,
+            color='blue',
+            name=dataset_display_name,
+            max_points=max_points,
+            render_mode='fast'
+        ))
+        st.session_state[cache_key] = cached
+
+    _, total, shown, m = cached
+    st.caption(f"🔭 현재 화면의 포인트 {total:,}개 중 {shown:,}개 표시 (확대하면 더 자세히 표시됩니다)")
+
+    result = st_folium(
+        m, key=f"{dataset_name}_viewport_map", width=700, height=500,
+        center=view['center'], zoom=view['zoom'],
+        returned_objects=['bounds', 'center', 'zoom']
+    )
+
+    result = result or {}
+    bounds = result.get('bounds') or {}
+    south_west, north_east = bounds.get('_southWest') or {}, bounds.get('_northEast') or {}
+    center = result.get('center') or {}
+    if None in (south_west.get('lat'), south_west.get('lng'), north_east.get('lat'), north_east.get('lng'),
+                center.get('lat'), center.get('lng')):
+        return
+
+    new_bounds = tuple(float(v) for v in (
+        south_west['lat'], south_west['lng'], north_east['lat'], north_east['lng']
+    ))
+
+    # Sub-pixel differences between reruns must not trigger a reload (rerun loop)
+    lat_span = max(new_bounds[2] - new_bounds[0], 1e-9)
+    lng_span = max(new_bounds[3] - new_bounds[1], 1e-9)
+    moved = any(
+        abs(new - old) > VIEWPORT_MOVE_TOLERANCE * span
+        for new, old, span in zip(new_bounds, view['bounds'], (lat_span, lng_span, lat_span, lng_span))
+    )
+    if moved or result.get('zoom') != view['zoom']:
+        st.session_state[view_key] = {
+            'bounds': new_bounds,
+            'center': (float(center['lat']), float(center['lng'])),
+            'zoom': result.get('zoom')
+        }
+        st.rerun()
+
+
 def render_overview_tab():
     """
     Render the project overview tab with upload functionality. (T016-T019)
@@ -517,7 +718,7 @@ def render_cross_analysis_tab():
                 st.warning(f"⚠️ {name} 데이터셋에서 좌표 정보를 찾을 수 없습니다. (지도 및 근접 분석 제외)")
 
     # Create tabs for different analysis types
-    analysis_tabs = st.tabs(["🗺️ 통합 지도", "📍 근접 분석", "📈 분포 비교"])
+    analysis_tabs = st.tabs(["🗺️ 통합 지도", "📍 근접 분석", "📈 분포 비교", "🚨 사각지대 분석", "📊 공간 자기상관"])
 
     # Tab 1: Overlay Map (T035)
     with analysis_tabs[0]:
@@ -534,9 +735,10 @@ def render_cross_analysis_tab():
                     st.markdown(f"{emoji} **{ds['name']}** ({len(ds['df']):,}개)")
 
             # Overlay map caching with session_state
-            overlay_cache_key = f"overlay_map_{len(datasets_to_overlay)}_{sum(len(ds['df']) for ds in datasets_to_overlay)}"
+            render_mode = st.session_state.map_settings['render_mode']
+            overlay_cache_key = f"overlay_map_{len(datasets_to_overlay)}_{sum(len(ds['df']) for ds in datasets_to_overlay)}_{render_mode}"
             if overlay_cache_key not in st.session_state:
-                st.session_state[overlay_cache_key] = create_overlay_map(datasets_to_overlay)
+                st.session_state[overlay_cache_key] = create_overlay_map(datasets_to_overlay, render_mode=render_mode)
 
             # Display map with returned_objects=[] to prevent rerendering
             st_folium(st.session_state[overlay_cache_key], width=900, height=600, returned_objects=[])
@@ -573,41 +775,116 @@ def render_cross_analysis_tab():
                     key="proximity_target"
                 )
 
-            # Threshold selection
-            st.markdown("**분석 거리 임계값 (km):**")
-            threshold_col1, threshold_col2, threshold_col3 = st.columns(3)
-            with threshold_col1:
-                t1 = st.number_input("임계값 1", value=0.5, min_value=0.1, max_value=10.0, step=0.1, key="t1")
-            with threshold_col2:
-                t2 = st.number_input("임계값 2", value=1.0, min_value=0.1, max_value=10.0, step=0.1, key="t2")
-            with threshold_col3:
-                t3 = st.number_input("임계값 3", value=2.0, min_value=0.1, max_value=10.0, step=0.1, key="t3")
-
-            thresholds = sorted([t1, t2, t3])
+            # Threshold selection: 임계값 개수와 무관하게 한 번의 거리 계산으로 처리됨
+            thresholds_text = st.text_input(
+                "분석 거리 임계값 (km, 쉼표로 구분):",
+                value="0.5, 1.0, 2.0",
+                key="proximity_thresholds"
+            )
+            try:
+                thresholds = sorted({float(t) for t in thresholds_text.split(',') if t.strip()})
+            except ValueError:
+                thresholds = []
+            thresholds = [t for t in thresholds if 0 < t <= 10.0]
+            if not thresholds:
+                st.warning("⚠️ 0 초과 10 이하의 숫자를 쉼표로 구분해 입력해주세요. 기본값(0.5, 1.0, 2.0)을 사용합니다.")
+                thresholds = [0.5, 1.0, 2.0]
+
+            # 반경별 개수 곡선: 임계값과 같은 패스에서 계산되므로 추가 비용이 거의 없음
+            show_curve = st.checkbox("📈 반경별 개수 곡선 표시", value=True, key="proximity_show_curve")
+            curve_radii = proximity_curve_radii(max(thresholds), step_km=0.1) if show_curve else []
+
+            # 기본은 전체 데이터 분석, 샘플링은 빠른 미리보기용 선택 옵션
+            use_sampling = st.checkbox("샘플링 사용 (빠른 미리보기)", value=False, key="proximity_use_sampling")
+            sample_size = None
+            if use_sampling:
+                sample_size = int(st.number_input(
+                    "샘플 크기", value=5000, min_value=100, max_value=100000, step=1000, key="proximity_sample_size"
+                ))
+
+            # 거리 계산 방식: 대구 범위에서는 평면 근사 오차가 0.29% 이하
+            distance_mode_label = st.radio(
+                "거리 계산 방식:",
+                options=['하버사인 (정확)', '평면 근사 (빠름, 오차 0.3% 이하)'],
+                horizontal=True,
+                key="proximity_distance_mode"
+            )
+            distance_mode = 'haversine' if distance_mode_label.startswith('하버사인') else 'equirectangular'
+
+            # 가중 집계: 개수 대신 대상 데이터셋의 숫자형 컬럼(예: 카메라 대수, 주차면수)을 반경 내에서 집계
+            target_data = datasets_with_coords[target_name]
+            value_options = [
+                col for col in target_data['df'].select_dtypes(include='number').columns
+                if col not in (target_data['lat_col'], target_data['lng_col'])
+            ]
+            value_col = st.selectbox(
+                "가중 집계 컬럼 (선택):",
+                options=['(사용 안 함)'] + value_options,
+                key="proximity_value_col",
+                help="대상 데이터셋의 숫자형 컬럼을 반경 내에서 합계 또는 평균합니다."
+            )
+            value_col = None if value_col == '(사용 안 함)' else value_col
+            if value_col:
+                col1, col2 = st.columns(2)
+                with col1:
+                    weighted_agg = st.radio(
+                        "집계 방식:", options=['합계', '평균'], horizontal=True, key="proximity_weighted_agg"
+                    )
+                with col2:
+                    kernel_labels = {'균등': 'uniform', '선형 감쇠': 'linear', '가우시안 감쇠': 'gaussian'}
+                    kernel_label = st.selectbox(
+                        "거리 감쇠 커널:", options=list(kernel_labels.keys()), key="proximity_kernel",
+                        help="가까운 시설일수록 큰 가중치를 줍니다. 가우시안 대역폭은 가장 작은 임계값입니다."
+                    )
 
             if st.button("🔍 근접 분석 실행", key="run_proximity"):
                 base_data = datasets_with_coords[base_name]
-                target_data = datasets_with_coords[target_name]
 
-                # Show progress
-                with st.spinner(f"'{base_name}'과(와) '{target_name}' 간의 근접 분석 중..."):
+                # Show progress per processed chunk
+                progress_text = f"'{base_name}'과(와) '{target_name}' 간의 근접 분석 중..."
+                progress_bar = st.progress(0.0, text=progress_text)
+
+                def update_progress(done: int, total: int):
+                    progress_bar.progress(done / total if total else 1.0, text=f"{progress_text} ({done:,}/{total:,})")
+
+                with st.spinner(progress_text):
                     try:
-                        # Run proximity analysis (T034)
-                        proximity_df = compute_proximity_stats(
-                            base_data['df'],
-                            base_data['lat_col'],
-                            base_data['lng_col'],
-                            target_data['df'],
-                            target_data['lat_col'],
-                            target_data['lng_col'],
-                            thresholds=thresholds
+                        # Run proximity analysis (T034); with a weighted column, counts and
+                        # weighted aggregates come from the same neighbour pass
+                        proximity_args = (
+                            base_data['df'], base_data['lat_col'], base_data['lng_col'],
+                            target_data['df'], target_data['lat_col'], target_data['lng_col']
                         )
+                        count_thresholds = sorted(set(thresholds) | set(curve_radii))
+                        if value_col:
+                            proximity_df, weighted_df = compute_proximity_counts_and_weights(
+                                *proximity_args,
+                                value_col=value_col,
+                                thresholds=count_thresholds,
+                                weighted_thresholds=thresholds,
+                                agg='sum' if weighted_agg == '합계' else 'mean',
+                                kernel=kernel_labels[kernel_label],
+                                sample_size=sample_size,
+                                progress_callback=update_progress,
+                                distance_mode=distance_mode
+                            )
+                        else:
+                            proximity_df = compute_proximity_stats(
+                                *proximity_args,
+                                thresholds=count_thresholds,
+                                sample_size=sample_size,
+                                progress_callback=update_progress,
+                                distance_mode=distance_mode
+                            )
+                        progress_bar.empty()
 
                         if proximity_df.empty:
                             st.error("❌ 근접 분석 결과가 비어있습니다. 좌표 데이터를 확인해주세요.")
                         else:
                             # Display results table
                             st.markdown("### 📊 근접 분석 결과")
+                            scope = f"샘플 {len(proximity_df):,}개" if sample_size else f"전체 {len(proximity_df):,}개"
+                            st.caption(f"분석 대상 기준 포인트: {scope}")
 
                             # Summary statistics
                             summary_data = []
@@ -625,6 +902,10 @@ def render_cross_analysis_tab():
 
                             st.dataframe(summary_data, use_container_width=True)
 
+                            if show_curve:
+                                curve_df = proximity_df[[str(r) for r in curve_radii]]
+                                st.plotly_chart(plot_proximity_curve(curve_df, target_name), use_container_width=True)
+
                             # Natural language insights (T037)
                             st.markdown("### 💡 분석 인사이트")
                             for t in thresholds:
@@ -633,8 +914,22 @@ def render_cross_analysis_tab():
                                     insight = summarize_proximity_stats(proximity_df, t_str, target_name)
                                     st.markdown(f"**{t}km 반경:** {insight}")
 
+                            # Weighted radius aggregation (computed in the same pass as the counts)
+                            if value_col:
+                                st.markdown(f"### ⚖️ 반경 내 '{value_col}' {weighted_agg} ({kernel_label})")
+                                st.dataframe([
+                                    {
+                                        '거리 임계값': f"{t}km",
+                                        '평균': f"{weighted_df[str(t)].mean():.2f}",
+                                        '중앙값': f"{weighted_df[str(t)].median():.2f}",
+                                        '최소': f"{weighted_df[str(t)].min():.2f}",
+                                        '최대': f"{weighted_df[str(t)].max():.2f}"
+                                    }
+                                    for t in thresholds
+                                ], use_container_width=True)
+
                             # Store results in session state for potential reuse
-                            st.session_state['last_proximity_result'] = proximity_df
+                            st.session_state['last_proximity_result'] = proximity_df[[str(t) for t in thresholds]]
 
                     except Exception as e:
                         st.error(f"❌ 근접 분석 중 오류 발생: {str(e)}")
@@ -747,6 +1042,210 @@ def render_cross_analysis_tab():
                 else:
                     st.info("ℹ️ 비교할 숫자형 컬럼이 없습니다.")
 
+    # Tab 4: Coverage-gap Analysis
+    with analysis_tabs[3]:
+        render_coverage_gap_tab(datasets_with_coords)
+
+    # Tab 5: Spatial Autocorrelation
+    with analysis_tabs[4]:
+        render_spatial_autocorrelation_tab(datasets_with_coords)
+
+
+def render_coverage_gap_tab(datasets_with_coords: dict):
+    """
+    Render the coverage-gap analysis: grid cells with events but no facility within r.
+
+    교차 분석 탭의 사각지대 분석 화면입니다. 도시를 격자로 나누어 셀별 사고 건수와
+    셀 중심에서 가장 가까운 시설(예: CCTV)까지의 거리를 계산하고, 반경 내 시설이 없는
+    셀을 사고 건수 순으로 보여줍니다.
+
+    Parameters:
+        datasets_with_coords (dict): {name: {'df', 'lat_col', 'lng_col'}} of datasets with coordinates
+    """
+    st.subheader("🚨 사각지대 분석")
+    st.markdown("""
+    기준 데이터(예: 사고)가 발생했지만 반경 내에 대상 시설(예: CCTV)이 없는 격자 셀을 찾습니다.
+    포인트 쌍이 아닌 셀 단위로 계산하므로 전체 데이터에서도 수 초 안에 끝납니다.
+    """)
+
+    if len(datasets_with_coords) < 2:
+        st.warning("⚠️ 사각지대 분석을 위해서는 좌표 정보가 있는 데이터셋이 최소 2개 필요합니다.")
+        return
+
+    names = list(datasets_with_coords.keys())
+    col1, col2 = st.columns(2)
+    with col1:
+        event_name = st.selectbox(
+            "기준 데이터셋 (사고 등):",
+            options=names,
+            index=names.index('train') if 'train' in names else 0,
+            key="gap_event"
+        )
+    with col2:
+        facility_options = [n for n in names if n != event_name]
+        facility_name = st.selectbox(
+            "시설 데이터셋 (CCTV 등):",
+            options=facility_options,
+            index=facility_options.index('cctv') if 'cctv' in facility_options else 0,
+            key="gap_facility"
+        )
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        radius_km = st.number_input(
+            "시설 커버 반경 (km)", value=0.3, min_value=0.05, max_value=5.0, step=0.05, key="gap_radius"
+        )
+    with col2:
+        cell_km = st.selectbox("격자 크기 (km)", options=[0.1, 0.25, 0.5, 1.0], index=1, key="gap_cell_km")
+    with col3:
+        min_events = int(st.number_input(
+            "최소 건수", value=1, min_value=1, max_value=1000, step=1, key="gap_min_events"
+        ))
+
+    if st.button("🔍 사각지대 분석 실행", key="run_coverage_gap"):
+        event_data = datasets_with_coords[event_name]
+        facility_data = datasets_with_coords[facility_name]
+
+        with st.spinner(f"'{event_name}' 기준 '{facility_name}' 사각지대 분석 중..."):
+            try:
+                cells = compute_coverage_gaps(
+                    event_data['df'], event_data['lat_col'], event_data['lng_col'],
+                    facility_data['df'], facility_data['lat_col'], facility_data['lng_col'],
+                    radius_km=radius_km,
+                    cell_km=cell_km,
+                    min_events=min_events,
+                    include_covered=True
+                )
+            except Exception as e:
+                st.error(f"❌ 사각지대 분석 중 오류 발생: {str(e)}")
+                return
+
+        if cells.empty:
+            st.info("ℹ️ 조건을 만족하는 격자 셀이 없습니다.")
+            return
+
+        gaps = cells[cells['is_gap']].reset_index(drop=True)
+        total_events = int(cells['event_count'].sum())
+        gap_events = int(gaps['event_count'].sum())
+
+        col1, col2, col3 = st.columns(3)
+        col1.metric("사각지대 셀", f"{len(gaps):,}개", f"전체 {len(cells):,}개 중")
+        col2.metric("사각지대 내 건수", f"{gap_events:,}건")
+        col3.metric("사각지대 비율", f"{gap_events / total_events * 100:.1f}%" if total_events else "0%")
+
+        if gaps.empty:
+            st.success(f"✅ 모든 셀 중심에서 {radius_km}km 이내에 '{facility_name}' 시설이 있습니다.")
+            return
+
+        st.markdown("### 📋 사각지대 상위 셀")
+        st.dataframe(
+            gaps.head(20)[['center_lat', 'center_lng', 'event_count', 'nearest_facility_km']].rename(columns={
+                'center_lat': '셀 중심 위도',
+                'center_lng': '셀 중심 경도',
+                'event_count': '건수',
+                'nearest_facility_km': '가장 가까운 시설 (km)'
+            }),
+            use_container_width=True
+        )
+
+        st.markdown("### 🗺️ 사각지대 지도")
+        st_folium(create_coverage_gap_map(gaps, cell_km), width=900, height=600, returned_objects=[])
+
+
+def render_spatial_autocorrelation_tab(datasets_with_coords: dict):
+    """
+    Render the spatial autocorrelation analysis (global Moran's I, local Gi* hot spots).
+
+    교차 분석 탭의 공간 자기상관 화면입니다. 사고 등이 우연보다 강하게 모여 있는지
+    (Moran's I)와 통계적으로 유의한 핫스팟/콜드스팟 위치(Gi*)를 보여줍니다.
+
+    Parameters:
+        datasets_with_coords (dict): {name: {'df', 'lat_col', 'lng_col'}} of datasets with coordinates
+    """
+    st.subheader("📊 공간 자기상관 분석")
+    st.markdown("""
+    포인트가 우연보다 강하게 모여 있는지(**Moran's I**)와 유의한 핫스팟/콜드스팟(**Gi\\***)을 찾습니다.
+    격자 셀의 포인트 수(또는 숫자형 컬럼 합계)를 반경 내 이웃 셀과 비교합니다.
+    """)
+
+    if not datasets_with_coords:
+        st.warning("⚠️ 좌표 정보가 있는 데이터셋이 없습니다.")
+        return
+
+    names = list(datasets_with_coords.keys())
+    col1, col2 = st.columns(2)
+    with col1:
+        dataset_name = st.selectbox(
+            "분석 데이터셋:",
+            options=names,
+            index=names.index('train') if 'train' in names else 0,
+            key="autocorr_dataset"
+        )
+    data = datasets_with_coords[dataset_name]
+    with col2:
+        value_options = [
+            col for col in data['df'].select_dtypes(include='number').columns
+            if col not in (data['lat_col'], data['lng_col'])
+        ]
+        value_col = st.selectbox(
+            "분석 값:", options=['포인트 수'] + value_options, key="autocorr_value_col",
+            help="숫자형 컬럼을 선택하면 셀별 합계를 분석합니다."
+        )
+        value_col = None if value_col == '포인트 수' else value_col
+
+    col1, col2 = st.columns(2)
+    with col1:
+        cell_km = st.selectbox("격자 크기 (km)", options=[0.1, 0.25, 0.5, 1.0], index=1, key="autocorr_cell_km")
+    with col2:
+        radius_km = st.number_input(
+            "이웃 반경 (km)", value=0.5, min_value=0.1, max_value=5.0, step=0.1, key="autocorr_radius",
+            help="셀 중심 간 거리가 이 반경 이내이면 이웃으로 봅니다."
+        )
+
+    if st.button("🔍 공간 자기상관 분석 실행", key="run_autocorr"):
+        with st.spinner(f"'{dataset_name}' 공간 자기상관 분석 중..."):
+            try:
+                global_stats, local = compute_spatial_autocorrelation(
+                    data['df'], data['lat_col'], data['lng_col'],
+                    value_col=value_col, radius_km=radius_km, cell_km=cell_km
+                )
+            except Exception as e:
+                st.error(f"❌ 공간 자기상관 분석 중 오류 발생: {str(e)}")
+                return
+
+        if global_stats['n'] == 0:
+            st.warning("⚠️ 유효한 좌표가 있는 행이 없어 공간 자기상관을 분석할 수 없습니다.")
+            return
+
+        if pd.isna(global_stats['morans_i']):
+            st.info("ℹ️ 셀 수가 너무 적거나 값의 변화가 없어 분석할 수 없습니다.")
+            return
+
+        col1, col2, col3 = st.columns(3)
+        col1.metric("Moran's I", f"{global_stats['morans_i']:.3f}", f"기댓값 {global_stats['expected_i']:.4f}")
+        col2.metric("z 점수", f"{global_stats['z_score']:.2f}")
+        col3.metric("p 값", f"{global_stats['p_value']:.4f}")
+
+        if global_stats['p_value'] < 0.05:
+            pattern = "군집되어" if global_stats['morans_i'] > global_stats['expected_i'] else "분산되어"
+            st.success(f"✅ 값이 공간적으로 유의하게 {pattern} 있습니다. (p < 0.05, 셀 {global_stats['n']:,}개)")
+        else:
+            st.info(f"ℹ️ 공간적 군집이 유의하지 않습니다. (p = {global_stats['p_value']:.3f})")
+
+        hotspot_labels = {
+            'hot_99': '핫스팟 (99%)', 'hot_95': '핫스팟 (95%)', 'hot_90': '핫스팟 (90%)',
+            'cold_99': '콜드스팟 (99%)', 'cold_95': '콜드스팟 (95%)', 'cold_90': '콜드스팟 (90%)',
+            'not_significant': '유의하지 않음'
+        }
+        counts = local['hotspot'].value_counts()
+        st.dataframe(
+            [{'구분': label, '셀 수': int(counts.get(key, 0))} for key, label in hotspot_labels.items()],
+            use_container_width=True
+        )
+
+        st.markdown("### 🗺️ Gi* 핫스팟 지도")
+        st_folium(create_hotspot_map(local, cell_km), width=900, height=600, returned_objects=[])
+
 
 def render_sidebar():
     """
@@ -785,6 +1284,30 @@ def render_sidebar():
             )
             st.caption("기본값: 5000")
 
+            render_mode_labels = {
+                'markers': '마커',
+                'fast': '빠른 마커 (브라우저 렌더링)',
+                'clusters': '서버 클러스터 (줌 단계별)',
+                'heatmap': '히트맵 (격자 집계)',
+                'kde': '밀도 (KDE 이미지)'
+            }
+            render_mode_input = st.selectbox(
+                "표시 방식",
+                options=list(render_mode_labels),
+                index=list(render_mode_labels).index(st.session_state.map_settings['render_mode']),
+                format_func=render_mode_labels.get,
+                help="빠른 마커는 좌표 배열만 보내고 브라우저에서 마커와 팝업을 만듭니다. "
+                     "서버 클러스터는 줌 단계별로 미리 집계한 원과 개수만 그립니다. "
+                     "히트맵은 모든 포인트를 격자 셀로 묶어 셀 중심과 가중치만 보냅니다. "
+                     "밀도 모드는 모든 포인트로 커널 밀도 이미지를 한 장 그려 지도에 겹칩니다 (최대 포인트 수 무시)."
+            )
+            viewport_input = st.checkbox(
+                "화면 범위만 불러오기",
+                value=st.session_state.map_settings['viewport'],
+                help="데이터셋 지도에서 현재 화면 안의 포인트만 최대 표시 포인트 수까지 불러옵니다. "
+                     "확대할수록 샘플 대신 모든 포인트가 보입니다 (마커 표시 방식에서만 적용)."
+            )
+
             # 숨김 submit 버튼 (Enter 키로 제출)
             submitted = st.form_submit_button("적용", use_container_width=True)
 
@@ -795,6 +1318,8 @@ def render_sidebar():
                         st.error("❌ 1 이상의 숫자를 입력해주세요")
                     else:
                         st.session_state.map_settings['max_points'] = new_val
+                        st.session_state.map_settings['render_mode'] = render_mode_input
+                        st.session_state.map_settings['viewport'] = viewport_input
                         st.session_state.map_settings['confirmed'] = True
                         # 지도 캐시 초기화
                         keys_to_delete = [k for k in list(st.session_state.keys()) if k.startswith('map_') and k != 'map_settings']
@@ -0,0 +1,90 @@
+"""
+Benchmark: compute_proximity_stats speedup versus number of worker processes.
+
+Generates synthetic points inside the Daegu bounds (or loads real CSVs) and times
+the proximity analysis for n_jobs = 1, 2, 4, ... up to the CPU count.
+
+The app runs the proximity analysis in-process (n_jobs=1); the worker-count
+control stays hidden until this benchmark shows a speedup on a multi-core machine.
+
+Usage:
+    python benchmarks/bench_proximity_parallel.py
+    python benchmarks/bench_proximity_parallel.py --base 300000 --target 70000
+    python benchmarks/bench_proximity_parallel.py \
+        --base-csv data/countrywide_accident.csv --target-csv "data/대구 보안등 정보.csv"
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.geo import compute_proximity_stats, detect_lat_lng_columns  # noqa: E402
+from utils.loader import read_csv_safe  # noqa: E402
+
+
+def make_points(n: int, seed: int) -> pd.DataFrame:
+    """Random points inside the default Daegu bounds (35.7-36.1 N, 128.4-128.8 E)."""
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'lat': rng.uniform(35.7, 36.1, n),
+        'lng': rng.uniform(128.4, 128.8, n)
+    })
+
+
+def load_points(path: str) -> pd.DataFrame:
+    """Load a CSV and rename its detected coordinate columns to lat/lng."""
+    df = read_csv_safe(path)
+    lat_col, lng_col = detect_lat_lng_columns(df)
+    if not lat_col or not lng_col:
+        raise ValueError(f"No coordinate columns detected in {path}")
+    return df[[lat_col, lng_col]].rename(columns={lat_col: 'lat', lng_col: 'lng'})
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--base', type=int, default=200_000, help='Synthetic base points (default: 200000)')
+    parser.add_argument('--target', type=int, default=70_000, help='Synthetic target points (default: 70000)')
+    parser.add_argument('--base-csv', help='Use a real CSV as the base dataset')
+    parser.add_argument('--target-csv', help='Use a real CSV as the target dataset')
+    parser.add_argument('--thresholds', type=float, nargs='+', default=[0.5, 1.0, 2.0])
+    parser.add_argument('--chunk-size', type=int, default=5000)
+    parser.add_argument('--repeat', type=int, default=1, help='Runs per worker count, best time is reported')
+    args = parser.parse_args()
+
+    df_base = load_points(args.base_csv) if args.base_csv else make_points(args.base, seed=1)
+    df_target = load_points(args.target_csv) if args.target_csv else make_points(args.target, seed=2)
+
+    cpu_count = os.cpu_count() or 1
+    worker_counts = sorted({1, cpu_count} | {2 ** k for k in range(1, 8) if 2 ** k < cpu_count})
+
+    print(f"base={len(df_base):,} target={len(df_target):,} thresholds={args.thresholds} cpus={cpu_count}")
+    print(f"{'n_jobs':>6} {'seconds':>9} {'speedup':>8}")
+
+    baseline = None
+    reference = None
+    for n_jobs in worker_counts:
+        best = float('inf')
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            result = compute_proximity_stats(
+                df_base, 'lat', 'lng', df_target, 'lat', 'lng',
+                thresholds=args.thresholds, chunk_size=args.chunk_size, n_jobs=n_jobs
+            )
+            best = min(best, time.perf_counter() - start)
+
+        if reference is None:
+            reference = result
+        elif not reference.equals(result):
+            raise AssertionError(f"n_jobs={n_jobs} produced different counts than n_jobs=1")
+
+        baseline = baseline or best
+        print(f"{n_jobs:>6} {best:>9.2f} {baseline / best:>7.2f}x")
+
+
+if __name__ == '__main__':
+    main()
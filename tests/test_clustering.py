@@ -0,0 +1,106 @@
+"""
+Parity checks of the grid-accelerated dbscan against a naive O(n²) DBSCAN.
+
+Usage:
+    python -m pytest tests
+"""
+import os
+import sys
+from math import sqrt
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.clustering import NOISE_LABEL, dbscan  # noqa: E402
+from utils.geo import haversine_matrix, project_to_local_xy, unproject_local_xy  # noqa: E402
+
+
+def naive_dbscan(lats: np.ndarray, lngs: np.ndarray, eps_km: float, min_samples: int, metric: str):
+    """Reference DBSCAN on the full distance matrix: (core mask, core cluster ids, neighbour matrix)."""
+    if metric == 'haversine':
+        distances = haversine_matrix(lats, lngs, lats, lngs)
+    else:
+        x, y = project_to_local_xy(lats, lngs)
+        distances = np.hypot(x[:, None] - x[None, :], y[:, None] - y[None, :])
+    neighbours = distances <= eps_km
+    core = neighbours.sum(axis=1) >= min_samples
+
+    components = np.full(len(lats), -1)
+    n_components = 0
+    for start in np.flatnonzero(core):
+        if components[start] >= 0:
+            continue
+        components[start] = n_components
+        stack = [start]
+        while stack:
+            point = stack.pop()
+            for other in np.flatnonzero(neighbours[point] & core & (components < 0)):
+                components[other] = n_components
+                stack.append(other)
+        n_components += 1
+    return core, components, neighbours
+
+
+def assert_same_clustering(labels, lats, lngs, eps_km, min_samples, metric='haversine'):
+    """Core points must form the same partition; border points must join a cluster of a core neighbour."""
+    core, components, neighbours = naive_dbscan(lats, lngs, eps_km, min_samples, metric)
+
+    assert (labels[core] != NOISE_LABEL).all()
+    pairs = set(zip(labels[core], components[core]))
+    assert len(pairs) == len(set(labels[core])) == len(set(components[core]))
+
+    for point in np.flatnonzero(~core):
+        core_neighbours = np.flatnonzero(neighbours[point] & core)
+        if len(core_neighbours) == 0:
+            assert labels[point] == NOISE_LABEL
+        else:
+            assert labels[point] in set(labels[core_neighbours])
+
+
+def make_clusters(origin_lat: float, seed: int) -> tuple[np.ndarray, np.ndarray]:
+    """Gaussian blobs of varied size plus uniform noise around (origin_lat, 128.6)."""
+    rng = np.random.default_rng(seed)
+    centers = rng.random((15, 2)) * 0.05
+    blobs = [c + rng.normal(0, 0.0004, (rng.integers(5, 60), 2)) for c in centers]
+    points = np.concatenate(blobs + [rng.random((300, 2)) * 0.05])
+    return origin_lat + points[:, 0], 128.6 + points[:, 1]
+
+
+@pytest.mark.parametrize('metric', ['haversine', 'equirectangular'])
+def test_dbscan_matches_naive_in_daegu(metric):
+    lats, lngs = make_clusters(35.85, seed=1)
+
+    labels = dbscan(lats, lngs, eps_km=0.1, min_samples=8, metric=metric)
+
+    assert labels.max() >= 1
+    assert_same_clustering(labels, lats, lngs, 0.1, 8, metric)
+
+
+@pytest.mark.parametrize('origin_lat', [0.5, 60.0])
+def test_dbscan_matches_naive_far_from_daegu(origin_lat):
+    lats, lngs = make_clusters(origin_lat, seed=2)
+
+    labels = dbscan(lats, lngs, eps_km=0.1, min_samples=8)
+
+    assert_same_clustering(labels, lats, lngs, 0.1, 8)
+
+
+def test_dbscan_cell_points_beyond_eps_are_not_core():
+    # Two groups of 3 points in opposite corners of one Daegu-projected fine cell near
+    # the equator: ~0.11 km apart (> eps), so no point has min_samples neighbours
+    side = 0.1 / sqrt(2) / 1.01
+    x0, y0 = project_to_local_xy(np.array([0.0]), np.array([128.6]))
+    cell_x, cell_y = np.floor(x0[0] / side) * side, np.floor(y0[0] / side) * side
+    xs = np.array([cell_x + 1e-4] * 3 + [cell_x + side - 1e-4] * 3) + np.array([0, 1e-5, 2e-5] * 2)
+    ys = np.array([cell_y + 1e-4] * 3 + [cell_y + side - 1e-4] * 3)
+    lats, lngs = unproject_local_xy(xs, ys)
+
+    labels = dbscan(lats, lngs, eps_km=0.1, min_samples=6)
+
+    assert (labels == NOISE_LABEL).all()
+
+
+def test_dbscan_empty_input():
+    assert len(dbscan(np.zeros(0), np.zeros(0))) == 0
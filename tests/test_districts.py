@@ -0,0 +1,63 @@
+"""
+Checks of 구/동 parsing from road-name (도로명) and lot-number (지번) addresses.
+
+Usage:
+    python -m pytest tests
+"""
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.districts import detect_address_columns, parse_districts, with_district_columns  # noqa: E402
+
+
+def parsed(addresses: list) -> list[tuple]:
+    """(gu, dong) per address, None where not found."""
+    result = parse_districts(pd.Series(addresses, dtype=object))
+    return [
+        (None if pd.isna(gu) else gu, None if pd.isna(dong) else dong)
+        for gu, dong in zip(result['gu'], result['dong'])
+    ]
+
+
+def test_parse_road_name_addresses():
+    assert parsed([
+        '대구광역시 수성구 달구벌대로 2450 (범어동)',
+        '대구광역시 달서구 월배로 100, 101동 202호 (상인동)',
+        '대구광역시 서구 국채보상로 1 (평리동, 평리아파트)'
+    ]) == [('수성구', '범어동'), ('달서구', '상인동'), ('서구', '평리동')]
+
+
+def test_parse_lot_number_addresses():
+    assert parsed([
+        '대구광역시 수성구 범어동 123-4',
+        '대구광역시 중구 삼덕동2가 51',
+        '대구광역시 달성군 화원읍 천내리 1',
+        '대구광역시 군위군 군위읍 동부리 1',
+        '대구광역시 달서구 월성동 101동 202호'
+    ]) == [('수성구', '범어동'), ('중구', '삼덕동2가'), ('달성군', '화원읍'), ('군위군', '군위읍'), ('달서구', '월성동')]
+
+
+def test_parse_bare_district_and_missing_values():
+    assert parsed(['수성구', np.nan, '서울특별시 강남구 역삼동 1']) == [
+        ('수성구', None), (None, None), (None, '역삼동')
+    ]
+
+
+def test_parse_keeps_index_and_repeated_addresses():
+    addresses = pd.Series(['대구광역시 북구 산격동 1'] * 3, index=[10, 20, 30])
+
+    result = parse_districts(addresses)
+
+    assert list(result.index) == [10, 20, 30]
+    assert list(result['gu']) == ['북구'] * 3
+
+
+def test_derived_columns_are_not_address_columns():
+    df = pd.DataFrame({'주소': ['대구광역시 수성구 범어동 1-2', '대구광역시 중구 삼덕동2가 3'] * 20})
+
+    assert detect_address_columns(with_district_columns(df)) == ['주소']
@@ -0,0 +1,120 @@
+"""
+Brute-force parity checks for the grid-indexed queries in utils.geo.
+
+Every indexed query is compared against the full O(n × m) distance matrix.
+
+Usage:
+    python -m pytest tests
+"""
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import utils.geo as geo  # noqa: E402
+from utils.geo import (  # noqa: E402
+    GridIndex,
+    compute_proximity_stats,
+    find_spatiotemporal_neighbors,
+    haversine_matrix,
+    project_to_local_xy
+)
+
+
+THRESHOLDS = [0.1, 0.5, 1.0, 2.0]
+
+
+def make_points(n: int, seed: int) -> pd.DataFrame:
+    """Random points inside Daegu, half of them in tight clusters (dense cells)."""
+    rng = np.random.default_rng(seed)
+    n_spread = n // 2
+    centers = rng.uniform([35.80, 128.50], [35.95, 128.70], size=(10, 2))
+    clustered = centers[rng.integers(0, 10, n - n_spread)] + rng.normal(0, 0.002, (n - n_spread, 2))
+    spread = rng.uniform([35.75, 128.45], [36.05, 128.75], size=(n_spread, 2))
+    points = np.vstack([spread, clustered])
+    return pd.DataFrame({'lat': points[:, 0], 'lng': points[:, 1]})
+
+
+def distance_matrix(base: pd.DataFrame, target: pd.DataFrame, metric: str) -> np.ndarray:
+    """Full base × target distance matrix under the given metric."""
+    if metric == 'haversine':
+        return haversine_matrix(base['lat'], base['lng'], target['lat'], target['lng'])
+    bx, by = project_to_local_xy(base['lat'].to_numpy(), base['lng'].to_numpy())
+    tx, ty = project_to_local_xy(target['lat'].to_numpy(), target['lng'].to_numpy())
+    return np.hypot(bx[:, None] - tx[None, :], by[:, None] - ty[None, :])
+
+
+@pytest.mark.parametrize('metric', ['haversine', 'equirectangular'])
+def test_query_radius_counts_matches_brute_force(metric):
+    base, target = make_points(600, 1), make_points(2000, 2)
+    index = GridIndex(target['lat'], target['lng'], cell_km=0.5, metric=metric)
+
+    counts = index.query_radius_counts(base['lat'], base['lng'], THRESHOLDS)
+
+    distances = distance_matrix(base, target, metric)
+    expected = np.stack([(distances <= r).sum(axis=1) for r in THRESHOLDS], axis=1)
+    np.testing.assert_array_equal(counts, expected)
+
+
+def test_compute_proximity_stats_matches_brute_force():
+    base, target = make_points(800, 3), make_points(1500, 4)
+
+    result = compute_proximity_stats(base, 'lat', 'lng', target, 'lat', 'lng', THRESHOLDS, chunk_size=128)
+
+    distances = distance_matrix(base, target, 'haversine')
+    for r in THRESHOLDS:
+        np.testing.assert_array_equal(result[str(r)].to_numpy(), (distances <= r).sum(axis=1))
+    assert result.index.equals(base.index)
+
+
+def test_compute_proximity_stats_parallel_matches_serial(monkeypatch):
+    # Pretend to have several cores so n_jobs=2 really shards chunks over a process pool
+    monkeypatch.setattr(geo.os, 'cpu_count', lambda: 4)
+    base, target = make_points(1200, 5), make_points(1500, 6)
+
+    serial = compute_proximity_stats(base, 'lat', 'lng', target, 'lat', 'lng', THRESHOLDS, chunk_size=200)
+    parallel = compute_proximity_stats(
+        base, 'lat', 'lng', target, 'lat', 'lng', THRESHOLDS, chunk_size=200, n_jobs=2
+    )
+
+    pd.testing.assert_frame_equal(parallel, serial)
+
+
+def test_query_knn_matches_brute_force():
+    base, target = make_points(500, 7), make_points(1500, 8)
+    index = GridIndex(target['lat'], target['lng'], cell_km=0.25)
+
+    distances, indices = index.query_knn(base['lat'], base['lng'], k=3)
+
+    full = distance_matrix(base, target, 'haversine')
+    expected_indices = np.argsort(full, axis=1, kind='stable')[:, :3]
+    expected_distances = np.take_along_axis(full, expected_indices, axis=1)
+    np.testing.assert_allclose(distances, expected_distances, rtol=1e-12)
+    np.testing.assert_allclose(np.take_along_axis(full, indices, axis=1), expected_distances, rtol=1e-12)
+
+
+def test_query_knn_with_fewer_points_than_k():
+    index = GridIndex([35.87, 35.88], [128.60, 128.61])
+
+    distances, indices = index.query_knn([35.87], [128.60], k=3)
+
+    assert list(indices[0, 2:]) == [-1]
+    assert np.isinf(distances[0, 2])
+
+
+def test_spatiotemporal_counts_match_brute_force():
+    rng = np.random.default_rng(9)
+    df = make_points(1500, 10)
+    df['time'] = pd.Timestamp('2024-01-01') + pd.to_timedelta(rng.integers(0, 14 * 24 * 3600, len(df)), unit='s')
+
+    result = find_spatiotemporal_neighbors(df, 'lat', 'lng', 'time', radius_km=0.2, window_hours=24)
+
+    distances = distance_matrix(df, df, 'haversine')
+    hours = (df['time'] - df['time'].min()).dt.total_seconds().to_numpy() / 3600.0
+    near = (distances <= 0.2) & (np.abs(hours[:, None] - hours[None, :]) <= 24)
+    np.fill_diagonal(near, False)
+    np.testing.assert_array_equal(result['st_neighbors'].to_numpy(), near.sum(axis=1))
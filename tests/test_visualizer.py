@@ -0,0 +1,34 @@
+"""
+Regression checks for utils.visualizer map rendering.
+
+Usage:
+    python -m pytest tests
+"""
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.visualizer import create_folium_map  # noqa: E402
+
+
+def make_points(n: int, seed: int = 0) -> pd.DataFrame:
+    """Random points around central Daegu."""
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        '위도': 35.87 + rng.random(n) * 0.05,
+        '경도': 128.60 + rng.random(n) * 0.05
+    })
+
+
+def test_markers_mode_clusters_more_than_100_points():
+    html = create_folium_map(make_points(500), '위도', '경도', render_mode='markers').get_root().render()
+    assert 'markerClusterGroup' in html
+
+
+def test_markers_mode_skips_cluster_for_few_points():
+    html = create_folium_map(make_points(50), '위도', '경도', render_mode='markers').get_root().render()
+    assert 'markerClusterGroup' not in html
@@ -4,9 +4,14 @@ Utility modules for Daegu Public Data Visualization v1.1.1.
 Modules:
 - loader: CSV data loading with encoding fallback and caching
 - geo: Geospatial utilities for coordinate detection and distance calculations
+- cache: Dataset fingerprinting and bounded caches for derived data
+- binning: Square/hex grid binning, FFT kernel density rasters and zoom cluster pyramids
+- districts: 구/동 parsing from address columns into cached categorical columns
+- clustering: Grid-accelerated DBSCAN for hotspot detection
+- spatial_stats: Moran's I and Getis-Ord Gi* with sparse neighbour weights
 - visualizer: Plotly charts and Folium maps generation
 - chatbot: Anthropic Claude chatbot for data Q&A with Tool Calling
-- tools: 15 data analysis tools for Tool Calling
+- tools: Data analysis tools (TOOLS) for Tool Calling
 """
 from utils.loader import (
     read_csv_safe,
@@ -18,8 +23,62 @@ from utils.loader import (
 from utils.geo import (
     detect_lat_lng_columns,
     haversine_distance,
+    haversine_to_many,
+    haversine_pairs,
+    haversine_matrix,
+    iter_haversine_chunks,
     validate_coordinates,
-    compute_proximity_stats
+    validate_coordinates_df,
+    get_coordinate_validation,
+    clean_coordinates,
+    project_to_local_xy,
+    unproject_local_xy,
+    stratified_spatial_sample,
+    spatial_sample,
+    GridIndex,
+    get_spatial_index,
+    prune_index_cache,
+    select_viewport_points,
+    compute_proximity_stats,
+    compute_weighted_proximity_stats,
+    compute_proximity_counts_and_weights,
+    compute_nearest_neighbors,
+    spatial_join_radius,
+    compute_coverage_gaps,
+    SpatioTemporalIndex,
+    find_spatiotemporal_neighbors,
+    build_proximity_features,
+    compute_proximity_curve,
+    proximity_curve_radii
+)
+from utils.binning import (
+    assign_cells,
+    cell_centers,
+    aggregate_grid,
+    kde_raster,
+    zoom_cell_km,
+    build_cluster_pyramid,
+    get_cluster_pyramid
+)
+from utils.districts import (
+    DAEGU_DISTRICTS,
+    parse_districts,
+    detect_address_columns,
+    get_district_index,
+    with_district_columns,
+    aggregate_by_district
+)
+from utils.clustering import (
+    dbscan,
+    summarize_clusters,
+    cluster_hotspots
+)
+from utils.spatial_stats import (
+    distance_band_weights,
+    morans_i,
+    getis_ord_gi_star,
+    classify_hotspots,
+    compute_spatial_autocorrelation
 )
 from utils.visualizer import (
     plot_numeric_distribution,
@@ -28,9 +87,18 @@ from utils.visualizer import (
     plot_kde,
     plot_scatter,
     plot_with_options,
+    plot_proximity_curve,
     check_missing_ratio,
     create_folium_map,
-    create_overlay_map
+    create_overlay_map,
+    add_fast_markers,
+    add_kde_overlay,
+    add_cluster_pyramid,
+    add_heatmap,
+    create_coverage_gap_map,
+    create_cluster_map,
+    create_district_map,
+    create_hotspot_map
 )
 from utils.chatbot import (
     SYSTEM_PROMPT,
@@ -57,8 +125,58 @@ __all__ = [
     # geo
     'detect_lat_lng_columns',
     'haversine_distance',
+    'haversine_to_many',
+    'haversine_pairs',
+    'haversine_matrix',
+    'iter_haversine_chunks',
     'validate_coordinates',
+    'validate_coordinates_df',
+    'get_coordinate_validation',
+    'clean_coordinates',
+    'project_to_local_xy',
+    'unproject_local_xy',
+    'stratified_spatial_sample',
+    'spatial_sample',
+    'GridIndex',
+    'get_spatial_index',
+    'prune_index_cache',
+    'select_viewport_points',
     'compute_proximity_stats',
+    'compute_weighted_proximity_stats',
+    'compute_proximity_counts_and_weights',
+    'compute_nearest_neighbors',
+    'spatial_join_radius',
+    'compute_coverage_gaps',
+    'SpatioTemporalIndex',
+    'find_spatiotemporal_neighbors',
+    'build_proximity_features',
+    'compute_proximity_curve',
+    'proximity_curve_radii',
+    # binning
+    'assign_cells',
+    'cell_centers',
+    'aggregate_grid',
+    'kde_raster',
+    'zoom_cell_km',
+    'build_cluster_pyramid',
+    'get_cluster_pyramid',
+    # districts
+    'DAEGU_DISTRICTS',
+    'parse_districts',
+    'detect_address_columns',
+    'get_district_index',
+    'with_district_columns',
+    'aggregate_by_district',
+    # clustering
+    'dbscan',
+    'summarize_clusters',
+    'cluster_hotspots',
+    # spatial_stats
+    'distance_band_weights',
+    'morans_i',
+    'getis_ord_gi_star',
+    'classify_hotspots',
+    'compute_spatial_autocorrelation',
     # visualizer
     'plot_numeric_distribution',
     'plot_categorical_distribution',
@@ -66,9 +184,18 @@ __all__ = [
     'plot_kde',
     'plot_scatter',
     'plot_with_options',
+    'plot_proximity_curve',
     'check_missing_ratio',
     'create_folium_map',
     'create_overlay_map',
+    'add_fast_markers',
+    'add_kde_overlay',
+    'add_cluster_pyramid',
+    'add_heatmap',
+    'create_coverage_gap_map',
+    'create_cluster_map',
+    'create_district_map',
+    'create_hotspot_map',
     # chatbot
     'SYSTEM_PROMPT',
     'create_data_context',
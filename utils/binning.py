@@ -0,0 +1,376 @@
+"""
+Grid and hexagon binning of coordinate datasets for density aggregation.
+
+Every point is assigned to a square or hexagonal cell of a local metric grid
+(see utils.geo.project_to_local_xy) in one vectorized pass, and per-cell counts
+and aggregates are computed with a single groupby. The output has cell center
+coordinates, so maps, tools and proximity analysis can consume it like any
+other coordinate dataset. kde_raster smooths a pixel histogram into a kernel
+density surface with an FFT convolution for image overlays, and
+get_cluster_pyramid precomputes one nested aggregation per map zoom level.
+"""
+import numpy as np
+import pandas as pd
+
+from utils.cache import BoundedCache, dataset_fingerprint
+from utils.geo import DAEGU_CENTER, EARTH_RADIUS_KM, clean_coordinates, project_to_local_xy, unproject_local_xy
+
+
+# Default cell size: 250m cells resolve block-level density in Daegu
+DEFAULT_BIN_KM = 0.25
+
+# Supported cell shapes
+BIN_SHAPES = ('square', 'hex')
+
+SQRT3 = np.sqrt(3.0)
+
+# KDE raster defaults: 50m pixels, at most 1M pixels (a ~1-4MB PNG overlay)
+DEFAULT_KDE_PIXEL_KM = 0.05
+MAX_KDE_PIXELS = 1_000_000
+
+# Cluster pyramid: one level per web map zoom, cells of about 64 screen pixels
+DEFAULT_PYRAMID_ZOOMS = (10, 17)
+PYRAMID_CELL_PX = 64
+
+# Web Mercator ground resolution at zoom 0 on the equator (km per 256px tile pixel)
+WEB_MERCATOR_KM_PER_PX = 2 * np.pi * 6378.137 / 256
+
+# Cached pyramids, keyed by (coordinate content, zoom range, cell size)
+_PYRAMID_CACHE = BoundedCache(max_entries=16)
+
+
+def _hex_round(q: np.ndarray, r: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Round fractional axial hex coordinates to the containing hexagon.
+
+    Converts to cube coordinates (q + r + s = 0), rounds each component, and
+    resets the component with the largest rounding error.
+    """
+    s = -q - r
+    rq, rr, rs = np.round(q), np.round(r), np.round(s)
+    dq, dr, ds = np.abs(rq - q), np.abs(rr - r), np.abs(rs - s)
+
+    fix_q = (dq > dr) & (dq > ds)
+    fix_r = ~fix_q & (dr > ds)
+    rq = np.where(fix_q, -rr - rs, rq)
+    rr = np.where(fix_r, -rq - rs, rr)
+    return rq.astype(np.int64), rr.astype(np.int64)
+
+
+def assign_cells(
+    lats,
+    lngs,
+    cell_km: float = DEFAULT_BIN_KM,
+    shape: str = 'square',
+    origin: tuple[float, float] = DAEGU_CENTER
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Assign coordinates to grid cells.
+
+    Square cells are cell_km × cell_km. Hex cells are pointy-top hexagons whose
+    flat-to-flat width is cell_km, addressed by axial coordinates (q, r).
+
+    Parameters:
+        lats, lngs (array-like): Coordinates in decimal degrees (no NaN)
+        cell_km (float): Cell size in kilometers (default: 0.25)
+        shape (str): 'square' or 'hex' (default: 'square')
+        origin (tuple[float, float]): Grid origin (lat, lng) (default: DAEGU_CENTER)
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: (cell_x, cell_y) int64 cell coordinates
+            (column/row for squares, axial q/r for hexagons)
+
+    Raises:
+        ValueError: If shape is not one of BIN_SHAPES
+    """
+    if shape not in BIN_SHAPES:
+        raise ValueError(f"Unknown bin shape: '{shape}'. Valid options: {', '.join(BIN_SHAPES)}")
+
+    x, y = project_to_local_xy(lats, lngs, origin)
+
+    if shape == 'square':
+        return np.floor(x / cell_km).astype(np.int64), np.floor(y / cell_km).astype(np.int64)
+
+    # Pointy-top hexagon with circumradius `size`; width = √3 × size = cell_km
+    size = cell_km / SQRT3
+    q = (SQRT3 / 3 * x - y / 3) / size
+    r = (2 / 3 * y) / size
+    return _hex_round(q, r)
+
+
+def cell_centers(
+    cell_x,
+    cell_y,
+    cell_km: float = DEFAULT_BIN_KM,
+    shape: str = 'square',
+    origin: tuple[float, float] = DAEGU_CENTER
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Return the center coordinates of grid cells (inverse of assign_cells).
+
+    Parameters:
+        cell_x, cell_y (array-like): Cell coordinates from assign_cells
+        cell_km, shape, origin: Same grid parameters used for assign_cells
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: (center_lats, center_lngs) in decimal degrees
+    """
+    cell_x = np.asarray(cell_x, dtype=np.float64)
+    cell_y = np.asarray(cell_y, dtype=np.float64)
+
+    if shape == 'square':
+        x = (cell_x + 0.5) * cell_km
+        y = (cell_y + 0.5) * cell_km
+    else:
+        size = cell_km / SQRT3
+        x = size * (SQRT3 * cell_x + SQRT3 / 2 * cell_y)
+        y = size * (1.5 * cell_y)
+
+    return unproject_local_xy(x, y, origin)
+
+
+def aggregate_grid(
+    df: pd.DataFrame,
+    lat_col: str,
+    lng_col: str,
+    cell_km: float = DEFAULT_BIN_KM,
+    shape: str = 'square',
+    value_cols: list[str] | None = None,
+    agg: str = 'sum',
+    origin: tuple[float, float] = DAEGU_CENTER
+) -> pd.DataFrame:
+    """
+    Count points (and aggregate numeric columns) per grid cell.
+
+    Rows with invalid coordinates are skipped using the cached validity mask
+    (utils.geo.clean_coordinates), so the whole table is binned in one pass.
+
+    Parameters:
+        df (pd.DataFrame): Dataset with coordinates
+        lat_col, lng_col (str): Coordinate column names
+        cell_km (float): Cell size in kilometers (default: 0.25)
+        shape (str): 'square' or 'hex' (default: 'square')
+        value_cols (list[str] | None): Numeric columns to aggregate per cell (default: none)
+        agg (str): Aggregation for value_cols: 'sum', 'mean', 'median', 'min', 'max' (default: 'sum')
+        origin (tuple[float, float]): Grid origin (lat, lng) (default: DAEGU_CENTER)
+
+    Returns:
+        pd.DataFrame: One row per non-empty cell, sorted by count (descending), with columns
+            - cell_x, cell_y: Cell coordinates
+            - center_lat, center_lng: Cell center in decimal degrees
+            - count: Number of points in the cell
+            - {col}_{agg}: Aggregate of each value column
+
+    Example:
+        >>> cells = aggregate_grid(accident_df, 'lat', 'lng', cell_km=0.25, shape='hex')
+        >>> cells.head(3)  # The three densest 250m hexagons
+    """
+    value_cols = value_cols or []
+    df_clean = clean_coordinates(df, lat_col, lng_col)
+
+    cell_x, cell_y = assign_cells(
+        df_clean[lat_col].to_numpy(), df_clean[lng_col].to_numpy(), cell_km, shape, origin
+    )
+
+    binned = pd.DataFrame({'cell_x': cell_x, 'cell_y': cell_y})
+    for col in value_cols:
+        binned[col] = pd.to_numeric(df_clean[col], errors='coerce').to_numpy()
+
+    grouped = binned.groupby(['cell_x', 'cell_y'], sort=False)
+    cells = grouped.size().rename('count').to_frame()
+    for col in value_cols:
+        cells[f'{col}_{agg}'] = grouped[col].agg(agg)
+    cells = cells.reset_index()
+
+    center_lats, center_lngs = cell_centers(cells['cell_x'], cells['cell_y'], cell_km, shape, origin)
+    cells.insert(2, 'center_lat', center_lats)
+    cells.insert(3, 'center_lng', center_lngs)
+
+    return cells.sort_values('count', ascending=False, kind='stable').reset_index(drop=True)
+
+
+def _gaussian_kernel_2d(sigma_y: float, sigma_x: float) -> np.ndarray:
+    """Normalized 2D Gaussian kernel truncated at 3 sigma (sigmas in pixels)."""
+    half_y = max(1, int(np.ceil(3 * sigma_y)))
+    half_x = max(1, int(np.ceil(3 * sigma_x)))
+    y = np.arange(-half_y, half_y + 1)[:, None]
+    x = np.arange(-half_x, half_x + 1)[None, :]
+    kernel = np.exp(-0.5 * ((y / sigma_y) ** 2 + (x / sigma_x) ** 2))
+    return kernel / kernel.sum()
+
+
+def _fft_convolve_same(image: np.ndarray, kernel: np.ndarray) -> np.ndarray:
+    """Linear 2D convolution via real FFT, cropped to the image shape (centered kernel)."""
+    shape = (image.shape[0] + kernel.shape[0] - 1, image.shape[1] + kernel.shape[1] - 1)
+    spectrum = np.fft.rfft2(image, shape) * np.fft.rfft2(kernel, shape)
+    full = np.fft.irfft2(spectrum, shape)
+    top = kernel.shape[0] // 2
+    left = kernel.shape[1] // 2
+    return full[top:top + image.shape[0], left:left + image.shape[1]]
+
+
+def kde_raster(
+    lats,
+    lngs,
+    bandwidth_km: float = 0.3,
+    pixel_km: float = DEFAULT_KDE_PIXEL_KM,
+    weights=None,
+    max_pixels: int = MAX_KDE_PIXELS
+) -> tuple[np.ndarray, list[list[float]]]:
+    """
+    Gaussian kernel density surface of points on a regular raster.
+
+    Points are binned into pixels (one histogram pass) and the histogram is
+    convolved with a Gaussian kernel through the FFT, so the cost depends on
+    the raster size, not on the number of points × pixels.
+
+    Parameters:
+        lats, lngs (array-like): Coordinates in decimal degrees (no NaN)
+        bandwidth_km (float): Gaussian kernel standard deviation in kilometers (default: 0.3)
+        pixel_km (float): Pixel size in kilometers; increased automatically so the
+            raster stays within max_pixels (default: 0.05)
+        weights (array-like | None): Optional weight per point (default: 1 per point)
+        max_pixels (int): Upper bound on raster pixels (default: 1,000,000)
+
+    Returns:
+        tuple[np.ndarray, list[list[float]]]:
+            - density: Shape (rows, cols) points per km², first row = north edge
+            - bounds: [[south, west], [north, east]] of the raster in decimal degrees
+
+    Example:
+        >>> density, bounds = kde_raster(lights_df['위도'], lights_df['경도'], bandwidth_km=0.2)
+    """
+    lats = np.asarray(lats, dtype=np.float64)
+    lngs = np.asarray(lngs, dtype=np.float64)
+
+    # Pad by 3 bandwidths so kernels of edge points are not cut off
+    pad_lat = np.degrees(3 * bandwidth_km / EARTH_RADIUS_KM)
+    mean_lat = float(lats.mean())
+    lng_scale = max(np.cos(np.radians(mean_lat)), 1e-6)
+    south, north = lats.min() - pad_lat, lats.max() + pad_lat
+    west, east = lngs.min() - pad_lat / lng_scale, lngs.max() + pad_lat / lng_scale
+
+    height_km = np.radians(north - south) * EARTH_RADIUS_KM
+    width_km = np.radians(east - west) * EARTH_RADIUS_KM * lng_scale
+    pixel_km = max(pixel_km, np.sqrt(height_km * width_km / max_pixels))
+    n_rows = max(1, int(np.ceil(height_km / pixel_km)))
+    n_cols = max(1, int(np.ceil(width_km / pixel_km)))
+
+    histogram, _, _ = np.histogram2d(
+        lats, lngs, bins=[n_rows, n_cols], range=[[south, north], [west, east]], weights=weights
+    )
+    pixel_h = height_km / n_rows
+    pixel_w = width_km / n_cols
+    kernel = _gaussian_kernel_2d(bandwidth_km / pixel_h, bandwidth_km / pixel_w)
+    density = np.clip(_fft_convolve_same(histogram, kernel), 0.0, None) / (pixel_h * pixel_w)
+
+    # histogram2d rows run south → north; images run top (north) → bottom
+    return density[::-1], [[float(south), float(west)], [float(north), float(east)]]
+
+
+def zoom_cell_km(zoom: int, cell_px: int = PYRAMID_CELL_PX, lat: float = DAEGU_CENTER[0]) -> float:
+    """
+    Ground size in kilometers of cell_px screen pixels at a web map zoom level.
+
+    Parameters:
+        zoom (int): Leaflet/Web Mercator zoom level
+        cell_px (int): Cell size in screen pixels (default: 64)
+        lat (float): Latitude where the scale is taken (default: Daegu)
+
+    Returns:
+        float: Cell size in kilometers
+    """
+    return WEB_MERCATOR_KM_PER_PX * np.cos(np.radians(lat)) / 2 ** zoom * cell_px
+
+
+def build_cluster_pyramid(
+    lats,
+    lngs,
+    min_zoom: int = DEFAULT_PYRAMID_ZOOMS[0],
+    max_zoom: int = DEFAULT_PYRAMID_ZOOMS[1],
+    cell_px: int = PYRAMID_CELL_PX
+) -> dict[int, pd.DataFrame]:
+    """
+    Aggregate points into nested square cells, one level per zoom.
+
+    Points are binned once at max_zoom (cells of about cell_px screen pixels);
+    every coarser level merges 2 × 2 cells of the level below, so the pyramid
+    costs one pass over the points plus passes over ever fewer cells.
+
+    Parameters:
+        lats, lngs (array-like): Coordinates in decimal degrees (no NaN)
+        min_zoom, max_zoom (int): Zoom range (default: 10-17)
+        cell_px (int): Cell size in screen pixels at each level (default: 64)
+
+    Returns:
+        dict[int, pd.DataFrame]: zoom → one row per non-empty cell with columns
+            lat, lng (centroid of the cell's points) and count
+    """
+    lats = np.asarray(lats, dtype=np.float64)
+    lngs = np.asarray(lngs, dtype=np.float64)
+    cell_x, cell_y = assign_cells(lats, lngs, zoom_cell_km(max_zoom, cell_px))
+    counts = np.ones(len(lats))
+    sum_lats, sum_lngs = lats, lngs
+
+    pyramid = {}
+    for zoom in range(max_zoom, min_zoom - 1, -1):
+        if zoom < max_zoom:
+            cell_x, cell_y = cell_x // 2, cell_y // 2
+
+        # Merge points (or finer cells) sharing a cell
+        if len(cell_x) > 0:
+            x0, y0 = cell_x.min(), cell_y.min()
+            keys = (cell_x - x0) * (int(cell_y.max() - y0) + 1) + (cell_y - y0)
+            unique_keys, inverse = np.unique(keys, return_inverse=True)
+            counts = np.bincount(inverse, weights=counts)
+            sum_lats = np.bincount(inverse, weights=sum_lats)
+            sum_lngs = np.bincount(inverse, weights=sum_lngs)
+            first = np.zeros(len(unique_keys), dtype=np.int64)
+            first[inverse[::-1]] = np.arange(len(inverse))[::-1]
+            cell_x, cell_y = cell_x[first], cell_y[first]
+
+        pyramid[zoom] = pd.DataFrame({
+            'lat': sum_lats / np.maximum(counts, 1),
+            'lng': sum_lngs / np.maximum(counts, 1),
+            'count': counts.astype(np.int64)
+        })
+
+    return pyramid
+
+
+def get_cluster_pyramid(
+    df: pd.DataFrame,
+    lat_col: str,
+    lng_col: str,
+    min_zoom: int = DEFAULT_PYRAMID_ZOOMS[0],
+    max_zoom: int = DEFAULT_PYRAMID_ZOOMS[1],
+    cell_px: int = PYRAMID_CELL_PX
+) -> dict[int, pd.DataFrame]:
+    """
+    Return the zoom-level cluster pyramid of a dataset's valid points, cached.
+
+    The cache key is the content of the coordinate columns, so Streamlit reruns,
+    tab switches and map setting changes (e.g., max_points) reuse the pyramid.
+
+    Parameters:
+        df (pd.DataFrame): Dataset with coordinates
+        lat_col, lng_col (str): Coordinate column names
+        min_zoom, max_zoom, cell_px: See build_cluster_pyramid
+
+    Returns:
+        dict[int, pd.DataFrame]: See build_cluster_pyramid
+
+    Example:
+        >>> pyramid = get_cluster_pyramid(lights_df, '위도', '경도')
+        >>> pyramid[12].nlargest(3, 'count')  # Densest clusters at zoom 12
+    """
+    key = (dataset_fingerprint(df, [lat_col, lng_col]), int(min_zoom), int(max_zoom), int(cell_px))
+
+    def build() -> dict[int, pd.DataFrame]:
+        df_clean = clean_coordinates(df, lat_col, lng_col)
+        return build_cluster_pyramid(
+            df_clean[lat_col].to_numpy(), df_clean[lng_col].to_numpy(), min_zoom, max_zoom, cell_px
+        )
+
+    pyramid = _PYRAMID_CACHE.get_or_create(key, build)
+    return {zoom: level.copy() for zoom, level in pyramid.items()}
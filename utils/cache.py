@@ -0,0 +1,152 @@
+"""
+Dataset fingerprinting and bounded in-memory caches for derived data.
+
+Derived structures (spatial indexes, validity masks, cluster results...) are keyed
+by the content of the columns they were computed from, so they stay valid across
+Streamlit reruns and re-uploads of identical files, and are rebuilt automatically
+when the data changes.
+"""
+import hashlib
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+
+def dataset_fingerprint(df: pd.DataFrame, columns: list[str] | None = None) -> str:
+    """
+    Compute a content hash of a DataFrame (or a subset of its columns).
+
+    The hash covers column names, values and missing-value positions but not the
+    row index, so two uploads of the same CSV get the same fingerprint.
+
+    Parameters:
+        df (pd.DataFrame): Dataset to fingerprint
+        columns (list[str] | None): Columns to include (default: all columns)
+
+    Returns:
+        str: 40-character hex digest
+
+    Example:
+        >>> dataset_fingerprint(cctv_df, ['위도', '경도'])
+        '3f2a9c...'
+    """
+    subset = df if columns is None else df[columns]
+
+    hasher = hashlib.sha1()
+    hasher.update(repr(list(subset.columns)).encode('utf-8'))
+    hasher.update(str(len(subset)).encode('utf-8'))
+    if len(subset.columns) > 0 and len(subset) > 0:
+        hasher.update(pd.util.hash_pandas_object(subset, index=False).to_numpy().tobytes())
+
+    return hasher.hexdigest()
+
+
+def sample_rows(df: pd.DataFrame, n: int = 200) -> pd.DataFrame:
+    """
+    Deterministic evenly spaced sample of up to n rows (first and last row included).
+
+    Parameters:
+        df (pd.DataFrame): Dataset
+        n (int): Maximum number of rows (default: 200)
+
+    Returns:
+        pd.DataFrame: Sampled rows in original order
+    """
+    if len(df) <= n:
+        return df
+    positions = np.unique(np.linspace(0, len(df) - 1, n).astype(np.int64))
+    return df.iloc[positions]
+
+
+def schema_fingerprint(df: pd.DataFrame, n_sample: int = 200) -> str:
+    """
+    Cheap fingerprint from column names, dtypes, row count and a row sample.
+
+    Unlike dataset_fingerprint this does not hash every value, so it costs the
+    same for 1k or 1M rows. Use it for decisions that only depend on the schema
+    and a value sample (e.g., which columns hold coordinates).
+
+    Parameters:
+        df (pd.DataFrame): Dataset
+        n_sample (int): Number of evenly spaced rows to hash (default: 200)
+
+    Returns:
+        str: 40-character hex digest
+    """
+    hasher = hashlib.sha1()
+    hasher.update(repr([(str(c), str(t)) for c, t in df.dtypes.items()]).encode('utf-8'))
+    hasher.update(str(len(df)).encode('utf-8'))
+    sample = sample_rows(df, n_sample)
+    if len(sample.columns) > 0 and len(sample) > 0:
+        hasher.update(pd.util.hash_pandas_object(sample, index=False).to_numpy().tobytes())
+    return hasher.hexdigest()
+
+
+class BoundedCache:
+    """
+    Thread-safe least-recently-used cache with a fixed number of entries.
+
+    Streamlit serves each session on its own thread, so all access is guarded
+    by a lock. When full, the least recently used entry is evicted.
+
+    Example:
+        >>> cache = BoundedCache(max_entries=8)
+        >>> index = cache.get_or_create(key, lambda: GridIndex(lats, lngs))
+    """
+
+    def __init__(self, max_entries: int = 8):
+        """
+        Parameters:
+            max_entries (int): Maximum number of cached values (default: 8)
+        """
+        self.max_entries = max_entries
+        self._entries: OrderedDict[Hashable, Any] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value (marking it recently used) or default."""
+        with self._lock:
+            if key not in self._entries:
+                return default
+            self._entries.move_to_end(key)
+            return self._entries[key]
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """Store a value, evicting the least recently used entry if full."""
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get_or_create(self, key: Hashable, factory: Callable[[], Any]) -> Any:
+        """
+        Return the cached value for key, computing and storing it on a miss.
+
+        The factory runs outside the lock, so a slow build never blocks readers
+        of other keys (two sessions may build the same value concurrently; the
+        last one wins, which is harmless for deterministic builds).
+        """
+        sentinel = object()
+        value = self.get(key, sentinel)
+        if value is sentinel:
+            value = factory()
+            self.put(key, value)
+        return value
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        with self._lock:
+            self._entries.clear()
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            return key in self._entries
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
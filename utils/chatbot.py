@@ -4,6 +4,7 @@ Anthropic Claude chatbot module for data Q&A.
 import time
 import pandas as pd
 from anthropic import Anthropic, APIError, APIConnectionError, RateLimitError
+from utils.districts import detect_address_columns
 from utils.tools import TOOLS, execute_tool
 
 # Maximum iterations for tool calling loop
@@ -67,6 +68,14 @@ def create_data_context(df: pd.DataFrame, dataset_name: str) -> str:
 
         col_info.append(f"  - {col} ({dtype}): {stats}, 결측값 {missing_pct:.1f}%")
 
+    # District columns parsed from addresses (available to tools as 'gu' / 'dong')
+    address_cols = detect_address_columns(df)
+    district_info = (
+        f"\n\n**행정구역:** 주소 컬럼({', '.join(map(str, address_cols))})이 있어 "
+        f"도구에서 'gu'(구/군), 'dong'(읍/면/동) 컬럼을 사용할 수 있습니다."
+        if address_cols else ""
+    )
+
     # Sample data (first 3 rows as string)
     sample = df.head(3).to_string(index=False, max_colwidth=30)
 
@@ -77,7 +86,7 @@ def create_data_context(df: pd.DataFrame, dataset_name: str) -> str:
 - 컬럼 수: {col_count}
 
 **컬럼 상세:**
-{chr(10).join(col_info)}
+{chr(10).join(col_info)}{district_info}
 
 **샘플 데이터 (처음 3행):**
 ```
@@ -0,0 +1,264 @@
+"""
+Server-side density clustering (DBSCAN) of coordinate datasets for hotspot detection.
+
+Neighbourhoods come from the GridIndex radius search, and core points are
+connected through a fine grid of cells (edge eps / √2, so all points of a cell
+are mutually within eps) instead of point pairs. Memory and work stay close to
+O(n × neighbours) rather than O(n²), and the result is a short table of
+clusters (size, centroid, radius) that maps render as a few circles.
+"""
+from math import cos, radians, sqrt
+
+import numpy as np
+import pandas as pd
+
+from utils.cache import BoundedCache, dataset_fingerprint
+from utils.geo import DAEGU_CENTER, GridIndex, clean_coordinates, haversine_pairs, project_to_local_xy
+
+
+# Default neighbourhood: 100m radius, at least 10 points (incl. itself) to be a core point
+DEFAULT_EPS_KM = 0.1
+DEFAULT_MIN_SAMPLES = 10
+
+# Minimum GridIndex cell size for neighbour searches: tiny cells mean many
+# small query groups, which costs more in per-group overhead than it saves
+DEFAULT_INDEX_CELL_KM = 0.25
+
+# Label of points that belong to no cluster
+NOISE_LABEL = -1
+
+# Cached clustering results, keyed by (dataset fingerprint, eps, min_samples, metric)
+_CLUSTER_CACHE = BoundedCache(max_entries=16)
+
+
+def _connected_components(n_nodes: int, u: np.ndarray, v: np.ndarray) -> np.ndarray:
+    """
+    Label connected components of an undirected graph given as an edge list.
+
+    Vectorized hooking and pointer jumping: every round hooks the root of each
+    edge endpoint onto the smaller root, then compresses paths, until no edge
+    joins two different roots.
+
+    Parameters:
+        n_nodes (int): Number of nodes
+        u, v (np.ndarray): Edge endpoints
+
+    Returns:
+        np.ndarray: Shape (n_nodes,) component id of each node (smallest node id of the component)
+    """
+    labels = np.arange(n_nodes)
+    while True:
+        lu, lv = labels[u], labels[v]
+        differ = lu != lv
+        if not differ.any():
+            return labels
+        lu, lv = lu[differ], lv[differ]
+        smaller = np.minimum(lu, lv)
+        np.minimum.at(labels, lu, smaller)
+        np.minimum.at(labels, lv, smaller)
+        while True:
+            jumped = labels[labels]
+            if np.array_equal(jumped, labels):
+                break
+            labels = jumped
+
+
+def dbscan(
+    lats,
+    lngs,
+    eps_km: float = DEFAULT_EPS_KM,
+    min_samples: int = DEFAULT_MIN_SAMPLES,
+    metric: str = 'haversine'
+) -> np.ndarray:
+    """
+    Grid-accelerated DBSCAN on decimal-degree coordinates.
+
+    1. Assign every point to a fine cell of edge eps_km / √2 (cell diameter < eps_km),
+       projected around the data's own centroid and shrunk by the largest east-west
+       scale error over the data's latitude range, so any extent is supported
+    2. Points of cells with at least min_samples points are core points; for the
+       remaining points, neighbours within eps_km (including themselves) are counted
+       with the GridIndex
+    3. A neighbour pass over core points only links the cells of core points within
+       eps_km of each other (deduplicated per block); core points of one cell are
+       always connected
+    4. Connected components of the cell graph are the clusters; each border point
+       joins the cluster of its nearest core point within eps_km
+
+    Parameters:
+        lats, lngs (array-like): Coordinates in decimal degrees (no NaN)
+        eps_km (float): Neighbourhood radius in kilometers (default: 0.1)
+        min_samples (int): Minimum neighbourhood size of a core point (default: 10)
+        metric (str): 'haversine' or 'equirectangular' (default: 'haversine')
+
+    Returns:
+        np.ndarray: Shape (n,) int64 cluster labels, numbered by cluster size
+            (0 = largest), NOISE_LABEL (-1) for noise
+    """
+    lats = np.asarray(lats, dtype=np.float64)
+    lngs = np.asarray(lngs, dtype=np.float64)
+    n = len(lats)
+    labels = np.full(n, NOISE_LABEL, dtype=np.int64)
+    if n == 0:
+        return labels
+
+    # Fine cells in a projection around the data centroid. Projected east-west distances
+    # scale by cos(origin_lat); the metric scales by cos(latitude) (haversine, largest at
+    # the latitude nearest the equator) or cos(DAEGU_CENTER lat) (GridIndex equirectangular).
+    # Shrinking the side by the worst ratio (+1% margin) keeps every cell diameter below
+    # eps_km under the metric, so all points of a cell are neighbours of each other
+    origin = (float(lats.mean()), float(lngs.mean()))
+    origin_cos = max(cos(radians(origin[0])), 1e-12)
+    if metric == 'equirectangular':
+        metric_cos = cos(radians(DAEGU_CENTER[0]))
+    else:
+        metric_cos = cos(radians(float(np.clip(0.0, lats.min(), lats.max()))))
+    side = eps_km / sqrt(2) / (1.01 * max(1.0, metric_cos / origin_cos))
+    x, y = project_to_local_xy(lats, lngs, origin)
+    _, node, cell_sizes = np.unique(
+        np.stack([np.floor(x / side), np.floor(y / side)], axis=1),
+        axis=0, return_inverse=True, return_counts=True
+    )
+    node = node.ravel()
+    n_nodes = len(cell_sizes)
+
+    # Points of cells holding min_samples points are core without any distance check;
+    # only points of sparser cells need a neighbour count
+    core = cell_sizes[node] >= min_samples
+    sparse = np.flatnonzero(~core)
+    if len(sparse) > 0:
+        index = GridIndex(lats, lngs, cell_km=max(eps_km, DEFAULT_INDEX_CELL_KM), metric=metric)
+        core[sparse] = index.query_radius_counts(lats[sparse], lngs[sparse], [eps_km])[:, 0] >= min_samples
+    if not core.any():
+        return labels
+
+    # Link cells of core points within eps_km of each other, searching core points only
+    core_points = np.flatnonzero(core)
+    core_index = GridIndex(
+        lats[core_points], lngs[core_points], cell_km=max(eps_km, DEFAULT_INDEX_CELL_KM), metric=metric
+    )
+    core_nodes = node[core_points]
+    core_nodes_sorted = core_nodes[core_index.positions]
+
+    squared = metric == 'equirectangular'
+    limit = eps_km ** 2 if squared else eps_km
+    edges = []
+    for query_idx, candidates, distances in core_index.iter_neighbor_blocks(
+        lats[core_points], lngs[core_points], eps_km, squared
+    ):
+        # Pairs inside one cell are already linked; keep unique (cell, cell) pairs only
+        q_nodes = core_nodes[query_idx]
+        c_nodes = core_nodes_sorted[candidates]
+        q_rows, c_cols = np.nonzero((distances <= limit) & (q_nodes[:, None] != c_nodes[None, :]))
+        if len(q_rows) > 0:
+            edges.append(np.unique(q_nodes[q_rows] * n_nodes + c_nodes[c_cols]))
+
+    # Border points join the cluster of their nearest core point within eps_km
+    border_core = np.full(n, -1, dtype=np.int64)
+    non_core = np.flatnonzero(~core)
+    if len(non_core) > 0:
+        nearest = core_index.query_nearest_within(lats[non_core], lngs[non_core], eps_km)[1]
+        border_core[non_core] = np.where(nearest >= 0, core_points[np.maximum(nearest, 0)], -1)
+
+    pairs = np.concatenate(edges) if edges else np.zeros(0, dtype=np.int64)
+    components = _connected_components(n_nodes, pairs // n_nodes, pairs % n_nodes)
+
+    point_component = np.full(n, -1, dtype=np.int64)
+    point_component[core] = components[node[core]]
+    border = ~core & (border_core >= 0)
+    point_component[border] = components[node[border_core[border]]]
+
+    # Renumber components by cluster size (0 = largest)
+    clustered = point_component >= 0
+    component_ids, inverse, sizes = np.unique(
+        point_component[clustered], return_inverse=True, return_counts=True
+    )
+    rank = np.empty(len(component_ids), dtype=np.int64)
+    rank[np.argsort(-sizes, kind='stable')] = np.arange(len(component_ids))
+    labels[clustered] = rank[inverse.ravel()]
+    return labels
+
+
+def summarize_clusters(lats, lngs, labels) -> pd.DataFrame:
+    """
+    Size, centroid and radius of each cluster.
+
+    Parameters:
+        lats, lngs (array-like): Coordinates in decimal degrees
+        labels (array-like): Cluster labels from dbscan (NOISE_LABEL is skipped)
+
+    Returns:
+        pd.DataFrame: One row per cluster, sorted by cluster_id, with columns
+            - cluster_id: Cluster label
+            - size: Number of points
+            - center_lat, center_lng: Centroid in decimal degrees
+            - radius_km: Distance from the centroid to the farthest member
+    """
+    lats = np.asarray(lats, dtype=np.float64)
+    lngs = np.asarray(lngs, dtype=np.float64)
+    labels = np.asarray(labels, dtype=np.int64)
+
+    member = labels != NOISE_LABEL
+    lats, lngs, labels = lats[member], lngs[member], labels[member]
+    n_clusters = int(labels.max()) + 1 if len(labels) else 0
+
+    sizes = np.bincount(labels, minlength=n_clusters)
+    center_lats = np.bincount(labels, weights=lats, minlength=n_clusters) / np.maximum(sizes, 1)
+    center_lngs = np.bincount(labels, weights=lngs, minlength=n_clusters) / np.maximum(sizes, 1)
+
+    radii = np.zeros(n_clusters)
+    np.maximum.at(radii, labels, haversine_pairs(lats, lngs, center_lats[labels], center_lngs[labels]))
+
+    return pd.DataFrame({
+        'cluster_id': np.arange(n_clusters),
+        'size': sizes,
+        'center_lat': center_lats,
+        'center_lng': center_lngs,
+        'radius_km': radii
+    })
+
+
+def cluster_hotspots(
+    df: pd.DataFrame,
+    lat_col: str,
+    lng_col: str,
+    eps_km: float = DEFAULT_EPS_KM,
+    min_samples: int = DEFAULT_MIN_SAMPLES,
+    distance_mode: str = 'haversine'
+) -> tuple[pd.Series, pd.DataFrame]:
+    """
+    Cluster the points of a dataset (e.g., accidents) into density hotspots.
+
+    Results are cached per (coordinate content, eps_km, min_samples, distance_mode),
+    so reruns of the Streamlit script and repeated tool calls are free.
+
+    Parameters:
+        df (pd.DataFrame): Dataset with coordinates
+        lat_col, lng_col (str): Coordinate column names
+        eps_km (float): Neighbourhood radius in kilometers (default: 0.1)
+        min_samples (int): Minimum neighbourhood size of a core point (default: 10)
+        distance_mode (str): 'haversine' (default) or 'equirectangular'
+
+    Returns:
+        tuple[pd.Series, pd.DataFrame]:
+            - labels: Cluster label per row, indexed like df
+              (NOISE_LABEL for noise, NaN for invalid coordinates)
+            - clusters: summarize_clusters output, largest cluster first
+
+    Example:
+        >>> labels, clusters = cluster_hotspots(accident_df, 'lat', 'lng', eps_km=0.1, min_samples=20)
+        >>> clusters.head(5)  # Five largest accident hotspots
+    """
+    key = (dataset_fingerprint(df, [lat_col, lng_col]), float(eps_km), int(min_samples), distance_mode)
+
+    def build() -> tuple[pd.Series, pd.DataFrame]:
+        df_clean = clean_coordinates(df, lat_col, lng_col)
+        lats = df_clean[lat_col].to_numpy(dtype=np.float64)
+        lngs = df_clean[lng_col].to_numpy(dtype=np.float64)
+
+        labels = dbscan(lats, lngs, eps_km, min_samples, distance_mode)
+        clusters = summarize_clusters(lats, lngs, labels)
+        return pd.Series(labels, index=df_clean.index, name='cluster').reindex(df.index), clusters
+
+    labels, clusters = _CLUSTER_CACHE.get_or_create(key, build)
+    return labels.copy(), clusters.copy()
@@ -0,0 +1,257 @@
+"""
+Administrative district (구/군, 읍/면/동) index parsed from address columns.
+
+Daegu datasets carry addresses as free text ('소재지도로명주소', '소재지지번주소')
+or a bare district column ('시군구'). The 구/군 and 동 of every row are extracted
+once per dataset with vectorized regular expressions over the distinct address
+strings and stored as categorical columns, so district filters and group-bys
+are integer comparisons instead of str.contains scans. Results are cached by
+the content of the address columns, and per DataFrame object so that repeated
+lookups on the same session dataset skip hashing the strings. The per-object
+cache treats DataFrames as immutable (as the app does with loaded datasets): it
+only notices schema changes and edits to its 200 sampled rows, so edit a copy,
+not the frame in place, to get fresh districts.
+"""
+import weakref
+
+import numpy as np
+import pandas as pd
+
+from utils.cache import BoundedCache, dataset_fingerprint, sample_rows, schema_fingerprint
+from utils.geo import get_coordinate_validation
+
+
+# Daegu 구/군 (군위군 joined Daegu in 2023)
+DAEGU_DISTRICTS = ('중구', '동구', '서구', '남구', '북구', '수성구', '달서구', '달성군', '군위군')
+
+# Names of the derived columns
+DISTRICT_COLUMNS = ('gu', 'dong')
+DISTRICT_LEVELS = {'gu': '구/군', 'dong': '읍/면/동'}
+
+# Column name hints for address columns (ties are broken by these)
+ADDRESS_NAME_HINTS = ('주소', '소재지', '시군구', '구군', 'address', 'addr')
+
+# Minimum share of sampled values naming a Daegu 구/군 for a column to count as an address
+MIN_DISTRICT_RATIO = 0.5
+
+# 구/군 as a whole word (longest names first so '달서구' never matches as '서구')
+_GU_PATTERN = r'(?:^|[\s,(])(' + '|'.join(sorted(DAEGU_DISTRICTS, key=len, reverse=True)) + r')(?=$|[\s,)])'
+
+# Legal 동/읍/면 (e.g. '범어동', '삼덕동2가', '화원읍'); must start with a Hangul syllable so
+# apartment building numbers ('101동') are skipped. Road addresses put it in parentheses.
+_DONG_PATTERN = r'(?:^|[\s,(])([가-힣][가-힣0-9.]*(?:동|가|읍|면))(?=$|[\s,)\d])'
+_DONG_IN_PARENS_PATTERN = r'\(([가-힣][가-힣0-9.]*(?:동|가|읍|면))[,)]'
+
+# Cached district columns, keyed by (address columns, their content); hashing long
+# address strings is itself slow (~0.5s for 600k rows), so the same DataFrame object
+# is also remembered by identity (id + schema fingerprint, verified with a weak
+# reference). The identity entry assumes the frame is not modified in place.
+_DISTRICT_CACHE = BoundedCache(max_entries=16)
+_DISTRICT_IDENTITY_CACHE = BoundedCache(max_entries=16)
+_ADDRESS_DETECTION_CACHE = BoundedCache(max_entries=64)
+
+
+def parse_districts(addresses) -> pd.DataFrame:
+    """
+    Extract 구/군 and 동/읍/면 from address strings.
+
+    Each distinct string is parsed once (pd.factorize), so repeated addresses and
+    bare district columns cost one regex pass over the unique values only.
+
+    Parameters:
+        addresses (array-like): Address strings (NaN allowed)
+
+    Returns:
+        pd.DataFrame: Columns gu, dong (categorical, NaN where not found), same length
+            and index as addresses if it is a Series
+
+    Example:
+        >>> parse_districts(pd.Series(['대구광역시 수성구 달구벌대로 2450 (범어동)']))
+             gu dong
+        0  수성구  범어동
+    """
+    addresses = addresses if isinstance(addresses, pd.Series) else pd.Series(addresses)
+    codes, uniques = pd.factorize(addresses)
+    uniques = pd.Series(uniques, dtype=object).astype(str).str.strip()
+
+    gu = uniques.str.extract(_GU_PATTERN, expand=False)
+
+    # Parenthesised 동 of road addresses first, then the first 동 token of the rest
+    dong = pd.Series(np.nan, index=uniques.index, dtype=object)
+    has_parens = uniques.str.contains('(', regex=False)
+    dong[has_parens] = uniques[has_parens].str.extract(_DONG_IN_PARENS_PATTERN, expand=False)
+    rest = dong.isna()
+    dong[rest] = uniques[rest].str.extract(_DONG_PATTERN, expand=False)
+
+    dong_categories = sorted(dong.dropna().unique())
+    return pd.DataFrame({
+        'gu': _expand_codes(gu, DAEGU_DISTRICTS, codes),
+        'dong': _expand_codes(dong, dong_categories, codes)
+    }, index=addresses.index)
+
+
+def _expand_codes(parsed: pd.Series, categories, codes: np.ndarray) -> pd.Categorical:
+    """Map per-unique parse results back to rows; factorize code -1 (missing) becomes NaN."""
+    unique_codes = pd.Categorical(parsed, categories=list(categories)).codes.astype(np.int64)
+    return pd.Categorical.from_codes(np.append(unique_codes, -1)[codes], categories=list(categories))
+
+
+def detect_address_columns(df: pd.DataFrame) -> list[str]:
+    """
+    Find columns holding Daegu addresses or district names.
+
+    A small evenly spaced sample of each text column is parsed; columns where at
+    least half of the values name a Daegu 구/군 qualify. The derived gu/dong
+    columns (DISTRICT_COLUMNS) are never reported as address columns. The decision
+    is cached per schema fingerprint, like utils.geo.detect_lat_lng_columns.
+
+    Parameters:
+        df (pd.DataFrame): Dataset
+
+    Returns:
+        list[str]: Address columns, best first (hinted names, then parse rate)
+    """
+    def detect() -> list[str]:
+        sample = sample_rows(df)
+        scores = {}
+        for col in df.columns:
+            if col in DISTRICT_COLUMNS:
+                continue
+            values = sample[col].dropna()
+            if len(values) == 0 or not (pd.api.types.is_object_dtype(values) or pd.api.types.is_string_dtype(values)):
+                continue
+            ratio = parse_districts(values.astype(str))['gu'].notna().mean()
+            if ratio >= MIN_DISTRICT_RATIO:
+                name = str(col).lower()
+                scores[col] = ratio + any(hint in name for hint in ADDRESS_NAME_HINTS)
+        return sorted(scores, key=scores.get, reverse=True)
+
+    return list(_ADDRESS_DETECTION_CACHE.get_or_create(schema_fingerprint(df), detect))
+
+
+def get_district_index(df: pd.DataFrame, address_cols: list[str] | None = None) -> pd.DataFrame:
+    """
+    Return the 구/군 and 동 of every row, parsed once per dataset and cached.
+
+    With several address columns, each row takes the first column that yields a
+    value (e.g., 구 from '시군구' and 동 from '소재지지번주소').
+
+    DataFrames are treated as immutable: a repeated call on the same object reuses
+    its result without rehashing the addresses, so in-place edits outside the
+    sampled rows of schema_fingerprint are not seen. Modify a copy instead.
+
+    Parameters:
+        df (pd.DataFrame): Dataset
+        address_cols (list[str] | None): Address columns in priority order
+            (default: detect_address_columns)
+
+    Returns:
+        pd.DataFrame: Columns gu, dong (categorical), indexed like df;
+            all NaN if the dataset has no address column
+    """
+    address_cols = detect_address_columns(df) if address_cols is None else list(address_cols)
+
+    identity_key = (id(df), tuple(address_cols), schema_fingerprint(df))
+    cached = _DISTRICT_IDENTITY_CACHE.get(identity_key)
+    if cached is not None and cached[0]() is df:
+        return cached[1].copy()
+
+    key = (tuple(address_cols), dataset_fingerprint(df, address_cols))
+
+    def build() -> pd.DataFrame:
+        values = {level: np.full(len(df), np.nan, dtype=object) for level in DISTRICT_COLUMNS}
+        for col in address_cols:
+            parsed = parse_districts(df[col])
+            for level in DISTRICT_COLUMNS:
+                missing = pd.isna(values[level])
+                values[level][missing] = parsed[level].to_numpy(dtype=object)[missing]
+
+        return pd.DataFrame({
+            'gu': pd.Categorical(values['gu'], categories=list(DAEGU_DISTRICTS)),
+            'dong': pd.Categorical(values['dong'])
+        }, index=df.index)
+
+    districts = _DISTRICT_CACHE.get_or_create(key, build).set_axis(df.index)
+    _DISTRICT_IDENTITY_CACHE.put(identity_key, (weakref.ref(df), districts))
+    return districts.copy()
+
+
+def with_district_columns(df: pd.DataFrame, address_cols: list[str] | None = None) -> pd.DataFrame:
+    """
+    Return df with categorical gu and dong columns added (existing columns are kept).
+
+    Parameters:
+        df (pd.DataFrame): Dataset
+        address_cols (list[str] | None): Address columns (default: detected)
+
+    Returns:
+        pd.DataFrame: Copy of df with the missing DISTRICT_COLUMNS appended
+    """
+    missing = [level for level in DISTRICT_COLUMNS if level not in df.columns]
+    if not missing:
+        return df
+    districts = get_district_index(df, address_cols)
+    return df.assign(**{level: districts[level] for level in missing})
+
+
+def aggregate_by_district(
+    df: pd.DataFrame,
+    level: str = 'gu',
+    value_col: str | None = None,
+    agg: str = 'sum',
+    lat_col: str | None = None,
+    lng_col: str | None = None,
+    address_cols: list[str] | None = None
+) -> pd.DataFrame:
+    """
+    Count rows (and aggregate a numeric column) per 구/군 or 동.
+
+    Parameters:
+        df (pd.DataFrame): Dataset with an address column
+        level (str): 'gu' or 'dong' (default: 'gu')
+        value_col (str | None): Numeric column to aggregate (default: none)
+        agg (str): 'sum', 'mean', 'median', 'min', 'max' (default: 'sum')
+        lat_col, lng_col (str | None): Coordinate columns; when given, the mean
+            coordinate of each district's valid points is added for map markers
+        address_cols (list[str] | None): Address columns (default: detected)
+
+    Returns:
+        pd.DataFrame: One row per district with at least one row, sorted by count
+            (descending), with columns
+            - gu (and gu, dong for level 'dong'): District names
+            - count: Number of rows
+            - {value_col}_{agg}: Aggregate of value_col
+            - center_lat, center_lng: Mean coordinate (if lat_col/lng_col given)
+
+    Raises:
+        ValueError: If level is not one of DISTRICT_COLUMNS
+
+    Example:
+        >>> aggregate_by_district(cctv_df, 'gu', value_col='카메라대수', lat_col='위도', lng_col='경도')
+    """
+    if level not in DISTRICT_COLUMNS:
+        raise ValueError(f"Unknown district level: '{level}'. Valid options: {', '.join(DISTRICT_COLUMNS)}")
+
+    districts = get_district_index(df, address_cols)
+    keys = ['gu', 'dong'] if level == 'dong' else ['gu']
+
+    grouped_df = districts[keys].copy()
+    if value_col is not None:
+        grouped_df[value_col] = pd.to_numeric(df[value_col], errors='coerce')
+    if lat_col and lng_col:
+        valid, _ = get_coordinate_validation(df, lat_col, lng_col)
+        grouped_df['center_lat'] = pd.to_numeric(df[lat_col], errors='coerce').where(valid)
+        grouped_df['center_lng'] = pd.to_numeric(df[lng_col], errors='coerce').where(valid)
+
+    grouped = grouped_df[grouped_df[level].notna()].groupby(keys, observed=True, sort=False)
+    result = grouped.size().rename('count').to_frame()
+    if value_col is not None:
+        result[f'{value_col}_{agg}'] = grouped[value_col].agg(agg)
+    if lat_col and lng_col:
+        result['center_lat'] = grouped['center_lat'].mean()
+        result['center_lng'] = grouped['center_lng'].mean()
+
+    result = result.reset_index()
+    for key in keys:
+        result[key] = result[key].astype(str)
+    return result.sort_values('count', ascending=False, kind='stable').reset_index(drop=True)
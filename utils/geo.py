@@ -1,14 +1,121 @@
 """
 Geospatial utilities for coordinate detection and distance calculations.
 """
-from math import radians, cos, sin, asin, sqrt
+import json
+import multiprocessing
+import os
+from math import radians, cos, sin, asin
+from collections.abc import Callable, Iterator
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import shared_memory
+import numpy as np
 import pandas as pd
 
+from utils.cache import BoundedCache, dataset_fingerprint, sample_rows, schema_fingerprint
+
+
+# Earth's mean radius in kilometers (shared by all distance calculations)
+EARTH_RADIUS_KM = 6371.0
+
+# Default grid cell size for GridIndex (500m cells suit city-scale thresholds)
+DEFAULT_CELL_KM = 0.5
+
+# Upper bound on base × candidate pairs evaluated in one distance block.
+# Keeps peak memory of a block around 16MB (float64) regardless of data size.
+MAX_BLOCK_PAIRS = 2_000_000
+
+# On-disk cache of built spatial indexes, so a restarted server does not rebuild them.
+# Resolved against the app root (not the working directory) unless overridden.
+INDEX_CACHE_DIR = os.environ.get(
+    'SPATIAL_INDEX_CACHE_DIR',
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.cache', 'spatial_index')
+)
+
+# Bounds of the on-disk index cache; least recently used files (by mtime) are evicted
+INDEX_CACHE_MAX_FILES = 32
+INDEX_CACHE_MAX_BYTES = 512 * 1024 * 1024
+
+# Bumped whenever the rows or layout of a built index change, so stale files
+# under INDEX_CACHE_DIR are ignored instead of loaded
+INDEX_FORMAT_VERSION = 3
+
+# In-memory cache of built spatial indexes, keyed by coordinate content and cell size
+_INDEX_CACHE = BoundedCache(max_entries=8)
+
+# Default coordinate bounds: Daegu (35.7-36.1 N, 128.4-128.8 E)
+DAEGU_BOUNDS = {
+    'lat_min': 35.7,
+    'lat_max': 36.1,
+    'lng_min': 128.4,
+    'lng_max': 128.8
+}
+
+# Bounds of South Korea (incl. Jeju, Ulleungdo, Dokdo): validity rule of the proximity
+# analysis, so nationwide base datasets keep every point (maps use DAEGU_BOUNDS)
+KOREA_BOUNDS = {
+    'lat_min': 33.0,
+    'lat_max': 38.7,
+    'lng_min': 124.5,
+    'lng_max': 132.0
+}
+
+# Cached coordinate validation results, keyed by coordinate content and bounds
+_VALIDATION_CACHE = BoundedCache(max_entries=32)
+
+# Daegu city center (lat, lng): default map center and local projection origin
+DAEGU_CENTER = (35.8714, 128.6014)
+
+# Supported distance metrics for GridIndex and proximity analysis
+DISTANCE_MODES = ('haversine', 'equirectangular')
+
+# Cached spatial join results, keyed by (base, zones, radius, id column, mode)
+_JOIN_CACHE = BoundedCache(max_entries=16)
+
+# Distance-decay kernels and aggregations for weighted radius queries
+PROXIMITY_KERNELS = ('uniform', 'linear', 'gaussian')
+PROXIMITY_AGGS = ('sum', 'mean')
+
+# Stratified spatial sampling: 250m strata, each non-empty stratum keeps at least one point
+DEFAULT_SAMPLE_CELL_KM = 0.25
+DEFAULT_SAMPLE_MIN_PER_CELL = 1
+
+# Cached sample positions, keyed by (coordinate content, budget, cell size, minimum)
+_SAMPLE_CACHE = BoundedCache(max_entries=32)
+
+# Plausible coordinate ranges for South Korea, used to recognize coordinate
+# columns from their values
+KOREA_BOUNDS = {
+    'lat_min': 33.0,
+    'lat_max': 39.0,
+    'lng_min': 124.0,
+    'lng_max': 132.0
+}
+
+# Name fragments that hint at coordinate columns (e.g., '설치위치_위도', 'WGS84위도')
+LAT_NAME_HINTS = ('위도', 'latitude', 'lat', 'y좌표')
+LNG_NAME_HINTS = ('경도', 'longitude', 'lng', 'lon', 'x좌표')
+
+# Share of sampled values that must be numeric / inside KOREA_BOUNDS
+MIN_NUMERIC_RATIO = 0.9
+MIN_IN_RANGE_RATIO = 0.8
+
+# Cached column detection results, keyed by schema fingerprint
+_DETECTION_CACHE = BoundedCache(max_entries=64)
+
 
 def detect_lat_lng_columns(df: pd.DataFrame) -> tuple[str | None, str | None]:
     """
     Auto-detect latitude and longitude column names.
 
+    Detection runs in two stages:
+    1. Exact column names ('lat', '위도', 'Longitude', ...) as before
+    2. Otherwise, a small evenly spaced sample of values is inspected: columns
+       must be mostly numeric and mostly inside South Korea's coordinate range;
+       names containing a hint ('설치위치_위도', 'WGS84경도') are preferred
+
+    The decision is cached per schema fingerprint (column names, dtypes, row
+    count and the value sample), so repeated calls on every rerun cost nothing.
+
     Parameters:
         df (pd.DataFrame): Dataset with potential coordinate columns
 
@@ -16,6 +123,58 @@ def detect_lat_lng_columns(df: pd.DataFrame) -> tuple[str | None, str | None]:
         tuple[str | None, str | None]: (latitude_column_name, longitude_column_name)
         Returns (None, None) if coordinates not found
     """
+    return _DETECTION_CACHE.get_or_create(
+        schema_fingerprint(df), lambda: _detect_lat_lng_columns(df)
+    )
+
+
+def _detect_lat_lng_columns(df: pd.DataFrame) -> tuple[str | None, str | None]:
+    """Uncached implementation of detect_lat_lng_columns."""
+    # Stage 1: exact name match (case-insensitive for English)
+    lat_col, lng_col = _match_lat_lng_names(df)
+    if lat_col and lng_col:
+        return (lat_col, lng_col)
+
+    # Stage 2: score columns by their values, name hints break ties
+    sample = sample_rows(df)
+    lat_scores = {}
+    lng_scores = {}
+
+    for col in df.columns:
+        values = sample[col]
+        if pd.api.types.is_bool_dtype(values):
+            continue
+        non_null = values.dropna()
+        if len(non_null) == 0:
+            continue
+
+        numeric = pd.to_numeric(non_null, errors='coerce').dropna()
+        if len(numeric) / len(non_null) < MIN_NUMERIC_RATIO:
+            continue
+
+        name = str(col).lower()
+        lat_ratio = numeric.between(KOREA_BOUNDS['lat_min'], KOREA_BOUNDS['lat_max']).mean()
+        lng_ratio = numeric.between(KOREA_BOUNDS['lng_min'], KOREA_BOUNDS['lng_max']).mean()
+
+        if lat_ratio >= MIN_IN_RANGE_RATIO:
+            lat_scores[col] = lat_ratio + any(hint in name for hint in LAT_NAME_HINTS)
+        if lng_ratio >= MIN_IN_RANGE_RATIO:
+            lng_scores[col] = lng_ratio + any(hint in name for hint in LNG_NAME_HINTS)
+
+    # Keep any exact-name match from stage 1 if its partner was found by value
+    if lat_col is None and lat_scores:
+        lat_col = max(lat_scores, key=lat_scores.get)
+    if lng_col is None and lng_scores:
+        lng_col = max((c for c in lng_scores if c != lat_col), key=lng_scores.get, default=None)
+
+    # Only return if both coordinates found
+    if lat_col and lng_col and lat_col != lng_col:
+        return (lat_col, lng_col)
+    return (None, None)
+
+
+def _match_lat_lng_names(df: pd.DataFrame) -> tuple[str | None, str | None]:
+    """Match column names exactly against common coordinate names."""
     # Common patterns for latitude and longitude column names
     lat_candidates = ['lat', 'latitude', '위도', 'y좌표', 'y', 'Lat', 'Latitude']
     lng_candidates = ['lng', 'lon', 'longitude', '경도', 'x좌표', 'x', 'Lng', 'Lon', 'Longitude']
@@ -25,17 +184,19 @@ def detect_lat_lng_columns(df: pd.DataFrame) -> tuple[str | None, str | None]:
 
     # Check each column name against candidates (case-insensitive for English)
     for col in df.columns:
+        name = str(col)
+
         # Check latitude
         if not lat_col:
             for candidate in lat_candidates:
-                if col == candidate or col.lower() == candidate.lower():
+                if name == candidate or name.lower() == candidate.lower():
                     lat_col = col
                     break
 
         # Check longitude
         if not lng_col:
             for candidate in lng_candidates:
-                if col == candidate or col.lower() == candidate.lower():
+                if name == candidate or name.lower() == candidate.lower():
                     lng_col = col
                     break
 
@@ -43,19 +204,15 @@ def detect_lat_lng_columns(df: pd.DataFrame) -> tuple[str | None, str | None]:
         if lat_col and lng_col:
             break
 
-    # Only return if both coordinates found
-    if lat_col and lng_col:
-        return (lat_col, lng_col)
-    else:
-        return (None, None)
+    return (lat_col, lng_col)
 
 
-def haversine_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+def _haversine(lat1, lon1, lat2, lon2, dtype=np.float64) -> np.ndarray:
     """
-    Calculate great-circle distance between two points using Haversine formula.
+    Core vectorized Haversine formula shared by the scalar and batch APIs.
 
-    The Haversine formula calculates the shortest distance over the earth's surface,
-    giving an "as-the-crow-flies" distance between two points (ignoring terrain).
+    Inputs are broadcast against each other with NumPy rules, so scalars,
+    row-aligned arrays and (n, 1) × (1, m) grids all go through the same code.
 
     Mathematical basis:
     - The formula uses spherical trigonometry
@@ -64,18 +221,14 @@ def haversine_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> fl
     - distance = R × c, where R is Earth's radius (6371 km)
 
     Parameters:
-        lat1, lon1 (float): First point latitude/longitude in decimal degrees
-        lat2, lon2 (float): Second point latitude/longitude in decimal degrees
+        lat1, lon1, lat2, lon2 (array-like): Coordinates in decimal degrees
+        dtype: Floating point precision of the computation (np.float32 or np.float64)
 
     Returns:
-        float: Distance in kilometers
-
-    Example:
-        >>> haversine_distance(35.8714, 128.6014, 35.8800, 128.6100)
-        1.23  # approximately 1.23 km
+        np.ndarray: Distances in kilometers (broadcast shape of the inputs)
     """
     # Step 1: Convert decimal degrees to radians (required for trigonometric functions)
-    lat1, lon1, lat2, lon2 = map(radians, [lat1, lon1, lat2, lon2])
+    lat1, lon1, lat2, lon2 = (np.radians(np.asarray(v, dtype=dtype)) for v in (lat1, lon1, lat2, lon2))
 
     # Step 2: Calculate differences in coordinates
     dlat = lat2 - lat1
@@ -83,15 +236,156 @@ def haversine_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> fl
 
     # Step 3: Apply Haversine formula
     # 'a' represents the square of half the chord length between the points
-    a = sin(dlat / 2) ** 2 + cos(lat1) * cos(lat2) * sin(dlon / 2) ** 2
+    a = np.sin(dlat / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin(dlon / 2) ** 2
 
     # Step 4: Calculate central angle 'c' using inverse haversine
-    c = 2 * asin(sqrt(a))
+    # (clip guards against a > 1 from rounding, which float32 can produce)
+    c = 2 * np.arcsin(np.sqrt(np.minimum(a, 1)))
 
     # Step 5: Calculate distance using Earth's mean radius (6371 km)
     # Note: This assumes Earth is a perfect sphere (good approximation for most purposes)
-    km = 6371 * c
-    return km
+    return (np.dtype(dtype).type(EARTH_RADIUS_KM) * c).astype(dtype, copy=False)
+
+
+def haversine_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """
+    Calculate great-circle distance between two points using Haversine formula.
+
+    The Haversine formula calculates the shortest distance over the earth's surface,
+    giving an "as-the-crow-flies" distance between two points (ignoring terrain).
+
+    This is a thin scalar wrapper around the batch API. To compute many distances
+    use haversine_to_many, haversine_pairs or haversine_matrix instead of
+    calling this function in a loop.
+
+    Parameters:
+        lat1, lon1 (float): First point latitude/longitude in decimal degrees
+        lat2, lon2 (float): Second point latitude/longitude in decimal degrees
+
+    Returns:
+        float: Distance in kilometers
+
+    Example:
+        >>> haversine_distance(35.8714, 128.6014, 35.8800, 128.6100)
+        1.23  # approximately 1.23 km
+    """
+    return float(_haversine(lat1, lon1, lat2, lon2))
+
+
+def haversine_to_many(lat: float, lon: float, lats, lons, dtype=np.float64) -> np.ndarray:
+    """
+    Distances from one point to many points (point-to-many).
+
+    Parameters:
+        lat, lon (float): Origin point in decimal degrees
+        lats, lons (np.ndarray | pd.Series): Destination coordinates, shape (m,)
+        dtype: np.float32 or np.float64 (default: np.float64)
+
+    Returns:
+        np.ndarray: Shape (m,) distances in kilometers
+
+    Example:
+        >>> dists = haversine_to_many(35.8714, 128.6014, cctv_df['위도'], cctv_df['경도'])
+        >>> (dists <= 0.5).sum()  # CCTVs within 500m of the city center
+    """
+    return _haversine(lat, lon, lats, lons, dtype=dtype)
+
+
+def haversine_pairs(lats1, lons1, lats2, lons2, dtype=np.float64) -> np.ndarray:
+    """
+    Distances between row-aligned pairs of points (i-th point to i-th point).
+
+    Parameters:
+        lats1, lons1 (np.ndarray | pd.Series): First points, shape (n,)
+        lats2, lons2 (np.ndarray | pd.Series): Second points, shape (n,)
+        dtype: np.float32 or np.float64 (default: np.float64)
+
+    Returns:
+        np.ndarray: Shape (n,) distances in kilometers
+
+    Raises:
+        ValueError: If the two point sets have different lengths
+    """
+    lats1, lons1, lats2, lons2 = (np.asarray(v) for v in (lats1, lons1, lats2, lons2))
+    if lats1.shape != lats2.shape:
+        raise ValueError(
+            f"Row-aligned inputs must have the same length: {lats1.shape[0]} vs {lats2.shape[0]}"
+        )
+    return _haversine(lats1, lons1, lats2, lons2, dtype=dtype)
+
+
+def iter_haversine_chunks(
+    lats1,
+    lons1,
+    lats2,
+    lons2,
+    chunk_size: int = 1000,
+    dtype=np.float64
+) -> Iterator[tuple[slice, np.ndarray]]:
+    """
+    Yield the many-to-many distance matrix in row chunks.
+
+    Peak memory is bounded by chunk_size × m distances (plus temporaries),
+    independent of the number of rows n, so callers can reduce each chunk
+    (count, min, sum...) without ever materializing the full n × m matrix.
+
+    Parameters:
+        lats1, lons1 (np.ndarray | pd.Series): Row points, shape (n,)
+        lats2, lons2 (np.ndarray | pd.Series): Column points, shape (m,)
+        chunk_size (int): Number of row points per chunk (default: 1000)
+        dtype: np.float32 or np.float64 (default: np.float64)
+
+    Yields:
+        tuple[slice, np.ndarray]: (row slice, distances of shape (rows, m) in km)
+    """
+    lats1 = np.asarray(lats1, dtype=dtype)
+    lons1 = np.asarray(lons1, dtype=dtype)
+    lats2 = np.asarray(lats2, dtype=dtype)[None, :]
+    lons2 = np.asarray(lons2, dtype=dtype)[None, :]
+
+    for start in range(0, len(lats1), chunk_size):
+        rows = slice(start, min(start + chunk_size, len(lats1)))
+        yield rows, _haversine(lats1[rows, None], lons1[rows, None], lats2, lons2, dtype=dtype)
+
+
+def haversine_matrix(
+    lats1,
+    lons1,
+    lats2,
+    lons2,
+    chunk_size: int | None = None,
+    dtype=np.float64
+) -> np.ndarray:
+    """
+    Pairwise many-to-many distance matrix.
+
+    Parameters:
+        lats1, lons1 (np.ndarray | pd.Series): Row points, shape (n,)
+        lats2, lons2 (np.ndarray | pd.Series): Column points, shape (m,)
+        chunk_size (int | None): If set, fill the output chunk_size rows at a time
+            so temporaries stay bounded (default: None = single pass)
+        dtype: np.float32 or np.float64 (default: np.float64)
+
+    Returns:
+        np.ndarray: Shape (n, m) distances in kilometers
+
+    Example:
+        >>> d = haversine_matrix(train_df['lat'], train_df['lng'], cctv_df['위도'], cctv_df['경도'],
+        ...                      chunk_size=2000, dtype=np.float32)
+        >>> d.shape
+        (39609, 1200)
+    """
+    if chunk_size is None:
+        return _haversine(
+            np.asarray(lats1)[:, None], np.asarray(lons1)[:, None],
+            np.asarray(lats2)[None, :], np.asarray(lons2)[None, :],
+            dtype=dtype
+        )
+
+    out = np.empty((len(lats1), len(lats2)), dtype=dtype)
+    for rows, block in iter_haversine_chunks(lats1, lons1, lats2, lons2, chunk_size, dtype):
+        out[rows] = block
+    return out
 
 
 def validate_coordinates(lat: float, lng: float, bounds: dict | None = None) -> bool:
@@ -119,12 +413,7 @@ def validate_coordinates(lat: float, lng: float, bounds: dict | None = None) ->
 
     # Default Daegu bounds
     if bounds is None:
-        bounds = {
-            'lat_min': 35.7,
-            'lat_max': 36.1,
-            'lng_min': 128.4,
-            'lng_max': 128.8
-        }
+        bounds = DAEGU_BOUNDS
 
     # Check bounds
     if not (bounds['lat_min'] <= lat <= bounds['lat_max']):
@@ -135,98 +424,2207 @@ def validate_coordinates(lat: float, lng: float, bounds: dict | None = None) ->
     return True
 
 
-def compute_proximity_stats(
-    df_base: pd.DataFrame,
-    base_lat_col: str,
-    base_lng_col: str,
-    df_target: pd.DataFrame,
-    target_lat_col: str,
-    target_lng_col: str,
-    thresholds: list[float] | None = None
+def _ranges_to_indices(starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+    """
+    Concatenate integer ranges [starts[i], ends[i]) into one index array.
+
+    Example:
+        >>> _ranges_to_indices(np.array([2, 10]), np.array([5, 12]))
+        array([ 2,  3,  4, 10, 11])
+    """
+    lengths = ends - starts
+    total = int(lengths.sum())
+    if total == 0:
+        return np.empty(0, dtype=np.int64)
+    # Offset of each range relative to its position in the output array
+    offsets = starts - (np.cumsum(lengths) - lengths)
+    return np.repeat(offsets, lengths) + np.arange(total)
+
+
+def validate_coordinates_df(
+    df: pd.DataFrame,
+    lat_col: str,
+    lng_col: str,
+    bounds: dict | None = None
+) -> tuple[np.ndarray, dict]:
+    """
+    Validate every coordinate pair of a dataset in one vectorized pass.
+
+    Applies the same rules as validate_coordinates to whole columns and
+    classifies each rejected row by its first failing rule.
+
+    Parameters:
+        df (pd.DataFrame): Dataset with coordinate columns
+        lat_col, lng_col (str): Coordinate column names
+        bounds (dict | None): Bounds dict with keys 'lat_min', 'lat_max', 'lng_min', 'lng_max'
+            (default: DAEGU_BOUNDS)
+
+    Returns:
+        tuple[np.ndarray, dict]:
+            - mask: Boolean array, True for rows with valid coordinates
+            - report: Quality report with keys
+                - total: Number of rows
+                - valid: Rows passing validation
+                - missing: Missing or non-numeric coordinates
+                - zero: (0, 0) coordinates
+                - swapped: Latitude/longitude swap suspects (valid once swapped)
+                - out_of_bounds: Other coordinates outside bounds
+                - duplicates: Valid rows repeating an earlier valid coordinate pair (kept)
+
+    Example:
+        >>> mask, report = validate_coordinates_df(cctv_df, '위도', '경도')
+        >>> report['zero'], report['swapped']
+        (12, 3)
+    """
+    if bounds is None:
+        bounds = DAEGU_BOUNDS
+
+    lat = pd.to_numeric(df[lat_col], errors='coerce').to_numpy(dtype=np.float64)
+    lng = pd.to_numeric(df[lng_col], errors='coerce').to_numpy(dtype=np.float64)
+
+    def within(lat_values: np.ndarray, lng_values: np.ndarray) -> np.ndarray:
+        return (
+            (bounds['lat_min'] <= lat_values) & (lat_values <= bounds['lat_max'])
+            & (bounds['lng_min'] <= lng_values) & (lng_values <= bounds['lng_max'])
+        )
+
+    missing = np.isnan(lat) | np.isnan(lng)
+    zero = ~missing & (lat == 0.0) & (lng == 0.0)
+    in_bounds = within(lat, lng)
+    swapped = ~missing & ~zero & ~in_bounds & within(lng, lat)
+    out_of_bounds = ~missing & ~zero & ~in_bounds & ~swapped
+    mask = in_bounds
+
+    duplicates = 0
+    if mask.any():
+        duplicates = int(pd.DataFrame({'lat': lat[mask], 'lng': lng[mask]}).duplicated().sum())
+
+    report = {
+        'total': len(df),
+        'valid': int(mask.sum()),
+        'missing': int(missing.sum()),
+        'zero': int(zero.sum()),
+        'swapped': int(swapped.sum()),
+        'out_of_bounds': int(out_of_bounds.sum()),
+        'duplicates': duplicates
+    }
+
+    return mask, report
+
+
+def get_coordinate_validation(
+    df: pd.DataFrame,
+    lat_col: str,
+    lng_col: str,
+    bounds: dict | None = None
+) -> tuple[np.ndarray, dict]:
+    """
+    Cached validate_coordinates_df, keyed by coordinate content and bounds.
+
+    Maps, proximity analysis, spatial indexes and tools all call this, so a
+    dataset is validated once and every feature skips the same bad rows.
+
+    Parameters:
+        df (pd.DataFrame): Dataset with coordinate columns
+        lat_col, lng_col (str): Coordinate column names
+        bounds (dict | None): Coordinate bounds (default: DAEGU_BOUNDS)
+
+    Returns:
+        tuple[np.ndarray, dict]: (validity mask, quality report), see validate_coordinates_df
+    """
+    if bounds is None:
+        bounds = DAEGU_BOUNDS
+
+    key = (dataset_fingerprint(df, [lat_col, lng_col]), tuple(sorted(bounds.items())))
+    return _VALIDATION_CACHE.get_or_create(
+        key, lambda: validate_coordinates_df(df, lat_col, lng_col, bounds)
+    )
+
+
+def clean_coordinates(
+    df: pd.DataFrame,
+    lat_col: str,
+    lng_col: str,
+    bounds: dict | None = None
 ) -> pd.DataFrame:
     """
-    Calculate proximity statistics between two datasets.
+    Return the rows of df with valid coordinates (cached mask), coordinates as float.
 
-    This function implements a spatial proximity analysis that counts how many
-    target points are within specified distance thresholds of each base point.
+    Parameters:
+        df (pd.DataFrame): Dataset with coordinate columns
+        lat_col, lng_col (str): Coordinate column names
+        bounds (dict | None): Coordinate bounds (default: DAEGU_BOUNDS)
 
-    Algorithm Overview:
-    1. For each point in the base dataset
-    2. Calculate distance to every point in the target dataset (using Haversine)
-    3. Count how many target points fall within each threshold distance
-    4. Return summary statistics
+    Returns:
+        pd.DataFrame: Filtered copy of df (original index preserved)
+    """
+    mask, _ = get_coordinate_validation(df, lat_col, lng_col, bounds)
+    df_clean = df[mask]
 
-    Complexity: O(n × m) where n = base points, m = target points
-    Performance optimization: Samples to 5000 points if dataset is larger
+    # Numeric strings pass validation; make the columns numeric for downstream math
+    if not (pd.api.types.is_float_dtype(df_clean[lat_col]) and pd.api.types.is_float_dtype(df_clean[lng_col])):
+        df_clean = df_clean.astype({lat_col: np.float64, lng_col: np.float64})
 
-    Use Cases:
-    - How many CCTVs are within 500m of each accident location?
-    - What is the average number of security lights near parking lots?
-    - Identify areas with high/low facility density
+    return df_clean
+
+
+def project_to_local_xy(
+    lats,
+    lngs,
+    origin: tuple[float, float] = DAEGU_CENTER
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Project coordinates to a local equirectangular plane in kilometers.
+
+    x = R × Δlng × cos(origin_lat), y = R × Δlat (both in radians), so the
+    Euclidean distance between projected points approximates the Haversine
+    distance with only a subtraction, multiply and square root per pair.
+
+    Accuracy for city-scale data: within DAEGU_BOUNDS (35.7-36.1 N, 128.4-128.8 E)
+    and the default Daegu-center origin, the projected distance differs from
+    haversine_distance by at most 0.29% of the distance (about 1.5 m at 500 m,
+    6 m at 2 km, 29 m at 10 km; measured over 2M random pairs). The error comes
+    from cos(latitude) varying by ±0.29% across the bounds and grows with the
+    distance from the origin, so prefer 'haversine' for national-scale data.
 
     Parameters:
-        df_base (pd.DataFrame): Base dataset (e.g., train data)
-        base_lat_col, base_lng_col (str): Coordinate column names in df_base
-        df_target (pd.DataFrame): Target dataset (e.g., CCTV data)
-        target_lat_col, target_lng_col (str): Coordinate column names in df_target
-        thresholds (list[float] | None): Distance thresholds in kilometers (default: [0.5, 1.0, 2.0])
+        lats, lngs (array-like): Coordinates in decimal degrees
+        origin (tuple[float, float]): Projection origin (lat, lng) (default: DAEGU_CENTER)
 
     Returns:
-        pd.DataFrame: Proximity counts
-            - Rows: Each base point (sampled to max 5000 if needed)
-            - Columns: One column per threshold with count of target points within that distance
+        tuple[np.ndarray, np.ndarray]: (x_km east of origin, y_km north of origin)
+    """
+    origin_lat, origin_lng = origin
+    lats = np.asarray(lats, dtype=np.float64)
+    lngs = np.asarray(lngs, dtype=np.float64)
+    x = EARTH_RADIUS_KM * np.radians(lngs - origin_lng) * cos(radians(origin_lat))
+    y = EARTH_RADIUS_KM * np.radians(lats - origin_lat)
+    return x, y
+
+
+def unproject_local_xy(
+    x,
+    y,
+    origin: tuple[float, float] = DAEGU_CENTER
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Convert local equirectangular x/y kilometers back to coordinates (inverse of project_to_local_xy).
+
+    Parameters:
+        x, y (array-like): Kilometers east/north of origin
+        origin (tuple[float, float]): Projection origin (lat, lng) (default: DAEGU_CENTER)
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: (lats, lngs) in decimal degrees
+    """
+    origin_lat, origin_lng = origin
+    lats = origin_lat + np.degrees(np.asarray(y, dtype=np.float64) / EARTH_RADIUS_KM)
+    lngs = origin_lng + np.degrees(np.asarray(x, dtype=np.float64) / (EARTH_RADIUS_KM * cos(radians(origin_lat))))
+    return lats, lngs
+
+
+def _cell_quotas(counts: np.ndarray, n: int, min_per_cell: int, rng: np.random.Generator) -> np.ndarray:
+    """
+    Split a budget of n points over cells: every cell keeps min(count, min_per_cell),
+    and the rest is filled up to a common cap, so dense cells are capped first.
+
+    Requires sum(min(counts, min_per_cell)) <= n <= sum(counts).
+    """
+    floor = np.minimum(counts, min_per_cell)
+
+    def filled(cap: int) -> int:
+        return int(np.minimum(counts, np.maximum(floor, cap)).sum())
+
+    # Largest cap whose allocation fits the budget (binary search over integers)
+    low, high = 0, int(counts.max())
+    while low < high:
+        mid = (low + high + 1) // 2
+        if filled(mid) <= n:
+            low = mid
+        else:
+            high = mid - 1
+
+    quotas = np.minimum(counts, np.maximum(floor, low))
+
+    # Hand the remainder to random cells still above the cap (one point each)
+    remainder = n - int(quotas.sum())
+    if remainder > 0:
+        open_cells = np.flatnonzero(counts > quotas)
+        quotas[rng.choice(open_cells, remainder, replace=False)] += 1
+    return quotas
+
+
+def stratified_spatial_sample(
+    lats,
+    lngs,
+    n: int,
+    cell_km: float = DEFAULT_SAMPLE_CELL_KM,
+    min_per_cell: int = DEFAULT_SAMPLE_MIN_PER_CELL,
+    seed: int = 42
+) -> np.ndarray:
+    """
+    Sample n points spread over space instead of uniformly over rows.
+
+    Points are stratified by square cells of cell_km (local projection). Each
+    non-empty cell keeps at least min_per_cell points and dense cells are capped
+    at a common level, so sparse outskirts stay visible while dense downtown
+    blocks still hold the most points. If the cells outnumber the budget, the
+    cell size is doubled until the minimums fit.
+
+    Parameters:
+        lats, lngs (array-like): Coordinates in decimal degrees (no NaN)
+        n (int): Number of points to keep
+        cell_km (float): Stratum cell size in kilometers (default: 0.25)
+        min_per_cell (int): Minimum points kept per non-empty cell (default: 1)
+        seed (int): Random seed; the same input always gives the same sample (default: 42)
+
+    Returns:
+        np.ndarray: Sorted positions of the sampled points (all positions if n >= len(lats))
+    """
+    lats = np.asarray(lats, dtype=np.float64)
+    lngs = np.asarray(lngs, dtype=np.float64)
+    total = len(lats)
+    if n >= total:
+        return np.arange(total)
+    if n <= 0:
+        return np.empty(0, dtype=np.int64)
+
+    rng = np.random.default_rng(seed)
+    x, y = project_to_local_xy(lats, lngs)
+    while True:
+        cell_x = np.floor(x / cell_km).astype(np.int64)
+        cell_y = np.floor(y / cell_km).astype(np.int64)
+        keys = (cell_x - cell_x.min()) * (int(cell_y.max() - cell_y.min()) + 1) + (cell_y - cell_y.min())
+        _, cells, counts = np.unique(keys, return_inverse=True, return_counts=True)
+        if int(np.minimum(counts, min_per_cell).sum()) <= n:
+            break
+        cell_km *= 2
+
+    quotas = _cell_quotas(counts, n, min_per_cell, rng)
+
+    # Random order within each cell, then keep the first quota points of every cell
+    order = np.lexsort((rng.random(total), cells))
+    sorted_cells = cells[order]
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    rank = np.arange(total) - starts[sorted_cells]
+    return np.sort(order[rank < quotas[sorted_cells]])
+
+
+def spatial_sample(
+    df: pd.DataFrame,
+    lat_col: str,
+    lng_col: str,
+    n: int,
+    cell_km: float = DEFAULT_SAMPLE_CELL_KM,
+    min_per_cell: int = DEFAULT_SAMPLE_MIN_PER_CELL,
+    bounds: dict | None = None
+) -> pd.DataFrame:
+    """
+    Return up to n rows with valid coordinates, sampled with stratified_spatial_sample.
+
+    Sample positions are cached per (coordinate content, n, cell_km, min_per_cell),
+    so repeated map renders and analyses reuse the same rows without resampling.
+
+    Parameters:
+        df (pd.DataFrame): Dataset with coordinates
+        lat_col, lng_col (str): Coordinate column names
+        n (int): Point budget
+        cell_km (float): Stratum cell size in kilometers (default: 0.25)
+        min_per_cell (int): Minimum points kept per non-empty cell (default: 1)
+        bounds (dict | None): Coordinate bounds of valid rows (default: DAEGU_BOUNDS)
+
+    Returns:
+        pd.DataFrame: Sampled rows of clean_coordinates(df, lat_col, lng_col, bounds), in original order
 
     Example:
-        >>> proximity_df = compute_proximity_stats(
-        ...     train_df, 'lat', 'lng',
-        ...     cctv_df, 'latitude', 'longitude',
-        ...     thresholds=[0.5, 1.0, 2.0]
-        ... )
-        >>> proximity_df['0.5'].mean()  # Average CCTVs within 500m
-        3.2
+        >>> shown = spatial_sample(lights_df, '위도', '경도', 5000)
     """
-    # Default thresholds: 500m, 1km, 2km - common distances for urban analysis
-    if thresholds is None:
-        thresholds = [0.5, 1.0, 2.0]
+    if bounds is None:
+        bounds = DAEGU_BOUNDS
+
+    df_clean = clean_coordinates(df, lat_col, lng_col, bounds)
+    if len(df_clean) <= n:
+        return df_clean
+
+    key = (
+        dataset_fingerprint(df, [lat_col, lng_col]), tuple(sorted(bounds.items())),
+        int(n), float(cell_km), int(min_per_cell)
+    )
+    positions = _SAMPLE_CACHE.get_or_create(key, lambda: stratified_spatial_sample(
+        df_clean[lat_col].to_numpy(), df_clean[lng_col].to_numpy(), n, cell_km, min_per_cell
+    ))
+    return df_clean.iloc[positions]
+
+
+def _sort_radii(radii: list[float]) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Sort radii ascending.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: (sorted radii, original column of each sorted radius)
+    """
+    radii = np.asarray(radii, dtype=np.float64)
+    column_order = np.argsort(radii, kind='stable')
+    return radii[column_order], column_order
+
 
-    # Performance optimization: sample to 5000 rows if larger
-    # This keeps computation time reasonable (< 10 seconds typically)
-    if len(df_base) > 5000:
-        df_base = df_base.sample(5000, random_state=42)
+def _cumulative_counts(distances: np.ndarray, sorted_radii: np.ndarray) -> np.ndarray:
+    """
+    Count distances <= each radius, for every row, in a single pass.
+
+    Each distance is assigned to the first radius that contains it (binary search),
+    then per-row bin histograms are accumulated. Cost is O(q × c × log R) instead
+    of one full comparison of the (q, c) block per radius.
+
+    Parameters:
+        distances (np.ndarray): Shape (q, c) distances in km
+        sorted_radii (np.ndarray): Shape (R,) ascending radii in km
+
+    Returns:
+        np.ndarray: Shape (q, R) int64 cumulative counts
+    """
+    n_rows = distances.shape[0]
+    n_bins = len(sorted_radii) + 1  # Last bin collects distances beyond every radius
+
+    # searchsorted(side='left') gives the first radius r with distance <= r
+    bins = np.searchsorted(sorted_radii, distances, side='left')
+    flat = (np.arange(n_rows)[:, None] * n_bins + bins).ravel()
+    histogram = np.bincount(flat, minlength=n_rows * n_bins).reshape(n_rows, n_bins)
 
-    # Initialize results dictionary with string keys for DataFrame columns
-    results = {str(t): [] for t in thresholds}
+    return np.cumsum(histogram[:, :-1], axis=1)
 
-    # Data cleaning: remove rows with missing coordinates
-    # (cannot calculate distance without valid coordinates)
-    df_base_clean = df_base.dropna(subset=[base_lat_col, base_lng_col])
-    df_target_clean = df_target.dropna(subset=[target_lat_col, target_lng_col])
 
-    # Main computation loop: for each base point, count nearby target points
-    for _, base_row in df_base_clean.iterrows():
-        base_lat = base_row[base_lat_col]
-        base_lng = base_row[base_lng_col]
+def _cumulative_sums(
+    distances: np.ndarray,
+    sorted_limits: np.ndarray,
+    weights: list[np.ndarray],
+    with_counts: bool = False
+) -> list[np.ndarray]:
+    """
+    Weighted version of _cumulative_counts: sum weights of distances <= each radius.
+
+    The radius bin of every distance is found once and reused for all weight arrays
+    (and for the plain counts when with_counts is set, so a combined count and
+    weighted query pays for a single binary search).
+
+    Parameters:
+        distances (np.ndarray): Shape (q, c) distances
+        sorted_limits (np.ndarray): Shape (R,) ascending radii (same unit as distances)
+        weights (list[np.ndarray]): Arrays broadcastable to (q, c)
+        with_counts (bool): Prepend the (q, R) int64 cumulative counts (default: False)
 
-        # Initialize counts for each threshold
-        counts = {t: 0 for t in thresholds}
+    Returns:
+        list[np.ndarray]: One (q, R) float64 cumulative sum per weight array
+            (preceded by the counts if with_counts)
+    """
+    n_rows = distances.shape[0]
+    n_bins = len(sorted_limits) + 1
 
-        # Calculate distance to each target point
-        for _, target_row in df_target_clean.iterrows():
-            target_lat = target_row[target_lat_col]
-            target_lng = target_row[target_lng_col]
+    bins = np.searchsorted(sorted_limits, distances, side='left')
+    flat = (np.arange(n_rows)[:, None] * n_bins + bins).ravel()
 
-            # Calculate Haversine distance (great-circle distance)
-            dist = haversine_distance(base_lat, base_lng, target_lat, target_lng)
+    sums = []
+    if with_counts:
+        histogram = np.bincount(flat, minlength=n_rows * n_bins).reshape(n_rows, n_bins)
+        sums.append(np.cumsum(histogram[:, :-1], axis=1))
+    for weight in weights:
+        histogram = np.bincount(
+            flat, weights=np.broadcast_to(weight, distances.shape).ravel(), minlength=n_rows * n_bins
+        ).reshape(n_rows, n_bins)
+        sums.append(np.cumsum(histogram[:, :-1], axis=1))
+    return sums
 
-            # Increment counts for all thresholds that include this distance
-            # (if within 0.5km, it's also within 1km and 2km)
-            for t in thresholds:
-                if dist <= t:
-                    counts[t] += 1
 
-        # Add counts to results
-        for t in thresholds:
-            results[str(t)].append(counts[t])
+class GridIndex:
+    """
+    Uniform latitude/longitude grid index for radius queries.
+
+    Points are bucketed into cells of roughly cell_km × cell_km and stored
+    sorted by cell id (row-major), so each row of neighbouring cells is one
+    contiguous slice of the sorted arrays. A radius query then computes exact
+    Haversine distances only against points in cells that can lie within the
+    radius, instead of against the whole target table.
 
-    # Convert to DataFrame for easy analysis
-    return pd.DataFrame(results)
+    The candidate window is a conservative bound derived from the distance
+    formula itself, so query results are identical to a brute-force scan.
+
+    Two distance metrics are supported:
+    - 'haversine': exact great-circle distance (default)
+    - 'equirectangular': points are projected once to local x/y kilometers
+      (project_to_local_xy) and compared by squared Euclidean distance; faster,
+      with at most 0.29% error inside DAEGU_BOUNDS
+
+    Attributes:
+        size (int): Number of indexed points
+        positions (np.ndarray): Original position of each sorted point
+        lats, lngs (np.ndarray): Point coordinates in cell order
+        cell_ids (np.ndarray): Sorted cell id of each point
+
+    Example:
+        >>> index = GridIndex(cctv_df['위도'], cctv_df['경도'])
+        >>> counts = index.query_radius_counts(train_lats, train_lngs, [0.5, 1.0])
+        >>> counts.shape
+        (39609, 2)
+    """
+
+    def __init__(
+        self,
+        lats,
+        lngs,
+        cell_km: float = DEFAULT_CELL_KM,
+        metric: str = 'haversine',
+        origin: tuple[float, float] = DAEGU_CENTER
+    ):
+        """
+        Build the index.
+
+        Parameters:
+            lats, lngs (array-like): Point coordinates in decimal degrees (no NaN)
+            cell_km (float): Approximate cell edge length in kilometers (default: 0.5)
+            metric (str): 'haversine' or 'equirectangular' (default: 'haversine')
+            origin (tuple[float, float]): Projection origin for 'equirectangular'
+                (default: DAEGU_CENTER)
+
+        Raises:
+            ValueError: If metric is not one of DISTANCE_MODES
+        """
+        if metric not in DISTANCE_MODES:
+            raise ValueError(f"Unknown distance metric: '{metric}'. Valid options: {', '.join(DISTANCE_MODES)}")
+
+        lats = np.asarray(lats, dtype=np.float64)
+        lngs = np.asarray(lngs, dtype=np.float64)
+
+        self.cell_km = cell_km
+        self.size = len(lats)
+        self.metric = metric
+        self.origin_lat, self.origin_lng = origin
+
+        # Cell height is constant in degrees of latitude; cell width is
+        # stretched by cos(mean latitude) so cells are roughly square on the ground
+        mean_lat = float(lats.mean()) if self.size else 0.0
+        self.cell_lat_deg = float(np.degrees(cell_km / EARTH_RADIUS_KM))
+        self.cell_lng_deg = self.cell_lat_deg / max(cos(radians(mean_lat)), 1e-6)
+
+        self.lat_origin = float(lats.min()) if self.size else 0.0
+        self.lng_origin = float(lngs.min()) if self.size else 0.0
+
+        cell_y, cell_x = self._cell_coords(lats, lngs)
+        self.n_rows = int(cell_y.max()) + 1 if self.size else 0
+        self.n_cols = int(cell_x.max()) + 1 if self.size else 0
+
+        cell_ids = cell_y * self.n_cols + cell_x
+        order = np.argsort(cell_ids, kind='stable')
+
+        self.positions = order
+        self.lats = lats[order]
+        self.lngs = lngs[order]
+        self.cell_ids = cell_ids[order]
+
+        # Local projection computed once per dataset (used by 'equirectangular')
+        self.xs, self.ys = project_to_local_xy(self.lats, self.lngs, origin)
+
+    # Scalar metadata and array fields that fully describe a built index
+    META_FIELDS = (
+        'cell_km', 'size', 'metric', 'origin_lat', 'origin_lng',
+        'cell_lat_deg', 'cell_lng_deg', 'lat_origin', 'lng_origin', 'n_rows', 'n_cols'
+    )
+    ARRAY_FIELDS = ('positions', 'lats', 'lngs', 'cell_ids', 'xs', 'ys')
+
+    def to_state(self) -> tuple[dict, dict[str, np.ndarray]]:
+        """
+        Export the index as (metadata, arrays) so it can be rebuilt without re-sorting.
+
+        Returns:
+            tuple[dict, dict[str, np.ndarray]]: Scalar metadata and the sorted point arrays
+        """
+        meta = {name: getattr(self, name) for name in self.META_FIELDS}
+        arrays = {name: getattr(self, name) for name in self.ARRAY_FIELDS}
+        return meta, arrays
+
+    @classmethod
+    def from_state(cls, meta: dict, arrays: dict[str, np.ndarray]) -> 'GridIndex':
+        """
+        Rebuild an index from to_state() output. Arrays are used as-is (no copy),
+        so they may be views on shared memory or memory-mapped files.
+
+        Parameters:
+            meta (dict): Scalar metadata from to_state()
+            arrays (dict[str, np.ndarray]): Array fields from to_state()
+
+        Returns:
+            GridIndex: Index ready for queries
+        """
+        index = cls.__new__(cls)
+        for name in cls.META_FIELDS:
+            setattr(index, name, meta[name])
+        for name in cls.ARRAY_FIELDS:
+            setattr(index, name, arrays[name])
+        return index
+
+    def _cell_coords(self, lats: np.ndarray, lngs: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Return (row, column) grid coordinates; may fall outside the grid for query points."""
+        cell_y = np.floor((lats - self.lat_origin) / self.cell_lat_deg).astype(np.int64)
+        cell_x = np.floor((lngs - self.lng_origin) / self.cell_lng_deg).astype(np.int64)
+        return cell_y, cell_x
+
+    def save(self, path: str) -> None:
+        """
+        Serialize the index to a .npz file (written atomically).
+
+        Parameters:
+            path (str): Destination file path
+        """
+        meta, arrays = self.to_state()
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            np.savez(f, meta=np.array(json.dumps(meta)), **arrays)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> 'GridIndex':
+        """
+        Load an index written by save().
+
+        Parameters:
+            path (str): .npz file path
+
+        Returns:
+            GridIndex: Index ready for queries
+
+        Raises:
+            OSError: If the file cannot be read
+            ValueError, KeyError: If the file is not a valid index
+        """
+        with np.load(path, allow_pickle=False) as data:
+            meta = json.loads(str(data['meta']))
+            arrays = {name: data[name] for name in cls.ARRAY_FIELDS}
+        return cls.from_state(meta, arrays)
+
+    def spatial_order(self, lats, lngs) -> np.ndarray:
+        """
+        Return an ordering of query points that groups them by grid cell.
+
+        Processing query points in this order keeps chunks spatially compact,
+        so each chunk touches few cells and reuses the same candidate slices.
+
+        Parameters:
+            lats, lngs (array-like): Query coordinates in decimal degrees (no NaN)
+
+        Returns:
+            np.ndarray: Permutation of range(len(lats))
+        """
+        cell_y, cell_x = self._cell_coords(
+            np.asarray(lats, dtype=np.float64), np.asarray(lngs, dtype=np.float64)
+        )
+        return np.lexsort((cell_x, cell_y))
+
+    def iter_neighbor_blocks(
+        self,
+        lats,
+        lngs,
+        radius_km: float,
+        squared: bool = False
+    ) -> Iterator[tuple[np.ndarray, np.ndarray, np.ndarray]]:
+        """
+        Yield dense distance blocks covering every indexed point within radius_km.
+
+        Query points are grouped by the grid cell they fall in. For each group the
+        candidate cells are gathered with one searchsorted per grid row, and the
+        exact distance matrix (group × candidates) under the index metric is
+        computed. Every indexed point within radius_km of a query point is
+        guaranteed to appear among that point's candidates; candidates farther
+        away may also appear, so consumers must still compare distances against
+        their radius.
+
+        Parameters:
+            lats, lngs (array-like): Query coordinates in decimal degrees (no NaN)
+            radius_km (float): Search radius in kilometers
+            squared (bool): Yield squared distances, which skips the square root in
+                'equirectangular' mode; compare them against squared radii (default: False)
+
+        Yields:
+            tuple[np.ndarray, np.ndarray, np.ndarray]:
+                - query_idx: Positions into the query arrays, shape (q,)
+                - candidate_idx: Positions into the sorted index arrays, shape (c,)
+                - distances: Distances in km (or km² if squared), shape (q, c)
+        """
+        lats = np.asarray(lats, dtype=np.float64)
+        lngs = np.asarray(lngs, dtype=np.float64)
+        if self.size == 0 or len(lats) == 0:
+            return
+
+        projected = self.metric == 'equirectangular'
+        if projected:
+            query_xs, query_ys = project_to_local_xy(lats, lngs, (self.origin_lat, self.origin_lng))
+
+        # Latitude reach: distance >= R × |Δlat| for any pair of points (both metrics)
+        dlat_deg = float(np.degrees(radius_km / EARTH_RADIUS_KM))
+
+        # Group query points by grid cell
+        q_y, q_x = self._cell_coords(lats, lngs)
+        order = np.lexsort((q_x, q_y))
+        changed = (np.diff(q_y[order]) != 0) | (np.diff(q_x[order]) != 0)
+        boundaries = np.flatnonzero(changed) + 1
+        group_starts = np.concatenate(([0], boundaries))
+        group_ends = np.concatenate((boundaries, [len(order)]))
+
+        for g_start, g_end in zip(group_starts, group_ends):
+            group = order[g_start:g_end]
+            g_lats = lats[group]
+            g_lngs = lngs[group]
+
+            if projected:
+                # Longitude reach: x distance is R × Δlon × cos(origin_lat) exactly
+                dlng_deg = dlat_deg / max(cos(radians(self.origin_lat)), 1e-12)
+            else:
+                # Longitude reach: a >= cos²(φmax) × sin²(Δlon/2) bounds Δlon for the
+                # highest absolute latitude either point can have
+                phi_max = radians(min(float(np.abs(g_lats).max()) + dlat_deg, 90.0))
+                ratio = sin(radius_km / (2 * EARTH_RADIUS_KM)) / max(cos(phi_max), 1e-12)
+                dlng_deg = 180.0 if ratio >= 1.0 else float(np.degrees(2 * asin(ratio)))
+
+            y0, x0 = self._cell_coords(np.array([g_lats.min() - dlat_deg]), np.array([g_lngs.min() - dlng_deg]))
+            y1, x1 = self._cell_coords(np.array([g_lats.max() + dlat_deg]), np.array([g_lngs.max() + dlng_deg]))
+            y0, y1 = max(int(y0[0]), 0), min(int(y1[0]), self.n_rows - 1)
+            x0, x1 = max(int(x0[0]), 0), min(int(x1[0]), self.n_cols - 1)
+            if y0 > y1 or x0 > x1:
+                continue
+
+            # One contiguous slice of the sorted arrays per grid row
+            rows = np.arange(y0, y1 + 1, dtype=np.int64)
+            starts = np.searchsorted(self.cell_ids, rows * self.n_cols + x0, side='left')
+            ends = np.searchsorted(self.cell_ids, rows * self.n_cols + x1, side='right')
+            candidates = _ranges_to_indices(starts, ends)
+            if len(candidates) == 0:
+                continue
+
+            if projected:
+                c_xs = self.xs[candidates]
+                c_ys = self.ys[candidates]
+            else:
+                c_lats = self.lats[candidates]
+                c_lngs = self.lngs[candidates]
+
+            # Split large groups so one block never exceeds MAX_BLOCK_PAIRS
+            step = max(1, MAX_BLOCK_PAIRS // len(candidates))
+            for s in range(0, len(group), step):
+                sub = group[s:s + step]
+                if projected:
+                    distances = (
+                        (query_xs[sub, None] - c_xs[None, :]) ** 2
+                        + (query_ys[sub, None] - c_ys[None, :]) ** 2
+                    )
+                    if not squared:
+                        distances = np.sqrt(distances)
+                else:
+                    distances = haversine_matrix(lats[sub], lngs[sub], c_lats, c_lngs)
+                    if squared:
+                        distances = distances ** 2
+                yield sub, candidates, distances
+
+    def query_radius_counts(self, lats, lngs, radii: list[float]) -> np.ndarray:
+        """
+        Count indexed points within each radius of every query point.
+
+        Parameters:
+            lats, lngs (array-like): Query coordinates in decimal degrees (no NaN)
+            radii (list[float]): Radii in kilometers
+
+        Returns:
+            np.ndarray: Shape (n_queries, len(radii)) int64 counts
+        """
+        counts = np.zeros((len(lats), len(radii)), dtype=np.int64)
+        if len(radii) == 0:
+            return counts
+
+        # Projected mode compares squared distances against squared radii
+        squared = self.metric == 'equirectangular'
+        sorted_radii, column_order = _sort_radii(radii)
+        limits = sorted_radii ** 2 if squared else sorted_radii
+
+        for query_idx, _, distances in self.iter_neighbor_blocks(lats, lngs, sorted_radii[-1], squared):
+            counts[query_idx[:, None], column_order] = _cumulative_counts(distances, limits)
+
+        return counts
+
+    def query_radius_weighted(
+        self,
+        lats,
+        lngs,
+        radii: list[float],
+        values,
+        kernel: str = 'uniform',
+        bandwidth_km: float | None = None
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Kernel-weighted sums of a per-point value within each radius of every query point.
+
+        Uses the same neighbour blocks and radius binning as query_radius_counts,
+        so any number of radii still costs a single pass. Kernels (d = distance,
+        r = radius):
+        - 'uniform': k = 1
+        - 'linear': k = 1 - d / r (decays to 0 at the radius)
+        - 'gaussian': k = exp(-d² / 2h²), h = bandwidth_km
+
+        Parameters:
+            lats, lngs (array-like): Query coordinates in decimal degrees (no NaN)
+            radii (list[float]): Radii in kilometers
+            values (array-like): One value per indexed point, in the original
+                (unsorted) order of the index; NaN values are skipped
+            kernel (str): One of PROXIMITY_KERNELS (default: 'uniform')
+            bandwidth_km (float | None): Gaussian bandwidth (default: smallest radius)
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: Shape (n_queries, len(radii)) float64
+                - sums: Σ k × value over indexed points within each radius
+                - weights: Σ k over the same points (sums / weights is the weighted mean)
+
+        Raises:
+            ValueError: If kernel is not one of PROXIMITY_KERNELS
+        """
+        _, sums, weights = self._query_radius_weighted(lats, lngs, radii, values, kernel, bandwidth_km, False)
+        return sums, weights
+
+    def query_counts_and_weighted(
+        self,
+        lats,
+        lngs,
+        radii: list[float],
+        values,
+        kernel: str = 'uniform',
+        bandwidth_km: float | None = None
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Radius counts plus kernel-weighted sums from a single neighbour pass.
+
+        Equivalent to query_radius_counts followed by query_radius_weighted, but the
+        distance blocks are computed once and binned for both.
+
+        Parameters:
+            lats, lngs, radii, values, kernel, bandwidth_km: See query_radius_weighted
+
+        Returns:
+            tuple[np.ndarray, np.ndarray, np.ndarray]: Shape (n_queries, len(radii))
+                int64 counts, float64 sums, float64 weights
+        """
+        return self._query_radius_weighted(lats, lngs, radii, values, kernel, bandwidth_km, True)
+
+    def _query_radius_weighted(
+        self,
+        lats,
+        lngs,
+        radii: list[float],
+        values,
+        kernel: str,
+        bandwidth_km: float | None,
+        with_counts: bool
+    ) -> tuple[np.ndarray | None, np.ndarray, np.ndarray]:
+        """Shared pass of query_radius_weighted and query_counts_and_weighted."""
+        if kernel not in PROXIMITY_KERNELS:
+            raise ValueError(f"Unknown kernel: '{kernel}'. Valid options: {', '.join(PROXIMITY_KERNELS)}")
+
+        counts = np.zeros((len(lats), len(radii)), dtype=np.int64) if with_counts else None
+        sums = np.zeros((len(lats), len(radii)))
+        weights = np.zeros((len(lats), len(radii)))
+        if len(radii) == 0 or self.size == 0:
+            return counts, sums, weights
+
+        # Reorder values to the sorted index layout; missing values get zero weight
+        values = np.asarray(values, dtype=np.float64)[self.positions]
+        present = np.isfinite(values).astype(np.float64)
+        values = np.where(present > 0, values, 0.0)
+
+        squared = self.metric == 'equirectangular'
+        sorted_radii, column_order = _sort_radii(radii)
+        limits = sorted_radii ** 2 if squared else sorted_radii
+        bandwidth = bandwidth_km if bandwidth_km is not None else float(sorted_radii[0])
+
+        for query_idx, candidates, distances in self.iter_neighbor_blocks(lats, lngs, sorted_radii[-1], squared):
+            c_values = values[candidates]
+            c_present = present[candidates]
+
+            if kernel == 'uniform':
+                binned = _cumulative_sums(distances, limits, [c_values, c_present], with_counts)
+            elif kernel == 'gaussian':
+                squared_km = distances if squared else distances ** 2
+                decay = np.exp(-squared_km / (2 * bandwidth ** 2))
+                binned = _cumulative_sums(distances, limits, [decay * c_values, decay * c_present], with_counts)
+            else:
+                # Σ(1 - d/r)·v = Σv - Σ(d·v)/r, so every radius still comes from one binning
+                km = np.sqrt(distances) if squared else distances
+                binned = _cumulative_sums(
+                    distances, limits, [c_values, c_present, km * c_values, km * c_present], with_counts
+                )
+                value_sums, present_sums, dv_sums, d_sums = binned[-4:]
+                binned[-4:] = [value_sums - dv_sums / sorted_radii, present_sums - d_sums / sorted_radii]
+
+            if with_counts:
+                counts[query_idx[:, None], column_order] = binned[0]
+            sums[query_idx[:, None], column_order] = binned[-2]
+            weights[query_idx[:, None], column_order] = binned[-1]
+
+        return counts, sums, weights
+
+    def query_counts_and_nearest(self, lats, lngs, radii: list[float]) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Radius counts plus nearest-point distance from a single neighbour pass.
+
+        The nearest distance of every query point with at least one indexed point
+        within max(radii) falls out of the same distance blocks used for counting;
+        only the remaining (isolated) points need a separate k-NN search.
+
+        Parameters:
+            lats, lngs (array-like): Query coordinates in decimal degrees (no NaN)
+            radii (list[float]): Radii in kilometers (at least one)
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]:
+                - counts: Shape (n, len(radii)) int64 counts
+                - nearest: Shape (n,) distance in km to the nearest indexed point (inf if empty)
+        """
+        lats = np.asarray(lats, dtype=np.float64)
+        lngs = np.asarray(lngs, dtype=np.float64)
+        max_radius = max(radii)
+
+        counts = np.zeros((len(lats), len(radii)), dtype=np.int64)
+        nearest = np.full(len(lats), np.inf)
+
+        # Projected mode compares squared distances against squared radii
+        squared = self.metric == 'equirectangular'
+        sorted_radii, column_order = _sort_radii(radii)
+        limits = sorted_radii ** 2 if squared else sorted_radii
+
+        for query_idx, _, distances in self.iter_neighbor_blocks(lats, lngs, max_radius, squared):
+            counts[query_idx[:, None], column_order] = _cumulative_counts(distances, limits)
+            block_min = distances.min(axis=1)
+            nearest[query_idx] = np.where(block_min <= limits[-1], block_min, np.inf)
+
+        if squared:
+            nearest = np.sqrt(nearest)
+
+        isolated = np.flatnonzero(np.isinf(nearest))
+        if len(isolated) > 0:
+            nearest[isolated] = self.query_knn(lats[isolated], lngs[isolated], k=1)[0][:, 0]
+
+        return counts, nearest
+
+    def query_knn(self, lats, lngs, k: int = 1) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Find the k nearest indexed points of every query point.
+
+        Uses an expanding radius search: candidates within radius r are exact
+        neighbours, so a query point is resolved as soon as at least k indexed
+        points lie within r. Unresolved points are retried with a doubled radius,
+        which keeps dense areas cheap while sparse areas still terminate.
+
+        Parameters:
+            lats, lngs (array-like): Query coordinates in decimal degrees (no NaN)
+            k (int): Number of neighbours (default: 1)
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]:
+                - distances: Shape (n, k) distances in km under the index metric,
+                  ascending (inf if missing)
+                - indices: Shape (n, k) positions into the arrays the index was built
+                  from (-1 if fewer than k points are indexed)
+        """
+        lats = np.asarray(lats, dtype=np.float64)
+        lngs = np.asarray(lngs, dtype=np.float64)
+        n = len(lats)
+
+        distances = np.full((n, k), np.inf)
+        indices = np.full((n, k), -1, dtype=np.int64)
+        if n == 0 or self.size == 0:
+            return distances, indices
+
+        # Half the Earth's circumference: every point is within this radius
+        max_radius = np.pi * EARTH_RADIUS_KM
+        radius = self.cell_km * max(1.0, np.sqrt(k))
+        unresolved = np.arange(n)
+
+        while len(unresolved) > 0:
+            final_round = radius >= max_radius
+            resolved = np.zeros(len(unresolved), dtype=bool)
+
+            for query_idx, candidates, block in self.iter_neighbor_blocks(
+                lats[unresolved], lngs[unresolved], radius
+            ):
+                # Only distances within the radius are guaranteed to be complete
+                block = np.where(block <= radius, block, np.inf)
+                done = (np.isfinite(block).sum(axis=1) >= k) | final_round
+                if not done.any():
+                    continue
+
+                block = block[done]
+                kk = min(k, block.shape[1])
+                nearest = np.argpartition(block, kk - 1, axis=1)[:, :kk]
+                nearest_dist = np.take_along_axis(block, nearest, axis=1)
+                ranked = np.argsort(nearest_dist, axis=1)
+                nearest = np.take_along_axis(nearest, ranked, axis=1)
+                nearest_dist = np.take_along_axis(nearest_dist, ranked, axis=1)
+
+                rows = unresolved[query_idx[done]]
+                distances[rows, :kk] = nearest_dist
+                indices[rows, :kk] = np.where(
+                    np.isfinite(nearest_dist), self.positions[candidates[nearest]], -1
+                )
+                resolved[query_idx[done]] = True
+
+            if final_round:
+                break
+            unresolved = unresolved[~resolved]
+            radius = min(radius * 2, max_radius)
+
+        return distances, indices
+
+    def query_nearest_within(self, lats, lngs, radius_km: float) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Find the nearest indexed point within radius_km of every query point.
+
+        Unlike query_knn the search never widens: points with nothing in range are
+        left unmatched, so cost is bounded by the radius (a single neighbour pass).
+
+        Parameters:
+            lats, lngs (array-like): Query coordinates in decimal degrees (no NaN)
+            radius_km (float): Search radius in kilometers
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]:
+                - distances: Shape (n,) distance in km to the nearest point (inf if none in range)
+                - indices: Shape (n,) positions into the arrays the index was built from (-1 if none)
+        """
+        lats = np.asarray(lats, dtype=np.float64)
+        lngs = np.asarray(lngs, dtype=np.float64)
+        distances = np.full(len(lats), np.inf)
+        indices = np.full(len(lats), -1, dtype=np.int64)
+
+        squared = self.metric == 'equirectangular'
+        limit = radius_km ** 2 if squared else radius_km
+
+        for query_idx, candidates, block in self.iter_neighbor_blocks(lats, lngs, radius_km, squared):
+            nearest = block.argmin(axis=1)
+            nearest_dist = block[np.arange(len(query_idx)), nearest]
+            found = nearest_dist <= limit
+            distances[query_idx[found]] = nearest_dist[found]
+            indices[query_idx[found]] = self.positions[candidates[nearest[found]]]
+
+        if squared:
+            distances = np.sqrt(distances)
+        return distances, indices
+
+    def query_bbox(self, south: float, west: float, north: float, east: float) -> np.ndarray:
+        """
+        Return the indexed points inside a latitude/longitude bounding box.
+
+        Each grid row overlapping the box is one contiguous slice of the sorted
+        arrays (found with searchsorted), so only points of overlapping cells are
+        tested against the box.
+
+        Parameters:
+            south, west, north, east (float): Box edges in decimal degrees (inclusive)
+
+        Returns:
+            np.ndarray: Sorted positions into the arrays the index was built from
+        """
+        if self.size == 0 or north < south or east < west:
+            return np.empty(0, dtype=np.int64)
+
+        (row_min, row_max), (col_min, col_max) = self._cell_coords(
+            np.array([south, north]), np.array([west, east])
+        )
+        row_min, row_max = max(int(row_min), 0), min(int(row_max), self.n_rows - 1)
+        col_min, col_max = max(int(col_min), 0), min(int(col_max), self.n_cols - 1)
+        if row_min > row_max or col_min > col_max:
+            return np.empty(0, dtype=np.int64)
+
+        rows = np.arange(row_min, row_max + 1)
+        starts = np.searchsorted(self.cell_ids, rows * self.n_cols + col_min, side='left')
+        ends = np.searchsorted(self.cell_ids, rows * self.n_cols + col_max, side='right')
+        candidates = _ranges_to_indices(starts, ends)
+
+        inside = (
+            (self.lats[candidates] >= south) & (self.lats[candidates] <= north)
+            & (self.lngs[candidates] >= west) & (self.lngs[candidates] <= east)
+        )
+        return np.sort(self.positions[candidates[inside]])
+
+
+def get_spatial_index(
+    df: pd.DataFrame,
+    lat_col: str,
+    lng_col: str,
+    cell_km: float = DEFAULT_CELL_KM,
+    metric: str = 'haversine',
+    use_disk_cache: bool = True,
+    bounds: dict | None = None
+) -> GridIndex:
+    """
+    Return the GridIndex of a dataset, building it at most once per content.
+
+    Indexes are keyed by a fingerprint of the coordinate columns, kept in a
+    bounded in-memory LRU cache and persisted under INDEX_CACHE_DIR (bounded by
+    INDEX_CACHE_MAX_FILES / INDEX_CACHE_MAX_BYTES, see prune_index_cache), so repeated
+    proximity / nearest-neighbour runs (e.g., when only thresholds change) and
+    server restarts reuse the same index.
+
+    The index is built over clean_coordinates(df, lat_col, lng_col, bounds)
+    (missing, (0, 0), swapped and out-of-bounds rows skipped); its positions refer
+    to rows of that cleaned frame.
+
+    Parameters:
+        df (pd.DataFrame): Dataset with coordinates
+        lat_col, lng_col (str): Coordinate column names
+        cell_km (float): Grid cell size in kilometers (default: 0.5)
+        metric (str): 'haversine' or 'equirectangular' (default: 'haversine')
+        use_disk_cache (bool): Load/save the index under INDEX_CACHE_DIR (default: True)
+        bounds (dict | None): Coordinate bounds of indexed rows (default: DAEGU_BOUNDS)
+
+    Returns:
+        GridIndex: Cached or newly built index
+    """
+    if bounds is None:
+        bounds = DAEGU_BOUNDS
+
+    fingerprint = dataset_fingerprint(df, [lat_col, lng_col])
+    bounds_key = tuple(sorted(bounds.items()))
+    bounds_tag = '_'.join(f"{value:g}" for _, value in bounds_key)
+
+    def build() -> GridIndex:
+        path = os.path.join(
+            INDEX_CACHE_DIR,
+            f"{fingerprint}_{bounds_tag}_{cell_km:g}km_{metric}_v{INDEX_FORMAT_VERSION}.npz"
+        )
+        if use_disk_cache and os.path.exists(path):
+            try:
+                index = GridIndex.load(path)
+                os.utime(path)  # Mark as recently used for eviction
+                return index
+            except (OSError, ValueError, KeyError):
+                pass  # Unreadable or outdated file: rebuild below
+
+        df_clean = clean_coordinates(df, lat_col, lng_col, bounds)
+        index = GridIndex(
+            df_clean[lat_col].to_numpy(dtype=np.float64),
+            df_clean[lng_col].to_numpy(dtype=np.float64),
+            cell_km=cell_km,
+            metric=metric
+        )
+
+        if use_disk_cache:
+            try:
+                index.save(path)
+                prune_index_cache()
+            except OSError:
+                pass  # Read-only deployment: keep the in-memory cache only
+        return index
+
+    return _INDEX_CACHE.get_or_create((fingerprint, bounds_key, cell_km, metric), build)
+
+
+def prune_index_cache(
+    directory: str | None = None,
+    max_files: int = INDEX_CACHE_MAX_FILES,
+    max_bytes: int = INDEX_CACHE_MAX_BYTES
+) -> list[str]:
+    """
+    Evict least recently used index files until the disk cache fits its bounds.
+
+    Files are ordered by modification time (get_spatial_index touches a file when
+    it loads it), so indexes of datasets no longer in use and files of older
+    INDEX_FORMAT_VERSIONs are removed first.
+
+    Parameters:
+        directory (str | None): Cache directory (default: INDEX_CACHE_DIR)
+        max_files (int): Maximum number of index files kept (default: 32)
+        max_bytes (int): Maximum total size in bytes (default: 512MB)
+
+    Returns:
+        list[str]: Paths of the removed files
+    """
+    directory = INDEX_CACHE_DIR if directory is None else directory
+    try:
+        entries = [entry for entry in os.scandir(directory) if entry.is_file() and entry.name.endswith('.npz')]
+    except FileNotFoundError:
+        return []
+
+    # Newest first; keep files while both bounds hold
+    entries.sort(key=lambda entry: entry.stat().st_mtime, reverse=True)
+    removed = []
+    kept_files, kept_bytes = 0, 0
+    for entry in entries:
+        size = entry.stat().st_size
+        if kept_files < max_files and kept_bytes + size <= max_bytes:
+            kept_files += 1
+            kept_bytes += size
+            continue
+        try:
+            os.remove(entry.path)
+            removed.append(entry.path)
+        except OSError:
+            pass  # Removed concurrently or read-only: skip
+    return removed
+
+
+class SpatioTemporalIndex:
+    """
+    Space-time index for "within radius_km and window_hours" neighbour queries.
+
+    Points are stored in GridIndex cell order (cells of radius_km) and, inside
+    each cell, sorted by time, with a composite key cell_id × span + hours.
+    The candidates of a query point in one neighbouring cell and time window
+    are then one contiguous key range, found with a single vectorized
+    searchsorted for a whole chunk of query points, so each point only
+    touches the few points that are close in both space and time.
+
+    Attributes:
+        size (int): Number of indexed points
+        positions (np.ndarray): Original position of each sorted point
+        times (np.ndarray): Point times in hours, in sorted order
+
+    Example:
+        >>> st_index = SpatioTemporalIndex(lats, lngs, hours, radius_km=0.1, window_hours=24)
+        >>> for query_idx, positions, distances, hours_apart in st_index.iter_pairs(lats, lngs, hours):
+        ...     pass
+    """
+
+    def __init__(self, lats, lngs, times_hours, radius_km: float, window_hours: float):
+        """
+        Build the index.
+
+        Parameters:
+            lats, lngs (array-like): Point coordinates in decimal degrees (no NaN)
+            times_hours (array-like): Point times in hours (any origin, no NaN)
+            radius_km (float): Spatial search radius in kilometers (also the cell size)
+            window_hours (float): Time window in hours
+        """
+        lats = np.asarray(lats, dtype=np.float64)
+        lngs = np.asarray(lngs, dtype=np.float64)
+        times = np.asarray(times_hours, dtype=np.float64)
+
+        self.radius_km = radius_km
+        self.window_hours = window_hours
+        self.size = len(lats)
+
+        # Time-sorted input + stable cell sort = time order inside every cell
+        time_order = np.argsort(times, kind='stable')
+        self.grid = GridIndex(lats[time_order], lngs[time_order], cell_km=radius_km)
+        self.positions = time_order[self.grid.positions]
+        self.times = times[self.positions]
+
+        # Offsets within a cell stay in [0, span - 1], so cell key ranges never overlap
+        self.t_origin = float(times.min()) if self.size else 0.0
+        self.t_span = float(np.ceil(times.max() - self.t_origin)) + 2.0 if self.size else 2.0
+        self.keys = self.grid.cell_ids * self.t_span + (self.times - self.t_origin)
+
+    def iter_pairs(
+        self,
+        lats,
+        lngs,
+        times_hours,
+        chunk_size: int = 5000
+    ) -> Iterator[tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]]:
+        """
+        Yield every (query point, indexed point) pair within radius_km and window_hours.
+
+        Parameters:
+            lats, lngs (array-like): Query coordinates in decimal degrees (no NaN)
+            times_hours (array-like): Query times in hours, same origin as the index
+            chunk_size (int): Number of query points per yielded batch (default: 5000)
+
+        Yields:
+            tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]: Flat arrays of equal length
+                - query_idx: Positions into the query arrays
+                - positions: Positions into the arrays the index was built from
+                - distances: Haversine distances in km
+                - hours_apart: Indexed time minus query time, in hours
+        """
+        lats = np.asarray(lats, dtype=np.float64)
+        lngs = np.asarray(lngs, dtype=np.float64)
+        times = np.asarray(times_hours, dtype=np.float64)
+        if self.size == 0 or len(lats) == 0:
+            return
+
+        grid = self.grid
+        radius_km = self.radius_km
+        window = self.window_hours
+
+        # Neighbouring cells to visit: same latitude/longitude reach bounds as GridIndex
+        dlat_deg = float(np.degrees(radius_km / EARTH_RADIUS_KM))
+        phi_max = radians(min(float(max(np.abs(lats).max(), np.abs(grid.lats).max())) + dlat_deg, 90.0))
+        ratio = sin(radius_km / (2 * EARTH_RADIUS_KM)) / max(cos(phi_max), 1e-12)
+        dlng_deg = 180.0 if ratio >= 1.0 else float(np.degrees(2 * asin(ratio)))
+        reach_y = int(np.ceil(dlat_deg / grid.cell_lat_deg - 1e-9))
+        reach_x = int(np.ceil(dlng_deg / grid.cell_lng_deg - 1e-9))
+        dy, dx = np.meshgrid(
+            np.arange(-reach_y, reach_y + 1), np.arange(-reach_x, reach_x + 1), indexing='ij'
+        )
+        dy, dx = dy.ravel(), dx.ravel()
+
+        # Small slack on key bounds; pairs are filtered exactly below
+        slack = 1e-6 * self.t_span
+
+        for start in range(0, len(lats), chunk_size):
+            q_lats = lats[start:start + chunk_size]
+            q_lngs = lngs[start:start + chunk_size]
+            q_times = times[start:start + chunk_size]
+
+            cell_y, cell_x = grid._cell_coords(q_lats, q_lngs)
+            ny = cell_y[:, None] + dy[None, :]
+            nx = cell_x[:, None] + dx[None, :]
+            inside = (ny >= 0) & (ny < grid.n_rows) & (nx >= 0) & (nx < grid.n_cols)
+            cell_base = (ny * grid.n_cols + nx) * self.t_span
+
+            t_low = np.clip(q_times - window - self.t_origin, 0.0, self.t_span - 2.0)[:, None]
+            t_high = np.clip(q_times + window - self.t_origin, 0.0, self.t_span - 2.0)[:, None]
+            lo = np.searchsorted(self.keys, cell_base + t_low - slack, side='left')
+            hi = np.searchsorted(self.keys, cell_base + t_high + slack, side='right')
+            hi = np.where(inside, hi, lo)
+
+            candidates = _ranges_to_indices(lo.ravel(), hi.ravel())
+            if len(candidates) == 0:
+                continue
+            query_idx = np.repeat(
+                np.repeat(np.arange(len(q_lats)), len(dy)), (hi - lo).ravel()
+            )
+
+            distances = haversine_pairs(
+                q_lats[query_idx], q_lngs[query_idx], grid.lats[candidates], grid.lngs[candidates]
+            )
+            hours_apart = self.times[candidates] - q_times[query_idx]
+            keep = (distances <= radius_km) & (np.abs(hours_apart) <= window)
+
+            yield (
+                query_idx[keep] + start,
+                self.positions[candidates[keep]],
+                distances[keep],
+                hours_apart[keep]
+            )
+
+
+# ============================================================================
+# Process-pool backend for proximity queries
+# ============================================================================
+
+# Per-worker state, set once by _init_proximity_worker
+_worker_shm: shared_memory.SharedMemory | None = None
+_worker_index: GridIndex | None = None
+
+
+def resolve_n_jobs(n_jobs: int | None) -> int:
+    """
+    Normalize a worker count: None or values < 1 mean "all CPU cores".
+
+    Parameters:
+        n_jobs (int | None): Requested number of worker processes
+
+    Returns:
+        int: Number of worker processes to use (>= 1)
+    """
+    cpu_count = os.cpu_count() or 1
+    if n_jobs is None or n_jobs < 1:
+        return cpu_count
+    return min(n_jobs, cpu_count)
+
+
+def _share_index(index: GridIndex) -> tuple[shared_memory.SharedMemory, dict, dict]:
+    """
+    Copy the index arrays into one shared memory block.
+
+    Returns:
+        tuple: (shared memory block, index metadata, {field: (dtype, offset)} layout)
+    """
+    meta, arrays = index.to_state()
+    nbytes = sum(arr.nbytes for arr in arrays.values())
+    shm = shared_memory.SharedMemory(create=True, size=max(nbytes, 1))
+
+    layout = {}
+    offset = 0
+    for name, arr in arrays.items():
+        view = np.ndarray(arr.shape, dtype=arr.dtype, buffer=shm.buf, offset=offset)
+        view[:] = arr
+        layout[name] = (arr.dtype.str, offset)
+        offset += arr.nbytes
+
+    return shm, meta, layout
+
+
+def _init_proximity_worker(shm_name: str, meta: dict, layout: dict) -> None:
+    """Attach to the shared index arrays once per worker process."""
+    global _worker_shm, _worker_index
+    _worker_shm = shared_memory.SharedMemory(name=shm_name)
+    arrays = {
+        name: np.ndarray((meta['size'],), dtype=dtype, buffer=_worker_shm.buf, offset=offset)
+        for name, (dtype, offset) in layout.items()
+    }
+    _worker_index = GridIndex.from_state(meta, arrays)
+
+
+def _proximity_worker_task(
+    chunk_id: int,
+    lats: np.ndarray,
+    lngs: np.ndarray,
+    thresholds: list[float]
+) -> tuple[int, np.ndarray]:
+    """Count shared-index points within each threshold for one chunk of base points."""
+    return chunk_id, _worker_index.query_radius_counts(lats, lngs, thresholds)
+
+
+def _parallel_radius_counts(
+    index: GridIndex,
+    lats: np.ndarray,
+    lngs: np.ndarray,
+    chunks: list[np.ndarray],
+    thresholds: list[float],
+    n_workers: int,
+    on_chunk_done: Callable[[int, np.ndarray], None]
+) -> None:
+    """
+    Shard base-point chunks across a process pool.
+
+    The target index is placed in shared memory once; each task only ships its
+    own chunk of base coordinates, never the target table.
+    """
+    shm, meta, layout = _share_index(index)
+    try:
+        # forkserver, not fork: forking the multi-threaded Streamlit server (cache
+        # locks, BLAS threads) can deadlock workers; the index arrives via shared memory
+        with ProcessPoolExecutor(
+            max_workers=n_workers,
+            mp_context=multiprocessing.get_context('forkserver'),
+            initializer=_init_proximity_worker,
+            initargs=(shm.name, meta, layout)
+        ) as pool:
+            futures = [
+                pool.submit(_proximity_worker_task, i, lats[chunk], lngs[chunk], thresholds)
+                for i, chunk in enumerate(chunks)
+            ]
+            for future in as_completed(futures):
+                chunk_id, chunk_counts = future.result()
+                on_chunk_done(chunk_id, chunk_counts)
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+def compute_proximity_stats(
+    df_base: pd.DataFrame,
+    base_lat_col: str,
+    base_lng_col: str,
+    df_target: pd.DataFrame,
+    target_lat_col: str,
+    target_lng_col: str,
+    thresholds: list[float] | None = None,
+    sample_size: int | None = None,
+    chunk_size: int = 5000,
+    progress_callback: Callable[[int, int], None] | None = None,
+    n_jobs: int | None = 1,
+    distance_mode: str = 'haversine',
+    bounds: dict | None = None
+) -> pd.DataFrame:
+    """
+    Calculate proximity statistics between two datasets.
+
+    This function implements a spatial proximity analysis that counts how many
+    target points are within specified distance thresholds of each base point.
+
+    Algorithm Overview:
+    1. Get the (cached) GridIndex of the target dataset
+    2. Split the base points into spatially ordered chunks of chunk_size rows
+    3. For each chunk, gather target points in nearby grid cells only and
+       calculate exact Haversine distances for those candidate pairs
+    4. Bin each distance by the smallest threshold containing it and accumulate
+       per-point histograms, so any number of thresholds costs a single pass
+
+    Complexity: O(n × k) where n = base points, k = target points near each base point
+    Memory: bounded per chunk (chunk_size rows, MAX_BLOCK_PAIRS distances per block),
+    so the full base dataset is processed exactly without sampling
+
+    Use Cases:
+    - How many CCTVs are within 500m of each accident location?
+    - What is the average number of security lights near parking lots?
+    - Identify areas with high/low facility density
+
+    Parameters:
+        df_base (pd.DataFrame): Base dataset (e.g., train data)
+        base_lat_col, base_lng_col (str): Coordinate column names in df_base
+        df_target (pd.DataFrame): Target dataset (e.g., CCTV data)
+        target_lat_col, target_lng_col (str): Coordinate column names in df_target
+        thresholds (list[float] | None): Distance thresholds in kilometers (default: [0.5, 1.0, 2.0])
+        sample_size (int | None): Opt-in spatially stratified sample of base rows
+            (spatial_sample) for a quick preview; it covers sparse areas better than a
+            random sample but over-represents them in averages (default: None = use every base row)
+        chunk_size (int): Number of base points processed per chunk (default: 5000)
+        progress_callback (Callable[[int, int], None] | None): Called after each chunk
+            with (processed_points, total_points)
+        n_jobs (int | None): Number of worker processes (default: 1 = in-process).
+            Values > 1 shard the base chunks across a process pool that reads the
+            target index from shared memory; None or < 1 uses every CPU core.
+        distance_mode (str): 'haversine' (exact, default) or 'equirectangular'
+            (local projection, faster, <= 0.29% distance error inside Daegu)
+        bounds (dict | None): Coordinate bounds of valid base/target rows
+            (default: KOREA_BOUNDS, so nationwide datasets keep every point in Korea;
+            pass DAEGU_BOUNDS to restrict the analysis to Daegu)
+
+    Returns:
+        pd.DataFrame: Proximity counts
+            - Rows: Each base point with valid coordinates (index aligned to df_base)
+            - Columns: One column per threshold with count of target points within that distance
+
+    Example:
+        >>> proximity_df = compute_proximity_stats(
+        ...     train_df, 'lat', 'lng',
+        ...     cctv_df, 'latitude', 'longitude',
+        ...     thresholds=[0.5, 1.0, 2.0],
+        ...     progress_callback=lambda done, total: print(f"{done}/{total}")
+        ... )
+        >>> proximity_df['0.5'].mean()  # Average CCTVs within 500m
+        3.2
+    """
+    # Default thresholds: 500m, 1km, 2km - common distances for urban analysis
+    if thresholds is None:
+        thresholds = [0.5, 1.0, 2.0]
+
+    if bounds is None:
+        bounds = KOREA_BOUNDS
+
+    # Sampling is an explicit opt-in (quick preview), never a hidden default;
+    # the sample is spread over space (cached per dataset and size)
+    if sample_size is not None and len(df_base) > sample_size:
+        df_base = spatial_sample(df_base, base_lat_col, base_lng_col, sample_size, bounds=bounds)
+
+    # Data cleaning: skip rows with missing, (0, 0), swapped or out-of-bounds
+    # coordinates (cached validity mask, shared with the target index)
+    df_base_clean = clean_coordinates(df_base, base_lat_col, base_lng_col, bounds)
+
+    # Spatial index over target points (cached per dataset content): each base
+    # point is only compared against targets in cells within the largest threshold
+    index = get_spatial_index(df_target, target_lat_col, target_lng_col, metric=distance_mode, bounds=bounds)
+
+    base_lats = df_base_clean[base_lat_col].to_numpy(dtype=np.float64)
+    base_lngs = df_base_clean[base_lng_col].to_numpy(dtype=np.float64)
+    total = len(base_lats)
+    counts = np.zeros((total, len(thresholds)), dtype=np.int64)
+
+    # Chunked execution over spatially ordered base points
+    order = index.spatial_order(base_lats, base_lngs)
+    chunks = [order[start:start + chunk_size] for start in range(0, total, chunk_size)]
+    processed = 0
+
+    def store_chunk(chunk_id: int, chunk_counts: np.ndarray):
+        nonlocal processed
+        counts[chunks[chunk_id]] = chunk_counts
+        processed += len(chunks[chunk_id])
+        if progress_callback is not None:
+            progress_callback(processed, total)
+
+    n_workers = resolve_n_jobs(n_jobs)
+    if n_workers > 1 and len(chunks) > 1 and index.size > 0:
+        _parallel_radius_counts(
+            index, base_lats, base_lngs, chunks, thresholds,
+            min(n_workers, len(chunks)), store_chunk
+        )
+    else:
+        for chunk_id, chunk in enumerate(chunks):
+            store_chunk(chunk_id, index.query_radius_counts(base_lats[chunk], base_lngs[chunk], thresholds))
+
+    # Convert to DataFrame for easy analysis (string keys for column names)
+    return pd.DataFrame(
+        {str(t): counts[:, j] for j, t in enumerate(thresholds)},
+        index=df_base_clean.index
+    )
+
+
+def compute_weighted_proximity_stats(
+    df_base: pd.DataFrame,
+    base_lat_col: str,
+    base_lng_col: str,
+    df_target: pd.DataFrame,
+    target_lat_col: str,
+    target_lng_col: str,
+    value_col: str | None = None,
+    thresholds: list[float] | None = None,
+    agg: str = 'sum',
+    kernel: str = 'uniform',
+    bandwidth_km: float | None = None,
+    sample_size: int | None = None,
+    chunk_size: int = 5000,
+    progress_callback: Callable[[int, int], None] | None = None,
+    distance_mode: str = 'haversine',
+    bounds: dict | None = None
+) -> pd.DataFrame:
+    """
+    Sum or average a numeric column of the target dataset within each distance threshold.
+
+    Extends compute_proximity_stats from "how many" to "how much": e.g., the
+    number of cameras (not CCTV sites) or the parking capacity within 500m of
+    each accident. Runs on the same cached GridIndex and neighbour blocks, with
+    optional distance-decay kernels so nearer facilities weigh more. To get the
+    counts as well, use compute_proximity_counts_and_weights (one pass for both).
+
+    Parameters:
+        df_base (pd.DataFrame): Base dataset (e.g., train data)
+        base_lat_col, base_lng_col (str): Coordinate column names in df_base
+        df_target (pd.DataFrame): Target dataset (e.g., CCTV data)
+        target_lat_col, target_lng_col (str): Coordinate column names in df_target
+        value_col (str | None): Numeric column of df_target to aggregate
+            (default: None = weight 1 per target point, i.e. kernel-weighted counts)
+        thresholds (list[float] | None): Distance thresholds in kilometers (default: [0.5, 1.0, 2.0])
+        agg (str): 'sum' or 'mean' (kernel-weighted mean, NaN when nothing is in range) (default: 'sum')
+        kernel (str): 'uniform', 'linear' or 'gaussian' (default: 'uniform')
+        bandwidth_km (float | None): Gaussian bandwidth (default: smallest threshold)
+        sample_size (int | None): Opt-in spatially stratified sample of base rows (spatial_sample)
+        chunk_size (int): Number of base points processed per chunk (default: 5000)
+        progress_callback (Callable[[int, int], None] | None): Called after each chunk
+            with (processed_points, total_points)
+        distance_mode (str): 'haversine' (default) or 'equirectangular'
+        bounds (dict | None): Coordinate bounds of valid rows (default: KOREA_BOUNDS)
+
+    Returns:
+        pd.DataFrame: Same layout as compute_proximity_stats (one column per
+            threshold, rows = base points with valid coordinates), holding
+            aggregated values instead of counts
+
+    Raises:
+        ValueError: If agg is not one of PROXIMITY_AGGS or kernel is not one of PROXIMITY_KERNELS
+
+    Example:
+        >>> cameras = compute_weighted_proximity_stats(
+        ...     train_df, 'lat', 'lng', cctv_df, '위도', '경도',
+        ...     value_col='카메라대수', thresholds=[0.5, 1.0], kernel='gaussian'
+        ... )
+        >>> cameras['0.5'].mean()  # Distance-weighted cameras within 500m
+    """
+    _, weighted = compute_proximity_counts_and_weights(
+        df_base, base_lat_col, base_lng_col,
+        df_target, target_lat_col, target_lng_col,
+        value_col=value_col,
+        thresholds=thresholds,
+        agg=agg,
+        kernel=kernel,
+        bandwidth_km=bandwidth_km,
+        sample_size=sample_size,
+        chunk_size=chunk_size,
+        progress_callback=progress_callback,
+        distance_mode=distance_mode,
+        bounds=bounds
+    )
+    return weighted
+
+
+def compute_proximity_counts_and_weights(
+    df_base: pd.DataFrame,
+    base_lat_col: str,
+    base_lng_col: str,
+    df_target: pd.DataFrame,
+    target_lat_col: str,
+    target_lng_col: str,
+    value_col: str | None = None,
+    thresholds: list[float] | None = None,
+    weighted_thresholds: list[float] | None = None,
+    agg: str = 'sum',
+    kernel: str = 'uniform',
+    bandwidth_km: float | None = None,
+    sample_size: int | None = None,
+    chunk_size: int = 5000,
+    progress_callback: Callable[[int, int], None] | None = None,
+    distance_mode: str = 'haversine',
+    bounds: dict | None = None
+) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Proximity counts and weighted aggregates of the same base/target pair in one pass.
+
+    Returns what compute_proximity_stats and compute_weighted_proximity_stats would,
+    but every neighbour block of the cached target index is computed once and
+    binned for both (GridIndex.query_counts_and_weighted), so adding a weighted
+    column does not double the work.
+
+    Parameters:
+        df_base, base_lat_col, base_lng_col: Base dataset and coordinate columns
+        df_target, target_lat_col, target_lng_col: Target dataset and coordinate columns
+        value_col (str | None): Numeric column of df_target to aggregate (default: None = weight 1)
+        thresholds (list[float] | None): Count thresholds in kilometers (default: [0.5, 1.0, 2.0])
+        weighted_thresholds (list[float] | None): Thresholds of the weighted aggregate
+            (default: thresholds)
+        agg, kernel, bandwidth_km: See compute_weighted_proximity_stats (the Gaussian
+            bandwidth defaults to the smallest weighted threshold)
+        sample_size, chunk_size, progress_callback, distance_mode, bounds:
+            See compute_proximity_stats (in-process only, no n_jobs)
+
+    Returns:
+        tuple[pd.DataFrame, pd.DataFrame]: (counts, weighted aggregates), both indexed
+            like the valid base rows with one column per threshold
+
+    Raises:
+        ValueError: If agg is not one of PROXIMITY_AGGS or kernel is not one of PROXIMITY_KERNELS
+
+    Example:
+        >>> counts, cameras = compute_proximity_counts_and_weights(
+        ...     train_df, 'lat', 'lng', cctv_df, '위도', '경도',
+        ...     value_col='카메라대수', thresholds=[0.5, 1.0]
+        ... )
+    """
+    if agg not in PROXIMITY_AGGS:
+        raise ValueError(f"Unknown aggregation: '{agg}'. Valid options: {', '.join(PROXIMITY_AGGS)}")
+    if kernel not in PROXIMITY_KERNELS:
+        raise ValueError(f"Unknown kernel: '{kernel}'. Valid options: {', '.join(PROXIMITY_KERNELS)}")
+
+    if thresholds is None:
+        thresholds = [0.5, 1.0, 2.0]
+    if weighted_thresholds is None:
+        weighted_thresholds = thresholds
+    if bandwidth_km is None:
+        bandwidth_km = float(min(weighted_thresholds))
+
+    if bounds is None:
+        bounds = KOREA_BOUNDS
+
+    if sample_size is not None and len(df_base) > sample_size:
+        df_base = spatial_sample(df_base, base_lat_col, base_lng_col, sample_size, bounds=bounds)
+
+    df_base_clean = clean_coordinates(df_base, base_lat_col, base_lng_col, bounds)
+    df_target_clean = clean_coordinates(df_target, target_lat_col, target_lng_col, bounds)
+
+    # Index positions refer to rows of the cleaned target frame
+    index = get_spatial_index(df_target, target_lat_col, target_lng_col, metric=distance_mode, bounds=bounds)
+    if value_col is None:
+        values = np.ones(len(df_target_clean))
+    else:
+        values = pd.to_numeric(df_target_clean[value_col], errors='coerce').to_numpy(dtype=np.float64)
+
+    # One pass over the union of both threshold lists
+    radii = sorted(set(thresholds) | set(weighted_thresholds))
+    base_lats = df_base_clean[base_lat_col].to_numpy(dtype=np.float64)
+    base_lngs = df_base_clean[base_lng_col].to_numpy(dtype=np.float64)
+    total = len(base_lats)
+    counts = np.zeros((total, len(radii)), dtype=np.int64)
+    sums = np.zeros((total, len(radii)))
+    weights = np.zeros((total, len(radii)))
+
+    order = index.spatial_order(base_lats, base_lngs)
+    for start in range(0, total, chunk_size):
+        chunk = order[start:start + chunk_size]
+        counts[chunk], sums[chunk], weights[chunk] = index.query_counts_and_weighted(
+            base_lats[chunk], base_lngs[chunk], radii, values, kernel, bandwidth_km
+        )
+        if progress_callback is not None:
+            progress_callback(min(start + chunk_size, total), total)
+
+    if agg == 'mean':
+        with np.errstate(invalid='ignore', divide='ignore'):
+            result = np.where(weights > 1e-12, sums / weights, np.nan)
+    else:
+        result = sums
+
+    column = {r: j for j, r in enumerate(radii)}
+    counts_df = pd.DataFrame(
+        {str(t): counts[:, column[t]] for t in thresholds},
+        index=df_base_clean.index
+    )
+    weighted_df = pd.DataFrame(
+        {str(t): result[:, column[t]] for t in weighted_thresholds},
+        index=df_base_clean.index
+    )
+    return counts_df, weighted_df
+
+
+def select_viewport_points(
+    df: pd.DataFrame,
+    lat_col: str,
+    lng_col: str,
+    bounds: tuple[float, float, float, float],
+    max_points: int = 5000
+) -> tuple[pd.DataFrame, int]:
+    """
+    Return the rows of df inside a map viewport, at most max_points of them.
+
+    Backed by the cached GridIndex of the dataset, so each pan or zoom costs a
+    few slices of the sorted index instead of a scan. When more than max_points
+    rows are visible, a stratified spatial sample of them is returned (the same
+    viewport always yields the same rows), so the payload stays constant and zooming in reveals
+    every point once the view holds fewer than max_points.
+
+    Parameters:
+        df (pd.DataFrame): Dataset with coordinates
+        lat_col, lng_col (str): Coordinate column names
+        bounds (tuple[float, float, float, float]): (south, west, north, east) in decimal degrees
+        max_points (int): Maximum number of rows returned (default: 5000)
+
+    Returns:
+        tuple[pd.DataFrame, int]:
+            - Visible rows with valid coordinates (coordinates as float)
+            - Number of visible rows before the max_points cap
+
+    Example:
+        >>> visible, total = select_viewport_points(lights_df, '위도', '경도', (35.86, 128.58, 35.88, 128.61))
+    """
+    df_clean = clean_coordinates(df, lat_col, lng_col)
+    index = get_spatial_index(df, lat_col, lng_col)
+    positions = index.query_bbox(*bounds)
+
+    total = len(positions)
+    if total > max_points:
+        positions = positions[stratified_spatial_sample(
+            df_clean[lat_col].to_numpy()[positions], df_clean[lng_col].to_numpy()[positions], max_points
+        )]
+
+    return df_clean.iloc[positions], total
+
+
+def spatial_join_radius(
+    df_base: pd.DataFrame,
+    base_lat_col: str,
+    base_lng_col: str,
+    df_zones: pd.DataFrame,
+    zone_lat_col: str,
+    zone_lng_col: str,
+    radius_km: float = 0.3,
+    zone_id_col: str | None = None,
+    distance_mode: str = 'haversine'
+) -> pd.DataFrame:
+    """
+    Tag every base row with the zone (e.g., child protection zone) it falls in.
+
+    A zone is a point with a radius of influence; a base point falls in the
+    nearest zone within radius_km. Backed by the cached GridIndex of the zones,
+    so the full accident dataset is joined in one pass, and the join result is
+    cached per (base, zones, radius, id column, distance mode).
+
+    Parameters:
+        df_base (pd.DataFrame): Base dataset (e.g., accidents, train)
+        base_lat_col, base_lng_col (str): Coordinate column names in df_base
+        df_zones (pd.DataFrame): Zone dataset (e.g., 어린이 보호구역)
+        zone_lat_col, zone_lng_col (str): Coordinate column names in df_zones
+        radius_km (float): Zone radius in kilometers (default: 0.3)
+        zone_id_col (str | None): df_zones column used as zone id (default: None = index label)
+        distance_mode (str): 'haversine' (default) or 'equirectangular'
+
+    Returns:
+        pd.DataFrame: Indexed exactly like df_base, with columns
+            - zone_id: Id of the nearest zone within radius_km (NaN if none)
+            - zone_distance_km: Distance in km to that zone (NaN if none)
+            - in_zone: True if the row falls in any zone
+
+    Example:
+        >>> joined = spatial_join_radius(accident_df, 'lat', 'lng', zone_df, '위도', '경도', radius_km=0.3)
+        >>> joined['in_zone'].mean()  # Share of accidents inside a protection zone
+        0.042
+    """
+    key = (
+        dataset_fingerprint(df_base, [base_lat_col, base_lng_col]),
+        dataset_fingerprint(df_zones, [zone_lat_col, zone_lng_col] + ([zone_id_col] if zone_id_col else [])),
+        float(radius_km),
+        zone_id_col,
+        distance_mode
+    )
+
+    def join() -> pd.DataFrame:
+        df_base_clean = clean_coordinates(df_base, base_lat_col, base_lng_col)
+        df_zones_clean = clean_coordinates(df_zones, zone_lat_col, zone_lng_col)
+        index = get_spatial_index(df_zones, zone_lat_col, zone_lng_col, metric=distance_mode)
+
+        distances, positions = index.query_nearest_within(
+            df_base_clean[base_lat_col].to_numpy(dtype=np.float64),
+            df_base_clean[base_lng_col].to_numpy(dtype=np.float64),
+            radius_km
+        )
+
+        found = positions >= 0
+        zone_ids = df_zones_clean[zone_id_col] if zone_id_col else df_zones_clean.index.to_series()
+        zone_ids = zone_ids.iloc[positions[found]].to_numpy()
+
+        joined = pd.DataFrame(
+            {'zone_id': pd.Series(pd.NA, index=df_base_clean.index, dtype=object), 'zone_distance_km': np.nan},
+            index=df_base_clean.index
+        )
+        joined.loc[found, 'zone_id'] = zone_ids
+        joined.loc[found, 'zone_distance_km'] = distances[found]
+        joined = joined.reindex(df_base.index)
+        joined['in_zone'] = joined['zone_distance_km'].notna()
+        return joined
+
+    return _JOIN_CACHE.get_or_create(key, join).copy()
+
+
+def compute_coverage_gaps(
+    df_events: pd.DataFrame,
+    event_lat_col: str,
+    event_lng_col: str,
+    df_facilities: pd.DataFrame,
+    facility_lat_col: str,
+    facility_lng_col: str,
+    radius_km: float = 0.5,
+    cell_km: float = 0.25,
+    min_events: int = 1,
+    include_covered: bool = False,
+    distance_mode: str = 'haversine'
+) -> pd.DataFrame:
+    """
+    Find grid cells with events (e.g., accidents) but no facility (e.g., CCTV) within radius_km.
+
+    The city is gridded into cell_km squares of the local projection (the same
+    grid as utils.binning square cells), events are counted per cell, and the
+    nearest-facility distance is computed once per cell centre. Work scales with
+    the number of occupied cells, not with event × facility pairs.
+
+    Parameters:
+        df_events (pd.DataFrame): Event dataset (e.g., accidents)
+        event_lat_col, event_lng_col (str): Coordinate column names in df_events
+        df_facilities (pd.DataFrame): Facility dataset (e.g., CCTV)
+        facility_lat_col, facility_lng_col (str): Coordinate column names in df_facilities
+        radius_km (float): Coverage radius of a facility in kilometers (default: 0.5)
+        cell_km (float): Grid cell size in kilometers (default: 0.25)
+        min_events (int): Minimum events for a cell to be reported (default: 1)
+        include_covered (bool): Also return covered cells (default: False = gap cells only)
+        distance_mode (str): 'haversine' (default) or 'equirectangular'
+
+    Returns:
+        pd.DataFrame: One row per cell, ranked by event_count then nearest distance
+            (descending), with columns
+            - cell_x, cell_y: Cell coordinates
+            - center_lat, center_lng: Cell centre in decimal degrees
+            - event_count: Number of events in the cell
+            - nearest_facility_km: Distance from the centre to the nearest facility (NaN if none)
+            - is_gap: True if no facility lies within radius_km of the centre
+
+    Example:
+        >>> gaps = compute_coverage_gaps(accident_df, 'lat', 'lng', cctv_df, '위도', '경도', radius_km=0.3)
+        >>> gaps.head(10)  # Ten cells with the most accidents and no CCTV within 300m
+    """
+    df_events_clean = clean_coordinates(df_events, event_lat_col, event_lng_col)
+    x, y = project_to_local_xy(
+        df_events_clean[event_lat_col].to_numpy(dtype=np.float64),
+        df_events_clean[event_lng_col].to_numpy(dtype=np.float64)
+    )
+
+    cells = (
+        pd.DataFrame({
+            'cell_x': np.floor(x / cell_km).astype(np.int64),
+            'cell_y': np.floor(y / cell_km).astype(np.int64)
+        })
+        .groupby(['cell_x', 'cell_y'], sort=False)
+        .size()
+        .rename('event_count')
+        .reset_index()
+    )
+    cells = cells[cells['event_count'] >= min_events].reset_index(drop=True)
+
+    center_lats, center_lngs = unproject_local_xy(
+        (cells['cell_x'].to_numpy() + 0.5) * cell_km,
+        (cells['cell_y'].to_numpy() + 0.5) * cell_km
+    )
+    cells.insert(2, 'center_lat', center_lats)
+    cells.insert(3, 'center_lng', center_lngs)
+
+    # One nearest-facility query per occupied cell centre
+    index = get_spatial_index(df_facilities, facility_lat_col, facility_lng_col, metric=distance_mode)
+    nearest = index.query_knn(center_lats, center_lngs, k=1)[0][:, 0]
+    cells['nearest_facility_km'] = np.where(np.isfinite(nearest), nearest, np.nan)
+    cells['is_gap'] = ~(nearest <= radius_km)
+
+    if not include_covered:
+        cells = cells[cells['is_gap']]
+
+    return cells.sort_values(
+        ['event_count', 'nearest_facility_km'], ascending=False, kind='stable', na_position='first'
+    ).reset_index(drop=True)
+
+
+def find_spatiotemporal_neighbors(
+    df: pd.DataFrame,
+    lat_col: str,
+    lng_col: str,
+    time_col: str,
+    radius_km: float = 0.1,
+    window_hours: float = 24.0,
+    return_pairs: bool = False,
+    chunk_size: int = 5000
+) -> pd.DataFrame:
+    """
+    Find incidents repeated at the same spot within a time window (e.g., 100m and 24h).
+
+    Parameters:
+        df (pd.DataFrame): Dataset with coordinates and a timestamp (e.g., train, accidents)
+        lat_col, lng_col (str): Coordinate column names
+        time_col (str): Timestamp column (parsed with pd.to_datetime; unparseable rows are skipped)
+        radius_km (float): Spatial radius in kilometers (default: 0.1)
+        window_hours (float): Time window in hours (default: 24)
+        return_pairs (bool): Return the neighbour pairs instead of per-row counts (default: False)
+        chunk_size (int): Number of rows queried per batch (default: 5000)
+
+    Returns:
+        pd.DataFrame:
+            - If return_pairs is False: indexed like df, with column st_neighbors = number
+              of other rows within radius_km and window_hours (NaN for rows without valid
+              coordinates or timestamp)
+            - If return_pairs is True: one row per unordered pair, with columns
+              idx_a, idx_b (df index labels, idx_a earlier in df), distance_km, hours_apart (>= 0)
+
+    Example:
+        >>> counts = find_spatiotemporal_neighbors(train_df, 'lat', 'lng', '사고일시', 0.1, 24)
+        >>> (counts['st_neighbors'] > 0).mean()  # Share of accidents with a repeat nearby within a day
+    """
+    df_clean = clean_coordinates(df, lat_col, lng_col)
+    timestamps = pd.to_datetime(df_clean[time_col], errors='coerce')
+    df_clean = df_clean[timestamps.notna()]
+    timestamps = timestamps[timestamps.notna()]
+
+    lats = df_clean[lat_col].to_numpy(dtype=np.float64)
+    lngs = df_clean[lng_col].to_numpy(dtype=np.float64)
+    # Hours since the first timestamp (float64 keeps sub-second precision over decades)
+    hours = np.zeros(0)
+    if len(timestamps) > 0:
+        hours = (timestamps - timestamps.min()).dt.total_seconds().to_numpy() / 3600.0
+
+    st_index = SpatioTemporalIndex(lats, lngs, hours, radius_km, window_hours)
+    counts = np.zeros(len(lats), dtype=np.int64)
+    pair_parts = []
+
+    for query_idx, positions, distances, hours_apart in st_index.iter_pairs(lats, lngs, hours, chunk_size):
+        others = positions != query_idx
+        counts += np.bincount(query_idx[others], minlength=len(lats))
+        if return_pairs:
+            forward = positions > query_idx
+            pair_parts.append((
+                query_idx[forward], positions[forward], distances[forward], np.abs(hours_apart[forward])
+            ))
+
+    if not return_pairs:
+        return pd.DataFrame({'st_neighbors': counts}, index=df_clean.index).reindex(df.index)
+
+    labels = df_clean.index.to_numpy()
+    if pair_parts:
+        a, b, distances, hours_apart = (np.concatenate(part) for part in zip(*pair_parts))
+    else:
+        a = b = np.zeros(0, dtype=np.int64)
+        distances = hours_apart = np.zeros(0)
+    order = np.lexsort((b, a))
+    return pd.DataFrame({
+        'idx_a': labels[a[order]],
+        'idx_b': labels[b[order]],
+        'distance_km': distances[order],
+        'hours_apart': hours_apart[order]
+    })
+
+
+def compute_nearest_neighbors(
+    df_base: pd.DataFrame,
+    base_lat_col: str,
+    base_lng_col: str,
+    df_target: pd.DataFrame,
+    target_lat_col: str,
+    target_lng_col: str,
+    k: int = 1,
+    chunk_size: int = 5000,
+    distance_mode: str = 'haversine'
+) -> pd.DataFrame:
+    """
+    Find the k nearest target points (e.g., facilities) of every base point.
+
+    Answers "how far is the nearest CCTV / light / child zone / parking lot
+    from each accident?" for the whole base dataset in one vectorized call,
+    backed by the cached GridIndex of the target dataset.
+
+    Parameters:
+        df_base (pd.DataFrame): Base dataset (e.g., train/test accidents)
+        base_lat_col, base_lng_col (str): Coordinate column names in df_base
+        df_target (pd.DataFrame): Target dataset (e.g., CCTV data)
+        target_lat_col, target_lng_col (str): Coordinate column names in df_target
+        k (int): Number of nearest neighbours (default: 1)
+        chunk_size (int): Number of base points processed per chunk (default: 5000)
+        distance_mode (str): 'haversine' (default) or 'equirectangular'
+
+    Returns:
+        pd.DataFrame: Indexed like df_base, with for each j in 1..k:
+            - nearest_km_{j}: Distance in km to the j-th nearest target point
+            - nearest_idx_{j}: df_target index label of that point
+            Rows with invalid base coordinates (or fewer than k targets) are NaN.
+
+    Example:
+        >>> nn = compute_nearest_neighbors(train_df, 'lat', 'lng', cctv_df, '위도', '경도', k=3)
+        >>> nn['nearest_km_1'].median()  # Median distance to the closest CCTV
+        0.21
+    """
+    df_base_clean = clean_coordinates(df_base, base_lat_col, base_lng_col)
+    df_target_clean = clean_coordinates(df_target, target_lat_col, target_lng_col)
+
+    index = get_spatial_index(df_target, target_lat_col, target_lng_col, metric=distance_mode)
+
+    base_lats = df_base_clean[base_lat_col].to_numpy(dtype=np.float64)
+    base_lngs = df_base_clean[base_lng_col].to_numpy(dtype=np.float64)
+    distances = np.full((len(base_lats), k), np.inf)
+    positions = np.full((len(base_lats), k), -1, dtype=np.int64)
+
+    # Spatially ordered chunks keep memory bounded and candidate slices local
+    order = index.spatial_order(base_lats, base_lngs)
+    for start in range(0, len(order), chunk_size):
+        chunk = order[start:start + chunk_size]
+        distances[chunk], positions[chunk] = index.query_knn(base_lats[chunk], base_lngs[chunk], k)
+
+    target_labels = df_target_clean.index.to_numpy()
+    result = {}
+    for j in range(k):
+        found = positions[:, j] >= 0
+        result[f'nearest_km_{j + 1}'] = np.where(found, distances[:, j], np.nan)
+        result[f'nearest_idx_{j + 1}'] = pd.Series(
+            target_labels[np.where(found, positions[:, j], 0)] if len(target_labels) else np.full(len(found), np.nan),
+            index=df_base_clean.index
+        ).where(found)
+
+    return pd.DataFrame(result, index=df_base_clean.index).reindex(df_base.index)
+
+
+def build_proximity_features(
+    df_base: pd.DataFrame,
+    base_lat_col: str,
+    base_lng_col: str,
+    targets: dict[str, dict],
+    thresholds: list[float] | None = None,
+    include_nearest: bool = True,
+    chunk_size: int = 5000,
+    progress_callback: Callable[[int, int], None] | None = None,
+    distance_mode: str = 'haversine'
+) -> pd.DataFrame:
+    """
+    Build a wide proximity feature matrix of one base table against many facility datasets.
+
+    Replaces running compute_proximity_stats once per facility and threshold set:
+    base coordinates are cleaned, ordered and chunked once, each target uses its
+    cached GridIndex, and counts for every threshold plus the nearest distance
+    come out of a single neighbour pass per target.
+
+    Parameters:
+        df_base (pd.DataFrame): Base dataset (e.g., train or test)
+        base_lat_col, base_lng_col (str): Coordinate column names in df_base
+        targets (dict[str, dict]): Facility datasets keyed by feature prefix, each with
+            - df (pd.DataFrame): Facility dataset
+            - lat_col, lng_col (str): Coordinate column names
+        thresholds (list[float] | None): Distance thresholds in kilometers (default: [0.5, 1.0, 2.0])
+        include_nearest (bool): Add a nearest-distance column per target (default: True)
+        chunk_size (int): Number of base points processed per chunk (default: 5000)
+        progress_callback (Callable[[int, int], None] | None): Called after each
+            (chunk, target) step with (completed_steps, total_steps)
+        distance_mode (str): 'haversine' (default) or 'equirectangular'
+
+    Returns:
+        pd.DataFrame: Indexed exactly like df_base (no resampling), with columns
+            - {name}_cnt_{t}: Number of facilities within t km
+            - {name}_nearest_km: Distance in km to the nearest facility
+            Rows with invalid base coordinates are NaN.
+
+    Example:
+        >>> features = build_proximity_features(
+        ...     train_df, 'lat', 'lng',
+        ...     {
+        ...         'cctv': {'df': cctv_df, 'lat_col': '위도', 'lng_col': '경도'},
+        ...         'lights': {'df': lights_df, 'lat_col': '위도', 'lng_col': '경도'},
+        ...     },
+        ...     thresholds=[0.3, 0.5, 1.0]
+        ... )
+        >>> train_with_features = train_df.join(features)
+    """
+    if thresholds is None:
+        thresholds = [0.5, 1.0, 2.0]
+    thresholds = sorted(thresholds)
+
+    df_base_clean = clean_coordinates(df_base, base_lat_col, base_lng_col)
+    base_lats = df_base_clean[base_lat_col].to_numpy(dtype=np.float64)
+    base_lngs = df_base_clean[base_lng_col].to_numpy(dtype=np.float64)
+    total = len(base_lats)
+
+    indexes = {
+        name: get_spatial_index(spec['df'], spec['lat_col'], spec['lng_col'], metric=distance_mode)
+        for name, spec in targets.items()
+    }
+    counts = {name: np.zeros((total, len(thresholds)), dtype=np.int64) for name in targets}
+    nearest = {name: np.full(total, np.inf) for name in targets}
+
+    # One shared spatial ordering of base points keeps every target's chunks local
+    first_index = next(iter(indexes.values()), None)
+    order = first_index.spatial_order(base_lats, base_lngs) if first_index is not None else np.arange(total)
+    chunks = [order[start:start + chunk_size] for start in range(0, total, chunk_size)]
+
+    total_steps = len(chunks) * len(indexes)
+    step = 0
+    for chunk in chunks:
+        chunk_lats = base_lats[chunk]
+        chunk_lngs = base_lngs[chunk]
+        for name, index in indexes.items():
+            if include_nearest:
+                counts[name][chunk], nearest[name][chunk] = index.query_counts_and_nearest(
+                    chunk_lats, chunk_lngs, thresholds
+                )
+            else:
+                counts[name][chunk] = index.query_radius_counts(chunk_lats, chunk_lngs, thresholds)
+
+            step += 1
+            if progress_callback is not None:
+                progress_callback(step, total_steps)
+
+    features = {}
+    for name in targets:
+        for j, t in enumerate(thresholds):
+            features[f'{name}_cnt_{t}'] = counts[name][:, j]
+        if include_nearest:
+            features[f'{name}_nearest_km'] = np.where(np.isfinite(nearest[name]), nearest[name], np.nan)
+
+    return pd.DataFrame(features, index=df_base_clean.index).reindex(df_base.index)
+
+
+def proximity_curve_radii(max_radius_km: float = 2.0, step_km: float = 0.1) -> list[float]:
+    """
+    Evenly spaced radii (step_km, 2×step_km, ..., max_radius_km) for a count-vs-radius curve.
+
+    Radii are rounded to 6 decimals so they make clean column names.
+
+    Parameters:
+        max_radius_km (float): Largest radius in kilometers (default: 2.0)
+        step_km (float): Spacing between radii in kilometers (default: 0.1)
+
+    Returns:
+        list[float]: Ascending radii
+    """
+    n_steps = max(1, int(round(max_radius_km / step_km)))
+    return [round(step_km * i, 6) for i in range(1, n_steps + 1)]
+
+
+def compute_proximity_curve(
+    df_base: pd.DataFrame,
+    base_lat_col: str,
+    base_lng_col: str,
+    df_target: pd.DataFrame,
+    target_lat_col: str,
+    target_lng_col: str,
+    max_radius_km: float = 2.0,
+    step_km: float = 0.1,
+    **kwargs
+) -> pd.DataFrame:
+    """
+    Cumulative count-vs-distance curve of target points around every base point.
+
+    All radii are answered in the same neighbour pass as a single threshold
+    (distances are binned, not compared per threshold), so a 20-point curve
+    costs about as much as compute_proximity_stats with one threshold.
+
+    Parameters:
+        df_base, base_lat_col, base_lng_col: Base dataset and coordinate columns
+        df_target, target_lat_col, target_lng_col: Target dataset and coordinate columns
+        max_radius_km (float): Largest radius of the curve (default: 2.0)
+        step_km (float): Radius spacing (default: 0.1)
+        **kwargs: Passed to compute_proximity_stats (sample_size, chunk_size,
+            progress_callback, n_jobs, distance_mode, bounds)
+
+    Returns:
+        pd.DataFrame: Same layout as compute_proximity_stats, one column per radius
+            (e.g., '0.1', '0.2', ..., '2.0')
+
+    Example:
+        >>> curve = compute_proximity_curve(train_df, 'lat', 'lng', cctv_df, '위도', '경도')
+        >>> curve.mean()  # Average number of CCTVs within each radius
+    """
+    return compute_proximity_stats(
+        df_base, base_lat_col, base_lng_col,
+        df_target, target_lat_col, target_lng_col,
+        thresholds=proximity_curve_radii(max_radius_km, step_km),
+        **kwargs
+    )
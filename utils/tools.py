@@ -1,7 +1,7 @@
 """
 Data analysis tools for Tool Calling in Claude chatbot.
 
-이 모듈은 Claude API의 Tool Use 기능을 위한 20개 데이터 분석 도구를 정의합니다.
+이 모듈은 Claude API의 Tool Use 기능을 위한 데이터 분석 도구를 정의합니다.
 각 도구는 pandas DataFrame을 분석하여 결과를 문자열로 반환합니다.
 
 v1.1.2: 5개 추가 도구
@@ -10,12 +10,33 @@ v1.1.2: 5개 추가 도구
 - detect_data_types: 컬럼별 실제 데이터 타입 추론
 - get_temporal_pattern: 시간 관련 컬럼의 패턴 분석
 - summarize_categorical_distribution: 범주형 컬럼 분포 요약
+
+공간 분석 도구
+- get_grid_density: 격자(정사각형/육각형) 셀별 포인트 밀도 분석
+- find_repeat_incidents: 같은 장소·시간 창 내 반복 발생 사건 탐지
+- get_district_summary: 주소에서 추출한 구/군·읍/면/동별 집계
+
+주소 컬럼이 있는 데이터셋에서는 모든 도구가 'gu'(구/군), 'dong'(읍/면/동)
+컬럼을 사용할 수 있습니다. 데이터셋마다 한 번만 파싱해 범주형으로 캐시합니다.
 """
 import pandas as pd
 import numpy as np
 from typing import Any
 
-from utils.geo import detect_lat_lng_columns
+from utils.geo import (
+    detect_lat_lng_columns,
+    get_coordinate_validation,
+    clean_coordinates,
+    find_spatiotemporal_neighbors
+)
+from utils.binning import aggregate_grid
+from utils.districts import (
+    DISTRICT_COLUMNS,
+    DISTRICT_LEVELS,
+    detect_address_columns,
+    aggregate_by_district,
+    with_district_columns
+)
 
 
 # ============================================================================
@@ -336,6 +357,84 @@ TOOLS = [
             },
             "required": ["column"]
         }
+    },
+    # 공간 분석 도구
+    {
+        "name": "get_grid_density",
+        "description": "위경도 좌표를 정사각형 또는 육각형 격자로 묶어 셀별 포인트 밀도를 분석합니다. 가장 밀집된 셀의 중심 좌표와 개수를 반환합니다.",
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "cell_km": {
+                    "type": "number",
+                    "description": "격자 셀 크기 (km, 기본값: 0.25)"
+                },
+                "shape": {
+                    "type": "string",
+                    "enum": ["square", "hex"],
+                    "description": "격자 모양 (기본값: square)"
+                },
+                "top_n": {
+                    "type": "integer",
+                    "description": "상위 N개 밀집 셀 표시 (기본값: 10)"
+                }
+            },
+            "required": []
+        }
+    },
+    {
+        "name": "find_repeat_incidents",
+        "description": "같은 장소(반경 r km)에서 일정 시간(t 시간) 안에 반복 발생한 사건을 찾습니다. 사고 시각 컬럼이 있는 데이터에 사용합니다.",
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "time_column": {
+                    "type": "string",
+                    "description": "발생 시각 컬럼명 (예: 사고일시)"
+                },
+                "radius_km": {
+                    "type": "number",
+                    "description": "공간 반경 (km, 기본값: 0.1)"
+                },
+                "window_hours": {
+                    "type": "number",
+                    "description": "시간 창 (시간, 기본값: 24)"
+                }
+            },
+            "required": ["time_column"]
+        }
+    },
+    {
+        "name": "get_district_summary",
+        "description": "주소 컬럼에서 추출한 구/군 또는 읍/면/동별로 행 수와 수치형 컬럼 집계를 반환합니다. 특정 구/동만 지정할 수도 있습니다.",
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "level": {
+                    "type": "string",
+                    "enum": ["gu", "dong"],
+                    "description": "집계 단위: gu(구/군) 또는 dong(읍/면/동) (기본값: gu)"
+                },
+                "district": {
+                    "type": "string",
+                    "description": "특정 구/군 이름 (예: 수성구). 지정하면 해당 구의 읍/면/동별로 집계"
+                },
+                "value_column": {
+                    "type": "string",
+                    "description": "집계할 수치형 컬럼명 (선택)"
+                },
+                "operation": {
+                    "type": "string",
+                    "enum": ["sum", "mean", "median", "min", "max"],
+                    "description": "집계 연산 (기본값: sum)"
+                },
+                "top_n": {
+                    "type": "integer",
+                    "description": "상위 N개만 표시 (기본값: 20)"
+                }
+            },
+            "required": []
+        }
     }
 ]
 
@@ -859,8 +958,11 @@ def get_geo_bounds(df: pd.DataFrame, **kwargs) -> str:
     if not lat_col or not lng_col:
         return "위경도 컬럼을 찾을 수 없습니다."
 
-    lat_data = df[lat_col].dropna()
-    lng_data = df[lng_col].dropna()
+    # 누락/(0,0)/위경도 뒤바뀜/범위 밖 좌표는 제외 (데이터셋별 캐시된 검증 결과 사용)
+    _, report = get_coordinate_validation(df, lat_col, lng_col)
+    df_valid = clean_coordinates(df, lat_col, lng_col)
+    lat_data = df_valid[lat_col]
+    lng_data = df_valid[lng_col]
 
     if len(lat_data) == 0 or len(lng_data) == 0:
         return "유효한 좌표 데이터가 없습니다."
@@ -880,7 +982,14 @@ def get_geo_bounds(df: pd.DataFrame, **kwargs) -> str:
         f"- 최대: {lng_data.max():.6f}",
         f"- 범위: {lng_data.max() - lng_data.min():.6f}",
         f"",
-        f"- 유효 좌표 수: {min(len(lat_data), len(lng_data)):,}개"
+        f"- 유효 좌표 수: {report['valid']:,}개 / 전체 {report['total']:,}개",
+        f"",
+        f"### 좌표 품질",
+        f"- 결측/숫자 아님: {report['missing']:,}개",
+        f"- (0, 0) 좌표: {report['zero']:,}개",
+        f"- 위경도 뒤바뀜 의심: {report['swapped']:,}개",
+        f"- 범위 밖 좌표: {report['out_of_bounds']:,}개",
+        f"- 중복 좌표 (유효 좌표 중): {report['duplicates']:,}개"
     ]
 
     return "\n".join(lines)
@@ -1311,10 +1420,184 @@ def summarize_categorical_distribution(df: pd.DataFrame, column: str, **kwargs)
     return "\n".join(lines)
 
 
+# ============================================================================
+# 공간 분석 도구 핸들러
+# ============================================================================
+
+def get_grid_density(df: pd.DataFrame, cell_km: float = 0.25, shape: str = 'square', top_n: int = 10, **kwargs) -> str:
+    """
+    격자 셀별 포인트 밀도를 분석합니다.
+
+    Parameters:
+        df (pd.DataFrame): 분석할 DataFrame
+        cell_km (float): 격자 셀 크기 (km)
+        shape (str): 격자 모양 ('square' 또는 'hex')
+        top_n (int): 표시할 상위 셀 수
+
+    Returns:
+        str: 격자 밀도 분석 결과 문자열
+    """
+    lat_col, lng_col = detect_lat_lng_columns(df)
+
+    if not lat_col or not lng_col:
+        return "위경도 컬럼을 찾을 수 없습니다."
+
+    if cell_km <= 0:
+        return "격자 셀 크기는 0보다 커야 합니다."
+
+    if top_n <= 0:
+        return "표시할 셀 수(top_n)는 0보다 커야 합니다."
+
+    cells = aggregate_grid(df, lat_col, lng_col, cell_km=cell_km, shape=shape)
+
+    if cells.empty:
+        return "유효한 좌표 데이터가 없습니다."
+
+    counts = cells['count']
+    shape_name = "육각형" if shape == 'hex' else "정사각형"
+    top_cells = cells.head(top_n)[['center_lat', 'center_lng', 'count']].round({'center_lat': 5, 'center_lng': 5})
+
+    lines = [
+        f"## 격자 밀도 분석 ({shape_name}, {cell_km}km 셀)",
+        f"- 유효 포인트 수: {int(counts.sum()):,}개",
+        f"- 포인트가 있는 셀 수: {len(cells):,}개",
+        f"- 셀당 평균: {counts.mean():.2f}개",
+        f"- 셀당 중앙값: {counts.median():.1f}개",
+        f"- 최대 밀집 셀: {int(counts.max()):,}개",
+        f"- 상위 10% 셀이 차지하는 비율: {counts.head(max(1, len(cells) // 10)).sum() / counts.sum() * 100:.1f}%",
+        f"",
+        f"### 상위 {len(top_cells)}개 밀집 셀",
+        top_cells.to_string(index=False)
+    ]
+
+    return "\n".join(lines)
+
+
+def get_district_summary(
+    df: pd.DataFrame,
+    level: str = 'gu',
+    district: str | None = None,
+    value_column: str | None = None,
+    operation: str = 'sum',
+    top_n: int = 20,
+    **kwargs
+) -> str:
+    """
+    주소에서 추출한 구/군 또는 읍/면/동별 집계를 반환합니다.
+
+    Parameters:
+        df (pd.DataFrame): 분석할 DataFrame
+        level (str): 집계 단위 ('gu' 또는 'dong')
+        district (str | None): 특정 구/군 (지정하면 해당 구의 동별 집계)
+        value_column (str | None): 집계할 수치형 컬럼명
+        operation (str): 집계 연산
+        top_n (int): 표시할 상위 행정구역 수
+
+    Returns:
+        str: 행정구역별 집계 결과 문자열
+    """
+    address_cols = detect_address_columns(df)
+    if not address_cols:
+        return "구/동을 추출할 주소 컬럼을 찾을 수 없습니다."
+
+    if level not in DISTRICT_COLUMNS:
+        return f"지원하지 않는 집계 단위입니다: {level}. 지원: {', '.join(DISTRICT_COLUMNS)}"
+
+    if value_column is not None and value_column not in df.columns:
+        return f"'{value_column}' 컬럼을 찾을 수 없습니다."
+
+    if district:
+        level = 'dong'
+
+    lat_col, lng_col = detect_lat_lng_columns(df)
+    summary = aggregate_by_district(
+        df, level, value_col=value_column, agg=operation, lat_col=lat_col, lng_col=lng_col
+    )
+    if district:
+        summary = summary[summary['gu'] == district]
+
+    if summary.empty:
+        return f"'{district}'에 해당하는 데이터가 없습니다." if district else "구/동을 추출한 행이 없습니다."
+
+    parsed_rows = int(summary['count'].sum())
+    title = f"{district} 읍/면/동별" if district else f"{DISTRICT_LEVELS[level]}별"
+    lines = [
+        f"## {title} 집계",
+        f"- 주소 컬럼: {', '.join(address_cols)}",
+        f"- 집계된 행 수: {parsed_rows:,} / {len(df):,}",
+        f"- 행정구역 수: {len(summary):,}개",
+        f"",
+        summary.head(top_n).round(5).to_string(index=False)
+    ]
+
+    if len(summary) > top_n:
+        lines.append(f"\n... 외 {len(summary) - top_n}개 행정구역")
+
+    return "\n".join(lines)
+
+
+def find_repeat_incidents(
+    df: pd.DataFrame,
+    time_column: str,
+    radius_km: float = 0.1,
+    window_hours: float = 24.0,
+    **kwargs
+) -> str:
+    """
+    같은 장소에서 시간 창 안에 반복 발생한 사건을 찾습니다.
+
+    Parameters:
+        df (pd.DataFrame): 분석할 DataFrame
+        time_column (str): 발생 시각 컬럼명
+        radius_km (float): 공간 반경 (km)
+        window_hours (float): 시간 창 (시간)
+
+    Returns:
+        str: 반복 발생 분석 결과 문자열
+    """
+    if time_column not in df.columns:
+        return f"컬럼 '{time_column}'을(를) 찾을 수 없습니다."
+
+    lat_col, lng_col = detect_lat_lng_columns(df)
+    if not lat_col or not lng_col:
+        return "위경도 컬럼을 찾을 수 없습니다."
+
+    if radius_km <= 0 or window_hours < 0:
+        return "반경은 0보다 크고 시간 창은 0 이상이어야 합니다."
+
+    counts = find_spatiotemporal_neighbors(df, lat_col, lng_col, time_column, radius_km, window_hours)['st_neighbors']
+    valid = counts.dropna()
+
+    if valid.empty:
+        return f"유효한 좌표와 시각('{time_column}')을 가진 행이 없습니다."
+
+    repeated = valid[valid > 0]
+    lines = [
+        f"## 반복 발생 분석 (반경 {radius_km}km, {window_hours}시간 이내)",
+        f"- 분석 대상: {len(valid):,}건 (좌표/시각 누락 {len(df) - len(valid):,}건 제외)",
+        f"- 반복 발생 건수: {len(repeated):,}건 ({len(repeated) / len(valid) * 100:.1f}%)",
+        f"- 이웃 사건 수 평균: {valid.mean():.2f}건",
+        f"- 이웃 사건 수 최대: {int(valid.max()):,}건"
+    ]
+
+    if not repeated.empty:
+        top = df.loc[repeated.sort_values(ascending=False).head(5).index, [time_column, lat_col, lng_col]].copy()
+        top['이웃 사건 수'] = repeated.loc[top.index].astype(int)
+        lines.extend(["", "### 이웃 사건이 가장 많은 5건", top.to_string()])
+
+    return "\n".join(lines)
+
+
 # ============================================================================
 # Tool Dispatcher (T026)
 # ============================================================================
 
+# 컬럼명을 받는 도구 파라미터 ('gu'/'dong' 파생 컬럼 요청 여부는 이 값들만 확인)
+COLUMN_PARAMETERS = (
+    'column', 'columns', 'value_column', 'target_column', 'group_column', 'agg_column',
+    'row_column', 'col_column', 'time_column'
+)
+
 # 도구 이름과 핸들러 함수 매핑
 TOOL_HANDLERS = {
     "get_dataframe_info": get_dataframe_info,
@@ -1338,6 +1621,10 @@ TOOL_HANDLERS = {
     "detect_data_types": detect_data_types,
     "get_temporal_pattern": get_temporal_pattern,
     "summarize_categorical_distribution": summarize_categorical_distribution,
+    # 공간 분석 도구
+    "get_grid_density": get_grid_density,
+    "find_repeat_incidents": find_repeat_incidents,
+    "get_district_summary": get_district_summary,
 }
 
 
@@ -1357,6 +1644,15 @@ def execute_tool(tool_name: str, tool_input: dict, df: pd.DataFrame) -> str:
         return f"알 수 없는 도구입니다: {tool_name}"
 
     try:
+        # 컬럼 파라미터로 'gu'/'dong'을 요청하면 주소에서 추출한 범주형 컬럼을 붙여서 실행 (캐시됨).
+        # level='gu' 같은 일반 값은 컬럼 요청이 아니므로 주소를 파싱하지 않음
+        column_values = [tool_input.get(name) for name in COLUMN_PARAMETERS]
+        requested = {v for v in column_values if isinstance(v, str)}
+        requested |= {c for v in column_values if isinstance(v, list) for c in v if isinstance(c, str)}
+        if any(level in requested and level not in df.columns for level in DISTRICT_COLUMNS):
+            if detect_address_columns(df):
+                df = with_district_columns(df)
+
         handler = TOOL_HANDLERS[tool_name]
         result = handler(df, **tool_input)
         return result
@@ -1,13 +1,21 @@
 """
 Plotly charts and Folium maps generation.
 """
+import json
+
 import pandas as pd
 import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
 import plotly.figure_factory as ff
 import folium
-from folium.plugins import MarkerCluster
+from folium.elements import MacroElement
+from folium.plugins import FastMarkerCluster, HeatMap, MarkerCluster
+from folium.template import Template
+from matplotlib import colormaps
+
+from utils.binning import aggregate_grid, get_cluster_pyramid, kde_raster
+from utils.geo import DAEGU_CENTER, clean_coordinates, spatial_sample, unproject_local_xy
 
 
 # Color palette for consistent styling (T034, T035)
@@ -21,6 +29,54 @@ PLOT_COLORS = {
     'scatter': '#AB63FA'
 }
 
+# Map render modes: individual markers, client-side markers built from one
+# coordinate array ('fast'), server-side zoom-level clusters, a heat layer of
+# pre-binned cells, or one kernel density image overlay
+MAP_RENDER_MODES = ('markers', 'fast', 'clusters', 'heatmap', 'kde')
+
+# Upper bound on cluster pyramid cells shipped per dataset (finer levels are dropped)
+MAX_PYRAMID_CELLS = 30000
+
+# Heatmap pre-binning: 100m cells keep street-level detail at a fraction of the points;
+# cells are doubled in size until at most MAX_HEATMAP_CELLS remain
+DEFAULT_HEATMAP_CELL_KM = 0.1
+MAX_HEATMAP_CELLS = 10000
+
+# Client-side marker factory for FastMarkerCluster. Each data row is
+# [lat, lng, popup values...]; popups are built only when a marker is clicked.
+_FAST_MARKER_CALLBACK = """(function () {
+    var icon = L.AwesomeMarkers.icon({icon: %(icon)s, markerColor: %(color)s, prefix: 'glyphicon'});
+    var columns = %(columns)s;
+    var title = %(title)s;
+    var escape = function (value) {
+        return String(value).replace(/&/g, '&amp;').replace(/</g, '&lt;').replace(/>/g, '&gt;');
+    };
+    return function (row) {
+        var marker = L.marker(new L.LatLng(row[0], row[1]), {icon: icon});
+        marker.bindPopup(function () {
+            if (columns.length === 0) {
+                var location = '(' + row[0].toFixed(4) + ', ' + row[1].toFixed(4) + ')';
+                return title === null ? '<b>Location:</b> ' + location : '<b>' + escape(title) + '</b><br>' + location;
+            }
+            var html = "<div style='width: 200px'>";
+            if (title !== null) {
+                html += '<b>Dataset:</b> ' + escape(title) + '<br>';
+            }
+            for (var i = 0; i < columns.length; i++) {
+                html += '<b>' + escape(columns[i]) + ':</b> ' + escape(row[i + 2]) + '<br>';
+            }
+            return html + '</div>';
+        }, {maxWidth: 300});
+        return marker;
+    };
+})()"""
+
+# Matplotlib colormap of the KDE overlay for each marker color
+KDE_COLORMAPS = {
+    'red': 'Reds', 'darkred': 'Reds', 'blue': 'Blues', 'darkblue': 'Blues',
+    'green': 'Greens', 'purple': 'Purples', 'orange': 'Oranges'
+}
+
 
 def check_missing_ratio(df: pd.DataFrame, column: str, threshold: float = 0.3) -> tuple[bool, float]:
     """
@@ -253,6 +309,58 @@ def plot_scatter(
     return fig
 
 
+def plot_proximity_curve(curve_df: pd.DataFrame, target_name: str, title: str | None = None) -> go.Figure:
+    """
+    Plot target counts versus search radius from a proximity curve.
+
+    Shows the mean count per radius with the median and an interquartile band.
+
+    Parameters:
+        curve_df (pd.DataFrame): Output of compute_proximity_curve (one column per radius)
+        target_name (str): Target dataset name for labels
+        title (str | None): Optional chart title
+
+    Returns:
+        plotly.graph_objects.Figure: Line chart of counts vs radius
+    """
+    if title is None:
+        title = f"반경별 {target_name} 개수"
+
+    radii = [float(c) for c in curve_df.columns]
+    q1 = curve_df.quantile(0.25).to_numpy()
+    q3 = curve_df.quantile(0.75).to_numpy()
+
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(
+        x=radii + radii[::-1],
+        y=list(q3) + list(q1[::-1]),
+        fill='toself',
+        fillcolor='rgba(31, 119, 180, 0.15)',
+        line=dict(width=0),
+        hoverinfo='skip',
+        name='사분위 범위 (25-75%)'
+    ))
+    fig.add_trace(go.Scatter(
+        x=radii, y=curve_df.mean().to_numpy(),
+        mode='lines+markers', name='평균',
+        line=dict(color=PLOT_COLORS['primary'])
+    ))
+    fig.add_trace(go.Scatter(
+        x=radii, y=curve_df.median().to_numpy(),
+        mode='lines', name='중앙값',
+        line=dict(color=PLOT_COLORS['secondary'], dash='dash')
+    ))
+
+    fig.update_layout(
+        title=title,
+        xaxis_title="반경 (km)",
+        yaxis_title=f"{target_name} 개수",
+        hovermode='x unified'
+    )
+
+    return fig
+
+
 def plot_with_options(
     df: pd.DataFrame,
     column: str,
@@ -287,6 +395,237 @@ def plot_with_options(
         raise ValueError(f"Unknown chart type: {chart_type}")
 
 
+def add_heatmap(
+    target: folium.Map | folium.FeatureGroup,
+    df: pd.DataFrame,
+    lat_col: str,
+    lng_col: str,
+    name: str = 'Heatmap',
+    cell_km: float = DEFAULT_HEATMAP_CELL_KM,
+    max_cells: int = MAX_HEATMAP_CELLS
+) -> None:
+    """
+    Add a heat layer of all valid points, pre-binned into weighted grid cells.
+
+    Points are counted per square cell on the server (utils.binning.aggregate_grid),
+    and only cell centers with their weights are sent to the HeatMap plugin, so the
+    payload is bounded by max_cells however many points there are.
+
+    Parameters:
+        target (folium.Map | folium.FeatureGroup): Map or layer to add the heat layer to
+        df (pd.DataFrame): Dataset with coordinates
+        lat_col, lng_col (str): Coordinate column names
+        name (str): Layer name (default: 'Heatmap')
+        cell_km (float): Binning cell size in kilometers; doubled while more than
+            max_cells cells are occupied (default: 0.1)
+        max_cells (int): Maximum number of cells sent to the browser (default: 10,000)
+    """
+    cells = aggregate_grid(df, lat_col, lng_col, cell_km=cell_km)
+    while len(cells) > max_cells:
+        cell_km *= 2
+        cells = aggregate_grid(df, lat_col, lng_col, cell_km=cell_km)
+    if cells.empty:
+        return
+
+    # Weights relative to the 99th percentile so a few extreme cells do not wash out the rest
+    scale = max(float(np.percentile(cells['count'], 99)), 1.0)
+    weights = np.minimum(cells['count'].to_numpy() / scale, 1.0).round(3)
+
+    data = np.column_stack([
+        cells['center_lat'].round(5), cells['center_lng'].round(5), weights
+    ]).tolist()
+    HeatMap(data, name=name, radius=15, blur=12, min_opacity=0.3, max=1.0).add_to(target)
+
+
+def add_kde_overlay(
+    target: folium.Map | folium.FeatureGroup,
+    df: pd.DataFrame,
+    lat_col: str,
+    lng_col: str,
+    name: str = 'Density',
+    color: str = 'red',
+    bandwidth_km: float = 0.3
+) -> None:
+    """
+    Add a kernel density surface of all valid points as a single PNG image overlay.
+
+    The browser receives one image regardless of point count; the density is
+    computed server-side with utils.binning.kde_raster (FFT convolution).
+
+    Parameters:
+        target (folium.Map | folium.FeatureGroup): Map or layer to add the overlay to
+        df (pd.DataFrame): Dataset with coordinates
+        lat_col, lng_col (str): Coordinate column names
+        name (str): Overlay name (default: 'Density')
+        color (str): Marker color of the dataset; picks the colormap (default: 'red')
+        bandwidth_km (float): Kernel bandwidth in kilometers (default: 0.3)
+    """
+    df_clean = clean_coordinates(df, lat_col, lng_col)
+    if len(df_clean) == 0:
+        return
+
+    density, bounds = kde_raster(df_clean[lat_col].to_numpy(), df_clean[lng_col].to_numpy(), bandwidth_km)
+
+    # Square-root scaling up to the 99.5th percentile keeps sparse areas visible
+    positive = density[density > 0]
+    scale = np.percentile(positive, 99.5) if len(positive) else 1.0
+    level = np.sqrt(np.clip(density / max(scale, 1e-12), 0.0, 1.0))
+
+    rgba = colormaps[KDE_COLORMAPS.get(color, 'YlOrRd')](level)
+    rgba[..., 3] = np.clip(level * 1.5, 0.0, 0.8)  # Transparent where there are no points
+
+    folium.raster_layers.ImageOverlay(
+        image=(rgba * 255).astype(np.uint8),
+        bounds=bounds,
+        name=name,
+        opacity=1.0,
+        pixelated=False
+    ).add_to(target)
+
+
+def add_fast_markers(
+    target: folium.Map | folium.FeatureGroup,
+    df: pd.DataFrame,
+    lat_col: str,
+    lng_col: str,
+    popup_cols: list[str] | None = None,
+    color: str = 'blue',
+    icon: str = 'info-sign',
+    title: str | None = None
+) -> None:
+    """
+    Add clustered markers that are created in the browser from one compact array.
+
+    Instead of one folium.Marker/Icon/Popup object (and its JavaScript) per row,
+    the map ships [lat, lng, popup values...] rows and a single callback that
+    builds markers client-side (FastMarkerCluster). Popup HTML is generated only
+    when a marker is opened, so build time and payload grow by a few bytes per point.
+
+    Parameters:
+        target (folium.Map | folium.FeatureGroup): Map or layer to add the markers to
+        df (pd.DataFrame): Rows to draw (valid coordinates only)
+        lat_col, lng_col (str): Coordinate column names
+        popup_cols (list[str] | None): Columns shown in popups (default: coordinates only)
+        color (str): Marker color (default: 'blue')
+        icon (str): Glyphicon name (default: 'info-sign')
+        title (str | None): Dataset name shown in popups (default: none)
+    """
+    popup_cols = [col for col in (popup_cols or []) if col in df.columns]
+
+    columns = [df[lat_col].astype(float).round(6), df[lng_col].astype(float).round(6)]
+    columns += [df[col].astype(str).where(df[col].notna(), '') for col in popup_cols]
+    data = pd.concat(columns, axis=1).to_numpy(dtype=object).tolist()
+
+    callback = _FAST_MARKER_CALLBACK % {
+        'icon': json.dumps(icon),
+        'color': json.dumps(color),
+        'columns': json.dumps([str(col) for col in popup_cols], ensure_ascii=False),
+        'title': json.dumps(title, ensure_ascii=False)
+    }
+    FastMarkerCluster(data, callback=callback).add_to(target)
+
+
+class _ClusterPyramidLayer(MacroElement):
+    """
+    Draws precomputed cluster cells of the current zoom level into its parent layer.
+
+    The browser only picks the level for the zoom and draws the cells inside the
+    viewport on moveend; no clustering runs client-side.
+    """
+
+    _template = Template("""
+        {% macro script(this, kwargs) %}
+        (function () {
+            var layer = {{ this._parent.get_name() }};
+            var map = {{ this.map_name }};
+            var levels = {{ this.levels|tojson }};
+            var zooms = Object.keys(levels).map(Number);
+            var minZoom = Math.min.apply(null, zooms), maxZoom = Math.max.apply(null, zooms);
+            var color = {{ this.color|tojson }};
+            var label = function (count) {
+                return count >= 10000 ? Math.round(count / 1000) + 'k'
+                    : count >= 1000 ? (count / 1000).toFixed(1) + 'k' : String(count);
+            };
+            var draw = function () {
+                layer.clearLayers();
+                var zoom = Math.max(minZoom, Math.min(maxZoom, map.getZoom()));
+                var cells = levels[zoom];
+                var bounds = map.getBounds().pad(0.25);
+                for (var i = 0; i < cells.length; i++) {
+                    var cell = cells[i];
+                    if (!bounds.contains([cell[0], cell[1]])) {
+                        continue;
+                    }
+                    if (cell[2] === 1) {
+                        L.circleMarker([cell[0], cell[1]], {
+                            radius: 5, color: color, weight: 1, fillOpacity: 0.7
+                        }).addTo(layer);
+                        continue;
+                    }
+                    var size = Math.round(26 + 6 * Math.log10(cell[2]));
+                    L.marker([cell[0], cell[1]], {icon: L.divIcon({
+                        className: '',
+                        iconSize: [size, size],
+                        html: '<div style="width:' + size + 'px;height:' + size + 'px;line-height:' + size
+                            + 'px;border-radius:50%;background:' + color + ';opacity:0.75;color:white;'
+                            + 'text-align:center;font:bold 11px sans-serif">' + label(cell[2]) + '</div>'
+                    })}).addTo(layer);
+                }
+            };
+            map.on('moveend', draw);
+            draw();
+        })();
+        {% endmacro %}
+    """)
+
+    def __init__(self, levels: dict, color: str, map_name: str):
+        super().__init__()
+        self._name = 'ClusterPyramidLayer'
+        self.levels = levels
+        self.color = color
+        self.map_name = map_name
+
+
+def add_cluster_pyramid(
+    m: folium.Map,
+    df: pd.DataFrame,
+    lat_col: str,
+    lng_col: str,
+    name: str = 'Clusters',
+    color: str = 'blue',
+    max_cells: int = MAX_PYRAMID_CELLS
+) -> None:
+    """
+    Add server-side zoom-level clusters (circles with counts) of all valid points.
+
+    The pyramid comes from utils.binning.get_cluster_pyramid (cached by dataset
+    fingerprint). Levels are shipped from coarse to fine until max_cells cells;
+    zooming in past the finest shipped level keeps showing that level.
+
+    Parameters:
+        m (folium.Map): Map to add the layer to
+        df (pd.DataFrame): Dataset with coordinates
+        lat_col, lng_col (str): Coordinate column names
+        name (str): Layer name (default: 'Clusters')
+        color (str): CSS color of the circles (default: 'blue')
+        max_cells (int): Maximum number of cells shipped over all levels (default: 30,000)
+    """
+    pyramid = get_cluster_pyramid(df, lat_col, lng_col)
+
+    levels = {}
+    shipped = 0
+    for zoom in sorted(pyramid):
+        cells = pyramid[zoom]
+        if levels and shipped + len(cells) > max_cells:
+            break
+        levels[zoom] = cells[['lat', 'lng']].round(5).assign(count=cells['count']).to_numpy().tolist()
+        shipped += len(cells)
+
+    feature_group = folium.FeatureGroup(name=name)
+    _ClusterPyramidLayer(levels, color, m.get_name()).add_to(feature_group)
+    feature_group.add_to(m)
+
+
 def create_folium_map(
     df: pd.DataFrame,
     lat_col: str,
@@ -295,10 +634,11 @@ def create_folium_map(
     color: str = 'blue',
     name: str = 'Points',
     icon: str = 'info-sign',
-    max_points: int = 5000
+    max_points: int = 5000,
+    render_mode: str = 'markers'
 ) -> folium.Map:
     """
-    Create Folium map with markers for dataset.
+    Create Folium map with markers (or a density overlay) for dataset.
 
     Parameters:
         df (pd.DataFrame): Dataset with coordinates
@@ -308,6 +648,11 @@ def create_folium_map(
         name (str): Layer name for legend (default: 'Points')
         icon (str): Marker icon (default: 'info-sign')
         max_points (int): Maximum number of points to display (default: 5000)
+        render_mode (str): 'markers' (default), 'fast' (client-side markers, lazy popups;
+            see add_fast_markers), 'clusters' (server-side zoom-level clusters of all points;
+            see add_cluster_pyramid), 'heatmap' (heat layer of all points pre-binned into
+            cells; see add_heatmap) or 'kde' (one density image of all points); max_points
+            only applies to the marker modes
 
     Returns:
         folium.Map: Map object ready for rendering
@@ -316,8 +661,8 @@ def create_folium_map(
     DAEGU_CENTER_LAT = 35.8714
     DAEGU_CENTER_LNG = 128.6014
 
-    # Drop rows with missing coordinates
-    df_clean = df.dropna(subset=[lat_col, lng_col]).copy()
+    # Skip rows with missing, (0, 0), swapped or out-of-bounds coordinates (cached mask)
+    df_clean = clean_coordinates(df, lat_col, lng_col)
 
     # Early return with default Daegu center map if no valid coordinates
     if len(df_clean) == 0:
@@ -328,9 +673,10 @@ def create_folium_map(
         )
         return m
 
-    # Sample to max_points if dataset larger (for performance)
-    if len(df_clean) > max_points:
-        df_clean = df_clean.sample(max_points, random_state=42)
+    # Sample to max_points if dataset larger (for performance; the aggregate modes use every point).
+    # The sample is stratified over space so sparse areas stay visible next to dense ones
+    if render_mode not in ('clusters', 'heatmap', 'kde') and len(df_clean) > max_points:
+        df_clean = spatial_sample(df, lat_col, lng_col, max_points)
 
     # Calculate map center as mean of coordinates
     center_lat = df_clean[lat_col].mean()
@@ -358,9 +704,30 @@ def create_folium_map(
         tiles='OpenStreetMap'
     )
 
+    if render_mode == 'kde':
+        add_kde_overlay(m, df_clean, lat_col, lng_col, name=name, color=color)
+        folium.LayerControl().add_to(m)
+        return m
+
+    if render_mode == 'clusters':
+        add_cluster_pyramid(m, df, lat_col, lng_col, name=name, color=color)
+        folium.LayerControl().add_to(m)
+        return m
+
+    if render_mode == 'heatmap':
+        add_heatmap(m, df, lat_col, lng_col, name=name)
+        folium.LayerControl().add_to(m)
+        return m
+
     # Create feature group for this dataset
     feature_group = folium.FeatureGroup(name=name)
 
+    if render_mode == 'fast':
+        add_fast_markers(feature_group, df_clean, lat_col, lng_col, popup_cols, color, icon)
+        feature_group.add_to(m)
+        folium.LayerControl().add_to(m)
+        return m
+
     # Use MarkerCluster if more than 100 points
     if len(df_clean) > 100:
         marker_cluster = MarkerCluster().add_to(feature_group)
@@ -399,7 +766,7 @@ def create_folium_map(
     return m
 
 
-def create_overlay_map(datasets: list[dict], max_points: int = 5000) -> folium.Map:
+def create_overlay_map(datasets: list[dict], max_points: int = 5000, render_mode: str = 'markers') -> folium.Map:
     """
     Create map with multiple datasets overlaid as separate layers.
 
@@ -413,6 +780,10 @@ def create_overlay_map(datasets: list[dict], max_points: int = 5000) -> folium.M
             - name (str): Layer name
             - icon (str): Marker icon
         max_points (int): Maximum number of points per dataset (default: 5000)
+        render_mode (str): 'markers' (default), 'fast' (client-side markers, lazy popups),
+            'clusters' (server-side zoom-level clusters), 'heatmap' (one pre-binned heat
+            layer per dataset) or 'kde' (one density image per dataset); max_points only
+            applies to the marker modes
 
     Returns:
         folium.Map: Map with multiple togglable layers
@@ -426,7 +797,7 @@ def create_overlay_map(datasets: list[dict], max_points: int = 5000) -> folium.M
     all_lngs = []
 
     for ds in datasets:
-        df_clean = ds['df'].dropna(subset=[ds['lat_col'], ds['lng_col']])
+        df_clean = clean_coordinates(ds['df'], ds['lat_col'], ds['lng_col'])
         if len(df_clean) > 0:
             all_lats.extend(df_clean[ds['lat_col']].tolist())
             all_lngs.extend(df_clean[ds['lng_col']].tolist())
@@ -470,16 +841,35 @@ def create_overlay_map(datasets: list[dict], max_points: int = 5000) -> folium.M
         name = ds.get('name', 'Points')
         icon = ds.get('icon', 'info-sign')
 
-        # Drop rows with missing coordinates
-        df_clean = df.dropna(subset=[lat_col, lng_col]).copy()
+        # Skip rows with invalid coordinates (cached mask)
+        df_clean = clean_coordinates(df, lat_col, lng_col)
+
+        if render_mode == 'kde':
+            feature_group = folium.FeatureGroup(name=name)
+            add_kde_overlay(feature_group, df_clean, lat_col, lng_col, name=name, color=color)
+            feature_group.add_to(m)
+            continue
+
+        if render_mode == 'clusters':
+            add_cluster_pyramid(m, df, lat_col, lng_col, name=name, color=color)
+            continue
 
-        # Sample if needed
+        if render_mode == 'heatmap':
+            add_heatmap(m, df, lat_col, lng_col, name=name)
+            continue
+
+        # Sample if needed (spatially stratified, cached per dataset and budget)
         if len(df_clean) > max_points:
-            df_clean = df_clean.sample(max_points, random_state=42)
+            df_clean = spatial_sample(df, lat_col, lng_col, max_points)
 
         # Create feature group
         feature_group = folium.FeatureGroup(name=name)
 
+        if render_mode == 'fast':
+            add_fast_markers(feature_group, df_clean, lat_col, lng_col, popup_cols, color, icon, title=name)
+            feature_group.add_to(m)
+            continue
+
         # Use MarkerCluster for large datasets
         if len(df_clean) > 100:
             marker_cluster = MarkerCluster().add_to(feature_group)
@@ -515,3 +905,187 @@ def create_overlay_map(datasets: list[dict], max_points: int = 5000) -> folium.M
     folium.LayerControl().add_to(m)
 
     return m
+
+
+def _square_cell_bounds(cells: pd.DataFrame, cell_km: float) -> tuple[np.ndarray, ...]:
+    """Return (south, west, north, east) of square grid cells given by cell_x/cell_y columns."""
+    # Cell corners from the same local grid used to assign cells
+    cell_x = cells['cell_x'].to_numpy()
+    cell_y = cells['cell_y'].to_numpy()
+    south, west = unproject_local_xy(cell_x * cell_km, cell_y * cell_km)
+    north, east = unproject_local_xy((cell_x + 1) * cell_km, (cell_y + 1) * cell_km)
+    return south, west, north, east
+
+
+def create_coverage_gap_map(gaps_df: pd.DataFrame, cell_km: float, max_cells: int = 1000) -> folium.Map:
+    """
+    Draw coverage-gap cells as squares shaded by event count.
+
+    Parameters:
+        gaps_df (pd.DataFrame): Output of compute_coverage_gaps (ranked cells)
+        cell_km (float): Cell size used for compute_coverage_gaps
+        max_cells (int): Maximum number of top-ranked cells to draw (default: 1000)
+
+    Returns:
+        folium.Map: Map with one rectangle per gap cell
+    """
+    cells = gaps_df.head(max_cells)
+    if cells.empty:
+        return folium.Map(location=list(DAEGU_CENTER), zoom_start=12)
+
+    m = folium.Map(
+        location=[cells['center_lat'].mean(), cells['center_lng'].mean()],
+        zoom_start=12,
+        tiles='OpenStreetMap'
+    )
+
+    south, west, north, east = _square_cell_bounds(cells, cell_km)
+    max_count = cells['event_count'].max()
+
+    for i, row in enumerate(cells.itertuples(index=False)):
+        nearest = "없음" if pd.isna(row.nearest_facility_km) else f"{row.nearest_facility_km:.2f}km"
+        folium.Rectangle(
+            bounds=[[south[i], west[i]], [north[i], east[i]]],
+            color='darkred',
+            weight=1,
+            fill=True,
+            fill_color='red',
+            fill_opacity=0.2 + 0.6 * row.event_count / max_count,
+            popup=folium.Popup(
+                f"<b>{row.event_count:,}건</b><br>가장 가까운 시설: {nearest}", max_width=200
+            )
+        ).add_to(m)
+
+    return m
+
+
+def create_cluster_map(clusters_df: pd.DataFrame, max_clusters: int = 200) -> folium.Map:
+    """
+    Draw density clusters (hotspots) as circles sized by their extent.
+
+    Parameters:
+        clusters_df (pd.DataFrame): Cluster table from utils.clustering.cluster_hotspots
+        max_clusters (int): Maximum number of largest clusters to draw (default: 200)
+
+    Returns:
+        folium.Map: Map with one circle per cluster
+    """
+    clusters = clusters_df.sort_values('size', ascending=False).head(max_clusters)
+    if clusters.empty:
+        return folium.Map(location=list(DAEGU_CENTER), zoom_start=12)
+
+    m = folium.Map(
+        location=[clusters['center_lat'].mean(), clusters['center_lng'].mean()],
+        zoom_start=12,
+        tiles='OpenStreetMap'
+    )
+
+    max_size = clusters['size'].max()
+    for row in clusters.itertuples(index=False):
+        folium.Circle(
+            location=[row.center_lat, row.center_lng],
+            radius=max(row.radius_km * 1000, 30),
+            color='darkred',
+            weight=1,
+            fill=True,
+            fill_color='red',
+            fill_opacity=0.2 + 0.5 * row.size / max_size,
+            popup=folium.Popup(
+                f"<b>클러스터 {row.cluster_id}</b><br>{row.size:,}건<br>반경 {row.radius_km * 1000:.0f}m",
+                max_width=200
+            )
+        ).add_to(m)
+
+    return m
+
+
+def create_district_map(summary_df: pd.DataFrame, label_col: str = 'gu', max_districts: int = 300) -> folium.Map:
+    """
+    Draw district aggregates as circle markers at each district's mean coordinate.
+
+    Parameters:
+        summary_df (pd.DataFrame): utils.districts.aggregate_by_district output
+            (with center_lat/center_lng)
+        label_col (str): District name column shown in popups (default: 'gu')
+        max_districts (int): Maximum number of largest districts to draw (default: 300)
+
+    Returns:
+        folium.Map: Map with one circle marker per district, area proportional to count
+    """
+    districts = summary_df.dropna(subset=['center_lat', 'center_lng']).head(max_districts)
+    if districts.empty:
+        return folium.Map(location=list(DAEGU_CENTER), zoom_start=11)
+
+    m = folium.Map(
+        location=[districts['center_lat'].mean(), districts['center_lng'].mean()],
+        zoom_start=11,
+        tiles='OpenStreetMap'
+    )
+
+    max_count = districts['count'].max()
+    for row in districts.to_dict('records'):
+        name = row['gu'] if label_col == 'gu' else f"{row['gu']} {row[label_col]}"
+        folium.CircleMarker(
+            location=[row['center_lat'], row['center_lng']],
+            radius=5 + 25 * np.sqrt(row['count'] / max_count),
+            color='darkblue',
+            weight=1,
+            fill=True,
+            fill_color='blue',
+            fill_opacity=0.4,
+            popup=folium.Popup(f"<b>{name}</b><br>{row['count']:,}건", max_width=200)
+        ).add_to(m)
+
+    return m
+
+
+# Colors of Gi* hotspot classes (hot = red, cold = blue, darker = more significant)
+HOTSPOT_COLORS = {
+    'hot_99': '#b2182b', 'hot_95': '#ef8a62', 'hot_90': '#fddbc7',
+    'cold_99': '#2166ac', 'cold_95': '#67a9cf', 'cold_90': '#d1e5f0'
+}
+
+
+def create_hotspot_map(local_df: pd.DataFrame, cell_km: float | None = None, max_items: int = 3000) -> folium.Map:
+    """
+    Draw significant Gi* hot and cold spots.
+
+    Parameters:
+        local_df (pd.DataFrame): Local results of compute_spatial_autocorrelation
+        cell_km (float | None): Grid cell size for grid results (drawn as squares);
+            None draws point results as circle markers
+        max_items (int): Maximum number of most significant cells/points to draw (default: 3000)
+
+    Returns:
+        folium.Map: Map of significant locations colored by hotspot class
+    """
+    significant = local_df[local_df['hotspot'] != 'not_significant']
+    significant = significant.loc[significant['gi_z'].abs().sort_values(ascending=False).index].head(max_items)
+    if significant.empty:
+        return folium.Map(location=list(DAEGU_CENTER), zoom_start=12)
+
+    m = folium.Map(
+        location=[significant['lat'].mean(), significant['lng'].mean()],
+        zoom_start=12,
+        tiles='OpenStreetMap'
+    )
+
+    use_cells = cell_km is not None and 'cell_x' in significant.columns
+    if use_cells:
+        south, west, north, east = _square_cell_bounds(significant, cell_km)
+
+    for i, row in enumerate(significant.itertuples(index=False)):
+        color = HOTSPOT_COLORS[row.hotspot]
+        popup = folium.Popup(f"<b>{row.hotspot}</b><br>값: {row.value:,.2f}<br>Gi* z: {row.gi_z:.2f}", max_width=200)
+        if use_cells:
+            folium.Rectangle(
+                bounds=[[south[i], west[i]], [north[i], east[i]]],
+                color=color, weight=0, fill=True, fill_color=color, fill_opacity=0.6, popup=popup
+            ).add_to(m)
+        else:
+            folium.CircleMarker(
+                location=[row.lat, row.lng],
+                radius=5, color=color, fill=True, fill_color=color, fill_opacity=0.8, popup=popup
+            ).add_to(m)
+
+    return m